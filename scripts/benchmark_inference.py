@@ -0,0 +1,86 @@
+import argparse
+import os
+import sys
+import time
+import pickle
+import numpy as np
+import pandas as pd
+
+# Add the project root to the Python path so the server module can be imported
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.server.main import TRAINING_COLS, MODEL_PATH, SCALER_PATH, DEPARTMENT_ENCODER_PATH, LABEL_ENCODER_PATH, PredictionInput, load_artifacts, build_features, predict_labels
+
+# The original pickled sklearn objects, used by the baseline path
+LEGACY = {}
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Benchmark single-row inference latency of the prediction server.")
+    parser.add_argument("--iterations", type=int, default=2000, help="Number of timed predictions per path.")
+    parser.add_argument("--warmup", type=int, default=100, help="Number of untimed warm-up predictions per path.")
+    return parser.parse_args()
+
+def legacy_preprocess(input_data):
+    """The original DataFrame-based preprocessing, kept here as the benchmark baseline."""
+    input_df = pd.DataFrame([input_data.model_dump(exclude={'employee_id'})])
+    input_df['department'] = LEGACY['department_encoder'].transform(input_df['department'])
+    numerical_cols = input_df.columns.drop('department')
+    input_df[numerical_cols] = LEGACY['scaler'].transform(input_df[numerical_cols])
+    return input_df[TRAINING_COLS]
+
+def legacy_predict(input_data):
+    """End-to-end prediction through the DataFrame path."""
+    prediction_encoded = LEGACY['model'].predict(legacy_preprocess(input_data))
+    return LEGACY['label_encoder'].inverse_transform(prediction_encoded)[0]
+
+def time_call(fn, arg, iterations, warmup):
+    """Return the per-call latencies of fn(arg) in microseconds."""
+    for _ in range(warmup):
+        fn(arg)
+    timings = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(arg)
+        timings[i] = (time.perf_counter() - start) * 1e6
+    return timings
+
+def report(name, timings):
+    """Print p50/p95/p99 latency for one benchmark case."""
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    print(f"{name:<32} p50={p50:9.1f}us  p95={p95:9.1f}us  p99={p99:9.1f}us")
+    return p50
+
+def main():
+    """Compare the original pandas + sklearn path against the server's current path."""
+    args = parse_args()
+    load_artifacts()
+    for name, path in [('model', MODEL_PATH), ('scaler', SCALER_PATH),
+                       ('department_encoder', DEPARTMENT_ENCODER_PATH), ('label_encoder', LABEL_ENCODER_PATH)]:
+        with open(path, 'rb') as f:
+            LEGACY[name] = pickle.load(f)
+
+    sample = PredictionInput(
+        focus_session_length_minutes=35,
+        break_frequency_per_hour=0.5,
+        after_hours_activity_minutes=60,
+        communication_sentiment_score=0.5,
+        department="sales",
+    )
+
+    # Both paths must agree before their speed is worth comparing
+    expected = legacy_preprocess(sample).to_numpy(dtype=np.float64)
+    np.testing.assert_array_equal(build_features([sample]), expected)
+    assert predict_labels([sample])[0] == legacy_predict(sample)
+
+    print(f"--- Preprocessing only ({args.iterations} iterations) ---")
+    legacy_p50 = report("pandas + sklearn", time_call(legacy_preprocess, sample, args.iterations, args.warmup))
+    fast_p50 = report("server fast path", time_call(lambda s: build_features([s]), sample, args.iterations, args.warmup))
+    print(f"p50 saved: {legacy_p50 - fast_p50:.1f}us ({legacy_p50 / fast_p50:.1f}x faster)")
+
+    print(f"\n--- End-to-end prediction ({args.iterations} iterations) ---")
+    legacy_p50 = report("pandas + sklearn", time_call(legacy_predict, sample, args.iterations, args.warmup))
+    fast_p50 = report("server fast path", time_call(lambda s: predict_labels([s])[0], sample, args.iterations, args.warmup))
+    print(f"p50 saved: {legacy_p50 - fast_p50:.1f}us ({legacy_p50 / fast_p50:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
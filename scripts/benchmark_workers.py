@@ -0,0 +1,66 @@
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+# The load generator lives in load_test.py, next to this script
+from load_test import TARGETS, load_payloads, run_load, summarize
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Measure /predict throughput of the prediction server at several worker counts.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Worker counts to benchmark.")
+    parser.add_argument("--concurrency", type=int, default=64, help="Number of concurrent client connections.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to drive load at each worker count.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to run the server on.")
+    parser.add_argument("--data_path", type=str, default="data/synthetic_wellness_data.csv", help="CSV to draw prediction payloads from.")
+    return parser.parse_args()
+
+def wait_for_port(port, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1.0):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server did not start listening on port {port}.")
+
+def benchmark(workers, args, payloads):
+    """Start the server with `workers` processes, drive load against it and shut it down."""
+    env = dict(os.environ, WELLNESS_CACHE_SIZE="0")
+    server = subprocess.Popen(
+        [sys.executable, "src/server/main.py", "--port", str(args.port), "--workers", str(workers)],
+        cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+        scenarios, weights = TARGETS["hub"]["scenarios"], {"predict": 1.0}
+        asyncio.run(run_load(base_url, scenarios, weights, payloads, args.concurrency, duration=1.0))  # warm-up
+        stats, elapsed = asyncio.run(run_load(base_url, scenarios, weights, payloads, args.concurrency, duration=args.duration))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+    return summarize(stats.latencies["predict"], stats.errors["predict"], elapsed)
+
+def main():
+    args = parse_args()
+    print(f"{os.cpu_count()} CPUs available, {args.concurrency} concurrent connections, {args.duration:.0f}s per run")
+    payloads = load_payloads(os.path.join(PROJECT_ROOT, args.data_path))
+    baseline = None
+    for workers in args.workers:
+        result = benchmark(workers, args, payloads)
+        throughput, latency = result["throughput_rps"], result["latency_ms"]
+        baseline = baseline or throughput
+        print(f"workers={workers:<3} {throughput:8.1f} req/s ({throughput / baseline:.2f}x)  "
+              f"p50={latency['p50']:7.1f}ms  p95={latency['p95']:7.1f}ms  p99={latency['p99']:7.1f}ms  errors={result['errors']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to the Python path so the server modules can be imported
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.server.bundle import build_bundle, load_bundle
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Package the trained model, transformers and resource library into one bundle file.")
+    parser.add_argument("--models_path", type=str, default="models", help="Directory holding the trained model and transformer pickles.")
+    parser.add_argument("--resource_library_path", type=str, default="src/server/resource_library.json", help="Path to the resource library JSON.")
+    parser.add_argument("--output_path", type=str, default="models/wellness_bundle.bin", help="Path to save the bundle.")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    build_bundle(args.models_path, args.resource_library_path, args.output_path)
+
+    start = time.perf_counter()
+    load_bundle(args.output_path)
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"Model bundle saved to {args.output_path} ({os.path.getsize(args.output_path) / 1024:.1f} KiB, loads in {load_ms:.2f}ms)")
@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+import time
+import pickle
+import numpy as np
+
+# Add the project root to the Python path so the server module can be imported
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.server.forest import compile_forest, save_forest, load_forest
+from src.data_training.tables import find_table, read_table
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Compile the trained RandomForest into a flat array-based evaluator.")
+    parser.add_argument("--model_path", type=str, default="models/wellness_model.pkl", help="Path to the trained model pickle file.")
+    parser.add_argument("--output_path", type=str, default="models/wellness_model.npz", help="Path to save the compiled forest.")
+    parser.add_argument("--validation_data_path", type=str, default=None, help="Data used to check the compiled forest against the original model (CSV, Parquet or Feather; default: data/val_data.*).")
+    return parser.parse_args()
+
+def median_latency_us(fn, X, iterations=200):
+    """Median wall time of fn(X) in microseconds."""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1e6
+
+def compile_model(model_path, output_path, validation_data_path=None):
+    """
+    Compiles the pickled model, saves it, and verifies the saved copy
+    reproduces the original model's probabilities exactly.
+
+    Args:
+        model_path (str): The path to the trained model pickle.
+        output_path (str): The path to write the compiled forest to.
+        validation_data_path (str): Optional CSV of features to verify predictions on.
+    """
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+
+    save_forest(compile_forest(model), output_path)
+    forest = load_forest(output_path)
+    print(f"Compiled {forest.n_estimators} trees ({len(forest.feature)} nodes) to {output_path}")
+    print(f"Artifact size: {os.path.getsize(output_path) / 1024:.1f} KiB (pickle: {os.path.getsize(model_path) / 1024:.1f} KiB)")
+
+    if validation_data_path and os.path.exists(validation_data_path):
+        X_val = read_table(validation_data_path).drop('wellness_label', axis=1)
+        if not np.array_equal(forest.predict_proba(X_val.to_numpy(dtype=np.float64)), model.predict_proba(X_val)):
+            raise RuntimeError("Compiled forest does not reproduce the model's predictions.")
+        print(f"Verified bit-for-bit predictions on {len(X_val)} rows from {validation_data_path}")
+
+        one_row = X_val.iloc[:1]
+        sklearn_us = median_latency_us(model.predict, one_row)
+        compiled_us = median_latency_us(forest.predict, one_row.to_numpy(dtype=np.float64))
+        print(f"Single-row latency: sklearn {sklearn_us:.0f}us, compiled {compiled_us:.0f}us")
+
+    return forest
+
+if __name__ == "__main__":
+    args = parse_args()
+    compile_model(args.model_path, args.output_path, args.validation_data_path or find_table('data', 'val_data'))
@@ -0,0 +1,245 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+import aiohttp
+import numpy as np
+import pandas as pd
+
+# --- Scenarios ---
+# Each target has named request types; --mix picks how often each is sent.
+# A scenario is (method, path, body builder); body builders take the payload
+# records and a random generator and return the JSON body (or None).
+FEATURE_COLS = ['focus_session_length_minutes', 'break_frequency_per_hour',
+                'after_hours_activity_minutes', 'communication_sentiment_score', 'department']
+
+def predict_body(records, rng, batch_size):
+    return records[rng.integers(len(records))]
+
+def predict_batch_body(records, rng, batch_size):
+    start = rng.integers(max(len(records) - batch_size, 0) + 1)
+    return {"records": records[start:start + batch_size]}
+
+def no_body(records, rng, batch_size):
+    return None
+
+TARGETS = {
+    "hub": {
+        "base_url": "http://127.0.0.1:8000",
+        "scenarios": {
+            "predict": ("POST", "/predict", predict_body),
+            "predict_batch": ("POST", "/predict/batch", predict_batch_body),
+            "health": ("GET", "/", no_body),
+        },
+        "mix": "predict=1",
+    },
+    "dashboard": {
+        "base_url": "http://127.0.0.1:8001",
+        "scenarios": {
+            "dashboard": ("GET", "/api/v1/dashboard", no_body),
+            "kpis": ("GET", "/api/v1/dashboard/kpis", no_body),
+            "departments": ("GET", "/api/v1/dashboard/departments", no_body),
+            "heatmap": ("GET", "/api/v1/dashboard/heatmap", no_body),
+            "trends": ("GET", "/api/v1/dashboard/trends", no_body),
+            "health": ("GET", "/", no_body),
+        },
+        "mix": "dashboard=4,kpis=1,departments=1,heatmap=1,trends=1",
+    },
+}
+
+def parse_args(argv=None):
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Drive concurrent load against the prediction server or the dashboard API and report throughput and latency as JSON.")
+    parser.add_argument("--target", choices=sorted(TARGETS), default="hub", help="Which server's request types to send.")
+    parser.add_argument("--base_url", type=str, default=None, help="Server URL (defaults to the target's local address).")
+    parser.add_argument("--mix", type=str, default=None, help="Weighted request mix, e.g. 'predict=8,predict_batch=1,health=1'.")
+    parser.add_argument("--concurrency", type=int, default=32, help="Number of concurrent connections.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to drive load for (ignored when --requests is set).")
+    parser.add_argument("--requests", type=int, default=None, help="Stop after this many requests instead of after --duration.")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Seconds of untimed load before measuring.")
+    parser.add_argument("--data_path", type=str, default="data/synthetic_wellness_data.csv", help="CSV to draw prediction payloads from.")
+    parser.add_argument("--batch_size", type=int, default=32, help="Records per /predict/batch request.")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for payload and request-type selection.")
+    parser.add_argument("--output", type=str, default=None, help="Write the JSON report here as well as to stdout.")
+    parser.add_argument("--baseline", type=str, default=None, help="A previous JSON report to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative regression in throughput and p95/p99 latency versus --baseline.")
+    return parser.parse_args(argv)
+
+def parse_mix(mix: str, scenarios) -> dict:
+    """Turn 'a=3,b=1' into normalized weights, checking every name is a known request type."""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in scenarios:
+            raise ValueError(f"Unknown request type '{name}'. Choose from: {', '.join(scenarios)}.")
+        weights[name] = float(weight) if weight else 1.0
+        if weights[name] < 0:
+            raise ValueError(f"Weight for '{name}' must not be negative.")
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("The request mix needs at least one positive weight.")
+    return {name: weight / total for name, weight in weights.items()}
+
+def load_payloads(data_path: str) -> list:
+    """Read prediction payloads (feature columns only) from the synthetic data CSV."""
+    df = pd.read_csv(data_path, usecols=FEATURE_COLS).dropna()
+    if df.empty:
+        raise ValueError(f"No usable records in {data_path}.")
+    return df.to_dict(orient="records")
+
+class LoadStats:
+    """
+    Per request type: latencies of successful (2xx) requests and a count of
+    failed ones (other statuses, and status 0 for connection errors and
+    timeouts). Failures are kept out of the latencies so a fast-failing
+    server does not look fast. Status codes are counted for all requests.
+    """
+
+    def __init__(self, names):
+        self.latencies = {name: [] for name in names}
+        self.errors = {name: 0 for name in names}
+        self.status_codes = {}
+
+    def record(self, name, status, latency_ms):
+        self.status_codes[str(status)] = self.status_codes.get(str(status), 0) + 1
+        if 200 <= status < 300:
+            self.latencies[name].append(latency_ms)
+        else:
+            self.errors[name] += 1
+
+def summarize(latencies, errors, elapsed) -> dict:
+    """
+    Request counts, error rate, throughput and latency percentiles, given
+    the latencies of the successful requests and the number that failed.
+    Throughput counts successful requests only.
+    """
+    latencies = np.asarray(latencies, dtype=np.float64)
+    requests = int(latencies.size) + int(errors)
+    summary = {"requests": requests, "errors": int(errors),
+               "error_rate": round(errors / requests, 4) if requests else 0.0,
+               "throughput_rps": round(latencies.size / elapsed, 2) if elapsed > 0 else 0.0}
+    if latencies.size:
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        summary["latency_ms"] = {"mean": round(float(latencies.mean()), 3), "p50": round(float(p50), 3),
+                                 "p95": round(float(p95), 3), "p99": round(float(p99), 3),
+                                 "max": round(float(latencies.max()), 3)}
+    return summary
+
+async def run_load(base_url, scenarios, weights, payloads, concurrency, duration=None, max_requests=None,
+                   batch_size=32, timeout=30.0, seed=0):
+    """
+    Send requests from `concurrency` pooled connections until `duration`
+    seconds have passed or `max_requests` have been sent. Each connection
+    sends its next request as soon as the previous one completes.
+    Returns (LoadStats, elapsed seconds).
+    """
+    names = list(weights)
+    probabilities = [weights[name] for name in names]
+    stats = LoadStats(names)
+    remaining = [max_requests]
+    deadline = None if max_requests is not None else time.perf_counter() + duration
+
+    def take_request() -> bool:
+        if remaining[0] is None:
+            return time.perf_counter() < deadline
+        if remaining[0] <= 0:
+            return False
+        remaining[0] -= 1
+        return True
+
+    async def client(session, worker_seed):
+        rng = np.random.default_rng(worker_seed)
+        while take_request():
+            name = names[rng.choice(len(names), p=probabilities)]
+            method, path, body_fn = scenarios[name]
+            body = body_fn(payloads, rng, batch_size)
+            start = time.perf_counter()
+            try:
+                async with session.request(method, base_url + path, json=body) as response:
+                    await response.read()
+                    status = response.status
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                status = 0
+            stats.record(name, status, (time.perf_counter() - start) * 1000)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+        start = time.perf_counter()
+        seeds = np.random.SeedSequence(seed).spawn(concurrency)
+        await asyncio.gather(*(client(session, s) for s in seeds))
+        elapsed = time.perf_counter() - start
+    return stats, elapsed
+
+def build_report(args, base_url, weights, stats, elapsed) -> dict:
+    all_latencies = [latency for latencies in stats.latencies.values() for latency in latencies]
+    report = {
+        "target": args.target,
+        "base_url": base_url,
+        "concurrency": args.concurrency,
+        "mix": weights,
+        "elapsed_s": round(elapsed, 3),
+        **summarize(all_latencies, sum(stats.errors.values()), elapsed),
+        "status_codes": stats.status_codes,
+        "endpoints": {name: summarize(stats.latencies[name], stats.errors[name], elapsed) for name in weights},
+    }
+    return report
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """
+    List regressions of throughput or p95/p99 latency beyond the tolerance,
+    and any rise in the error rate, overall and per request type.
+    """
+    regressions = []
+    pairs = [("overall", report, baseline)]
+    pairs += [(name, report["endpoints"][name], baseline.get("endpoints", {}).get(name))
+              for name in report["endpoints"]]
+    for name, current, previous in pairs:
+        if not previous or not current.get("requests") or not previous.get("requests"):
+            continue
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {previous['throughput_rps']} -> {current['throughput_rps']} req/s")
+        error_rate, previous_error_rate = current.get("error_rate", 0.0), previous.get("error_rate", 0.0)
+        if error_rate > 0 and error_rate > previous_error_rate * (1 + tolerance):
+            regressions.append(f"{name}: error rate {previous_error_rate} -> {error_rate}")
+        if "latency_ms" not in current or "latency_ms" not in previous:
+            continue
+        for percentile in ("p95", "p99"):
+            before, after = previous["latency_ms"][percentile], current["latency_ms"][percentile]
+            if after > before * (1 + tolerance):
+                regressions.append(f"{name}: {percentile} latency {before} -> {after} ms")
+    return regressions
+
+def main(argv=None):
+    args = parse_args(argv)
+    target = TARGETS[args.target]
+    base_url = (args.base_url or target["base_url"]).rstrip("/")
+    weights = parse_mix(args.mix or target["mix"], target["scenarios"])
+    payloads = load_payloads(args.data_path) if any(name.startswith("predict") for name in weights) else []
+
+    if args.warmup > 0:
+        asyncio.run(run_load(base_url, target["scenarios"], weights, payloads, args.concurrency,
+                             duration=args.warmup, batch_size=args.batch_size, timeout=args.timeout, seed=args.seed + 1))
+    stats, elapsed = asyncio.run(run_load(base_url, target["scenarios"], weights, payloads, args.concurrency,
+                                          duration=args.duration, max_requests=args.requests,
+                                          batch_size=args.batch_size, timeout=args.timeout, seed=args.seed))
+    report = build_report(args, base_url, weights, stats, elapsed)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
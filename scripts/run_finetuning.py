@@ -1,7 +1,8 @@
 import argparse
 import os
+import sys
 import torch
-from datasets import load_dataset
+from datasets import Dataset, DatasetDict
 from transformers import (
     AutoModelForCausalLM,
     AutoTokenizer,
@@ -12,11 +13,15 @@ from transformers import (
 from peft import LoraConfig, get_peft_model, prepare_model_for_kbit_training
 from trl import SFTTrainer
 
+# Add the project root to the Python path so the data module can be imported
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data_training.tables import find_table, read_table
+
 def parse_args():
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(description="Fine-tune a Phi-3-mini model on the employee wellness dataset.")
     parser.add_argument("--model_id", type=str, default="microsoft/Phi-3-mini-4k-instruct", help="The model ID from Hugging Face.")
-    parser.add_argument("--dataset_path", type=str, default="./data", help="Path to the training and validation data files.")
+    parser.add_argument("--dataset_path", type=str, default="./data", help="Directory with the training and validation data files (CSV, Parquet or Feather).")
     parser.add_argument("--output_dir", type=str, default="./phi-3-mini-wellbeing-finetuned", help="Directory to save the fine-tuned model.")
     parser.add_argument("--learning_rate", type=float, default=2e-4, help="Learning rate for training.")
     parser.add_argument("--batch_size", type=int, default=4, help="Batch size for training and evaluation.")
@@ -32,11 +37,11 @@ def main():
 
     # --- 1. Load Dataset ---
     print("Loading dataset...")
-    data_files = {
-        "train": os.path.join(args.dataset_path, "train_data.csv"),
-        "test": os.path.join(args.dataset_path, "val_data.csv")
-    }
-    dataset = load_dataset('csv', data_files=data_files)
+    # Binary splits are read as they are stored, with no text parsing
+    dataset = DatasetDict({
+        "train": Dataset.from_pandas(read_table(find_table(args.dataset_path, "train_data"))),
+        "test": Dataset.from_pandas(read_table(find_table(args.dataset_path, "val_data")))
+    })
 
     # This is a placeholder for formatting the data into a prompt template.
     # For a real-world scenario, you would create a prompt that guides the model.
@@ -44,7 +49,9 @@ def main():
     def format_prompt(example):
         # The model expects a 'text' field.
         # We will create a simple text representation of our data.
-        features = [key + ": " + str(value) for key, value in example.items() if key != 'wellness_label']
+        # float32 features would otherwise print with spurious digits (0.30000001192092896)
+        features = [key + ": " + (f"{value:.6g}" if isinstance(value, float) else str(value))
+                    for key, value in example.items() if key != 'wellness_label']
         text = "Classify the wellness of an employee with the following metrics: {}. Wellness Level: {}".format(', '.join(features), example['wellness_label'])
         return {"text": text}
 
@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to the Python path so the pipeline module can be imported
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data_training.pipeline import CACHE_DIR, Stage, run_pipeline
+
+STAGES = ["generate", "preprocess", "train", "validate"]
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Run the generate -> preprocess -> train -> validate pipeline, skipping stages whose inputs and parameters are unchanged.")
+    parser.add_argument("--num_records", type=int, default=5000, help="Number of synthetic records to generate.")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the synthetic data.")
+    parser.add_argument("--test_size", type=float, default=0.2, help="Fraction of the data held out for validation.")
+    parser.add_argument("--random_state", type=int, default=42, help="Seed for the split and the model.")
+    parser.add_argument("--chunk_size", type=int, default=0, help="Preprocess in streaming mode with chunks of this many rows (default: in memory).")
+    parser.add_argument("--data_format", choices=["csv", "parquet", "feather"], default="csv", help="Format of the train/val splits.")
+    parser.add_argument("--n_estimators", type=int, default=100, help="Number of trees.")
+    parser.add_argument("--max_depth", type=int, default=None, help="Maximum tree depth.")
+    parser.add_argument("--min_samples_leaf", type=int, default=None, help="Minimum training rows per leaf.")
+    parser.add_argument("--max_samples", type=float, default=None, help="Rows drawn for each tree: a fraction or a count.")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES, help="Stages to run, in pipeline order.")
+    parser.add_argument("--cache_dir", type=str, default=CACHE_DIR, help="Directory of the stage output cache; delete it to reclaim space.")
+    parser.add_argument("--force", action="store_true", help="Run every stage even if it is unchanged.")
+    return parser.parse_args()
+
+def pipeline_stages(args):
+    """The pipeline's stages for the given arguments. Each lists the code it runs as inputs, so editing it reruns the stage."""
+    python = sys.executable
+    data = "data/synthetic_wellness_data.csv"
+    train_data = f"data/train_data.{args.data_format}"
+    val_data = f"data/val_data.{args.data_format}"
+    transformers = ["models/scaler.pkl", "models/department_encoder.pkl", "models/label_encoder.pkl"]
+    model = "models/wellness_model.pkl"
+    # Only the options given are passed on, so adding an option does not change existing fingerprints
+    train_options = []
+    for name in ("max_depth", "min_samples_leaf", "max_samples"):
+        if getattr(args, name) is not None:
+            train_options += [f"--{name}", str(getattr(args, name))]
+    stages = {
+        "generate": Stage(
+            "generate",
+            [python, "src/data_training/synthetic_data_generator.py", "--num_records", str(args.num_records),
+             "--seed", str(args.seed), "--output", data],
+            inputs=["src/data_training/synthetic_data_generator.py"],
+            outputs=[data]),
+        "preprocess": Stage(
+            "preprocess",
+            [python, "src/data_training/preprocess_data.py", "--input_path", data, "--train_path", train_data,
+             "--val_path", val_data, "--artifacts_path", "models", "--test_size", str(args.test_size),
+             "--random_state", str(args.random_state), "--chunk_size", str(args.chunk_size)],
+            inputs=[data, "src/data_training/preprocess_data.py", "src/data_training/tables.py"],
+            outputs=[train_data, val_data] + transformers),
+        "train": Stage(
+            "train",
+            [python, "scripts/train_model.py", "--train_data_path", train_data, "--n_estimators", str(args.n_estimators),
+             "--random_state", str(args.random_state)] + train_options,
+            inputs=[train_data] + transformers + ["src/server/resource_library.json", "scripts/train_model.py",
+                                                  "src/server/forest.py", "src/server/bundle.py", "src/data_training/tables.py",
+                                                  "src/data_training/model_search.py"],
+            outputs=[model, "models/wellness_model.npz", "models/wellness_bundle.bin"]),
+        "validate": Stage(
+            "validate",
+            [python, "scripts/validate_model.py", "--validation_data_path", val_data, "--model_path", model],
+            inputs=[val_data, model, "scripts/validate_model.py", "src/data_training/tables.py"],
+            outputs=["validation_results/confusion_matrix.png"]),
+    }
+    return [stages[name] for name in STAGES if name in args.stages]
+
+if __name__ == "__main__":
+    args = parse_args()
+    start = time.perf_counter()
+    ran = run_pipeline(pipeline_stages(args), args.cache_dir, args.force)
+    print(f"\nPipeline finished in {time.perf_counter() - start:.1f}s; ran: {', '.join(ran) or 'nothing (all cached)'}")
@@ -1,21 +1,173 @@
-import pandas as pd
+import argparse
+import json
+import os
+import sys
+import time
+import numpy as np
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
 import pickle
 
-# Load the training data
-df = pd.read_csv('data/train_data.csv')
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak memory is then not reported
+    resource = None
 
-# Split the data into features and labels
-X_train = df.drop('wellness_label', axis=1)
-y_train = df['wellness_label']
+# Add the project root to the Python path so the server module can be imported
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.server.forest import compile_forest, save_forest
+from src.server.bundle import build_bundle
+from src.data_training.tables import find_table, read_table
+from src.data_training.model_search import (
+    ACCURACY_TOLERANCE, HALVING_FACTOR, LATENCY_TOLERANCE, MIN_ROWS, N_CANDIDATES, sample_candidates, single_row_latency_us,
+    successive_halving
+)
 
-# Create and train the model
-model = RandomForestClassifier(n_estimators=100, random_state=42)
-model.fit(X_train, y_train)
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Train the RandomForest model and package it for the prediction server.")
+    parser.add_argument("--train_data_path", type=str, default=None, help="Training data (CSV, Parquet or Feather; default: data/train_data.*).")
+    parser.add_argument("--models_path", type=str, default="models", help="Directory holding the transformers, where the model is saved.")
+    parser.add_argument("--resource_library_path", type=str, default="src/server/resource_library.json", help="Path to the resource library JSON.")
+    parser.add_argument("--n_estimators", type=int, default=100, help="Number of trees.")
+    parser.add_argument("--random_state", type=int, default=42, help="Seed for reproducible training.")
+    parser.add_argument("--n_jobs", type=int, default=-1, help="Trees built in parallel (default: one per CPU). Does not change the model.")
+    parser.add_argument("--max_depth", type=int, default=None, help="Maximum tree depth; smaller trees are faster to evaluate.")
+    parser.add_argument("--min_samples_leaf", type=int, default=1, help="Minimum training rows per leaf; larger values give smaller trees.")
+    parser.add_argument("--max_leaf_nodes", type=int, default=None, help="Maximum leaves per tree.")
+    parser.add_argument("--max_features", type=str, default="sqrt", help="Features considered per split: sqrt, log2, an int or a fraction.")
+    parser.add_argument("--max_samples", type=parse_max_samples, default=None,
+                        help="Rows drawn for each tree: a fraction (<= 1) or a count. Bounds training memory and time on large datasets.")
+    parser.add_argument("--report_path", type=str, default=None, help="Also write the training report to this JSON file.")
+    parser.add_argument("--search", action="store_true",
+                        help="Choose n_estimators, max_depth, min_samples_leaf and max_features by successive halving, then train with the best.")
+    parser.add_argument("--val_data_path", type=str, default=None, help="Data candidates are scored on with --search (default: data/val_data.*).")
+    parser.add_argument("--search_candidates", type=int, default=N_CANDIDATES, help="Parameter sets drawn from the search space.")
+    parser.add_argument("--halving_factor", type=int, default=HALVING_FACTOR, help="Each round keeps 1/factor of the candidates on factor times the rows.")
+    parser.add_argument("--min_rows", type=int, default=MIN_ROWS, help="Training rows in the first round, at least.")
+    parser.add_argument("--accuracy_tolerance", type=float, default=ACCURACY_TOLERANCE,
+                        help="Candidates this close to the best accuracy are ranked by single-row latency, then size.")
+    parser.add_argument("--latency_tolerance", type=float, default=LATENCY_TOLERANCE,
+                        help="Among those, latencies within this fraction of the fastest count as equal and the smallest model wins.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for the search (default: one per CPU).")
+    return parser.parse_args()
 
-# Save the model
-with open('models/wellness_model.pkl', 'wb') as f:
-    pickle.dump(model, f)
+def parse_max_features(value):
+    """max_features as given on the command line: a name, an int count or a float fraction."""
+    if value in ("sqrt", "log2", "None"):
+        return None if value == "None" else value
+    return float(value) if "." in value else int(value)
 
-print("Model trained and saved to models/wellness_model.pkl")
\ No newline at end of file
+def parse_max_samples(value):
+    """max_samples as given on the command line: a fraction in (0, 1] or a whole number of rows."""
+    number = float(value)
+    if 0 < number <= 1:
+        return number
+    if number > 1 and number.is_integer():
+        return int(number)
+    raise argparse.ArgumentTypeError(f"max_samples must be a fraction in (0, 1] or a whole number of rows, not {value}.")
+
+def peak_memory_mb():
+    """The process's peak resident memory in MB, or None where it cannot be measured."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+def train_model(train_data_path, models_path, resource_library_path, n_estimators=100, random_state=42, n_jobs=-1,
+                max_depth=None, min_samples_leaf=1, max_leaf_nodes=None, max_features="sqrt", max_samples=None):
+    """
+    Trains the model and saves it as a pickle, as a compiled forest, and in
+    the server's bundle together with the transformers and resource library.
+
+    Returns the model and a report of the training time, peak memory, model
+    size and single-row latency.
+    """
+    # Load the training data
+    df = read_table(train_data_path)
+    print(f"Loaded {len(df)} training rows from {train_data_path}")
+
+    # Split the data into features and labels. The trees split on float32
+    # values, so float32 features train the same model without sklearn
+    # making a converted copy of the whole matrix.
+    X_train = df.drop('wellness_label', axis=1).astype(np.float32)
+    y_train = df['wellness_label']
+    del df
+
+    if max_samples is not None and max_samples > 1:
+        if not float(max_samples).is_integer():
+            raise ValueError(f"max_samples above 1 is a number of rows and must be whole, not {max_samples}.")
+        max_samples = int(max_samples)
+
+    # Create and train the model
+    model = RandomForestClassifier(n_estimators=n_estimators, random_state=random_state, n_jobs=n_jobs, max_depth=max_depth,
+                                   min_samples_leaf=min_samples_leaf, max_leaf_nodes=max_leaf_nodes,
+                                   max_features=max_features, max_samples=max_samples)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    training_seconds = time.perf_counter() - start
+    # Parallelism only pays off when training; predicting a few rows across threads is slower
+    model.set_params(n_jobs=None)
+
+    # Save the model
+    model_path = os.path.join(models_path, 'wellness_model.pkl')
+    with open(model_path, 'wb') as f:
+        pickle.dump(model, f)
+    print(f"Model trained and saved to {model_path}")
+
+    # Compile the forest into the flat array format loaded by the prediction server
+    forest = compile_forest(model)
+    save_forest(forest, os.path.join(models_path, 'wellness_model.npz'))
+    print(f"Compiled model saved to {os.path.join(models_path, 'wellness_model.npz')}")
+
+    # Package the model, transformers and resource library into the server's single-file bundle
+    bundle_path = os.path.join(models_path, 'wellness_bundle.bin')
+    build_bundle(models_path, resource_library_path, bundle_path, forest=forest)
+    print(f"Model bundle saved to {bundle_path}")
+
+    report = {
+        "training_rows": len(X_train),
+        "training_seconds": round(training_seconds, 3),
+        "peak_memory_mb": peak_memory_mb(),
+        "n_estimators": forest.n_estimators,
+        "nodes": len(forest.feature),
+        "max_depth": int(forest.max_depth),
+        "pickle_kib": round(os.path.getsize(model_path) / 1024, 1),
+        "compiled_kib": round(forest.nbytes / 1024, 1),
+        "single_row_latency_us": round(single_row_latency_us(forest, X_train.to_numpy()), 1),
+    }
+    peak = f"{report['peak_memory_mb']:.0f} MB" if report['peak_memory_mb'] is not None else "n/a"
+    print(f"Trained in {report['training_seconds']:.2f}s (peak memory {peak}); "
+          f"{report['n_estimators']} trees, {report['nodes']} nodes, depth {report['max_depth']}; "
+          f"pickle {report['pickle_kib']} KiB, compiled {report['compiled_kib']} KiB; "
+          f"single-row latency {report['single_row_latency_us']:.0f}us")
+    return model, report
+
+if __name__ == "__main__":
+    args = parse_args()
+    train_data_path = args.train_data_path or find_table('data', 'train_data')
+    params = {"n_estimators": args.n_estimators, "max_depth": args.max_depth, "min_samples_leaf": args.min_samples_leaf,
+              "max_features": parse_max_features(args.max_features)}
+    search = None
+    if args.search:
+        candidates = sample_candidates(n_candidates=args.search_candidates, random_state=args.random_state)
+        best, history = successive_halving(train_data_path, args.val_data_path or find_table('data', 'val_data'), candidates,
+                                           args.halving_factor, args.min_rows, args.accuracy_tolerance, args.workers,
+                                           args.random_state, args.latency_tolerance,
+                                           {"max_leaf_nodes": args.max_leaf_nodes, "max_samples": args.max_samples})
+        print("\nFinal round (chosen first):")
+        for result in history[-1]:
+            print(f"  accuracy {result['accuracy']:.4f}  latency {result['latency_us']:6.0f}us  "
+                  f"{result['nbytes'] / 1024:8.1f} KiB  {result['params']}")
+        params = best["params"]
+        search = {"best": best, "rounds": history}
+        print(f"Training with {params}\n")
+    _, report = train_model(train_data_path, args.models_path, args.resource_library_path, params["n_estimators"],
+                            args.random_state, args.n_jobs, params["max_depth"], params["min_samples_leaf"],
+                            args.max_leaf_nodes, params["max_features"], args.max_samples)
+    if search is not None:
+        report["search"] = search
+    if args.report_path:
+        with open(args.report_path, 'w') as f:
+            json.dump(report, f, indent=2)
@@ -1,15 +1,19 @@
 import argparse
 import os
-import pandas as pd
+import sys
 import pickle
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+# Add the project root to the Python path so the data module can be imported
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data_training.tables import find_table, read_table
+
 def parse_args():
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(description="Validate the trained RandomForest model.")
-    parser.add_argument("--validation_data_path", type=str, default="data/val_data.csv", help="Path to the validation data CSV file.")
+    parser.add_argument("--validation_data_path", type=str, default=None, help="Path to the validation data (CSV, Parquet or Feather; default: data/val_data.*).")
     parser.add_argument("--model_path", type=str, default="models/wellness_model.pkl", help="Path to the trained model pickle file.")
     parser.add_argument("--results_path", type=str, default="validation_results", help="Directory to save validation results.")
     return parser.parse_args()
@@ -27,7 +31,7 @@ def validate_model(val_data_path, model_path, results_path):
 
     # Load the validation data
     try:
-        val_df = pd.read_csv(val_data_path)
+        val_df = read_table(val_data_path)
     except FileNotFoundError:
         print(f"Error: Validation data not found at {val_data_path}")
         print("Please ensure you have run the preprocessing script first.")
@@ -82,4 +86,4 @@ def validate_model(val_data_path, model_path, results_path):
 
 if __name__ == "__main__":
     args = parse_args()
-    validate_model(args.validation_data_path, args.model_path, args.results_path)
\ No newline at end of file
+    validate_model(args.validation_data_path or find_table('data', 'val_data'), args.model_path, args.results_path)
\ No newline at end of file
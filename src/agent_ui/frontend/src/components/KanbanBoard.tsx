@@ -6,15 +6,36 @@ import { Typography, Box } from '@mui/material';
 // This is a placeholder for the full Kanban board implementation.
 // I will build this out with columns and draggable cards.
 
+// Finds the column holding a card, or the column itself when dropping onto an empty column
+const findColumn = (board, id) =>
+    board.columns.find((column) => column.id === id || column.tasks.some((task) => task.id === id));
+
 const KanbanBoard = () => {
-    const [items, setItems] = useState({});
+    const [board, setBoard] = useState({ columns: [], version: 0 });
+
+    const loadBoard = () => fetch('/api/board').then(res => res.json()).then(data => setBoard(data));
 
-    // Placeholder for fetching data from the backend API
     useEffect(() => {
-        // fetch('/api/board').then(res => res.json()).then(data => setItems(data));
-        console.log("Fetching board data...");
+        loadBoard();
     }, []);
 
+    // Sends only the change; the version makes the server reject it if someone else changed the board first
+    const patchBoard = (operations) =>
+        fetch('/api/board', {
+            method: 'PATCH',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ version: board.version, operations }),
+        })
+            .then(res => res.json().then(data => ({ ok: res.ok, data })))
+            .then(({ ok, data }) => {
+                if (ok) {
+                    setBoard((current) => ({ ...current, version: data.version }));
+                } else {
+                    // Conflict or invalid change: show what the server has
+                    loadBoard();
+                }
+            });
+
     const sensors = useSensors(
         useSensor(PointerSensor),
         useSensor(KeyboardSensor, {
@@ -25,8 +46,26 @@ const KanbanBoard = () => {
     const handleDragEnd = (event) => {
         const { active, over } = event;
         if (over && active.id !== over.id) {
-            // Logic to handle reordering will be implemented here
-            console.log(`Dragged ${active.id} over ${over.id}`);
+            const source = findColumn(board, active.id);
+            const target = findColumn(board, over.id);
+            if (!source || !target) {
+                return;
+            }
+            const card = source.tasks.find((task) => task.id === active.id);
+            const remaining = target.tasks.filter((task) => task.id !== active.id);
+            const overIndex = remaining.findIndex((task) => task.id === over.id);
+            const position = overIndex === -1 ? remaining.length : overIndex;
+            setBoard((current) => ({
+                ...current,
+                columns: current.columns.map((column) => {
+                    const tasks = column.tasks.filter((task) => task.id !== active.id);
+                    if (column.id === target.id) {
+                        tasks.splice(position, 0, card);
+                    }
+                    return { ...column, tasks };
+                }),
+            }));
+            patchBoard([{ op: 'move_card', card_id: active.id, column_id: target.id, position }]);
         }
     };
 
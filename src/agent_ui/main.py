@@ -1,8 +1,17 @@
+import argparse
 import os
-import json
-import time
+import signal
+import sys
+import uuid
 from bottle import route, run, static_file, request, response
 
+# Allow `python src/agent_ui/main.py` from the project root
+if not __package__:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.agent_ui.serving import CachedFile, ThreadedServer, precompress, serve_static
+from src.agent_ui.sqlite_store import SqliteBoardStore, SqliteDatabase, SqliteGoalStore
+from src.agent_ui.storage import BoardError, BoardStore, GoalStore, VersionConflict, check_board, check_operations
+
 # --- Configuration ---
 HOST = 'localhost'
 PORT = 8080
@@ -17,32 +26,32 @@ DATA_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'data')
 SETTINGS_FILE = os.path.join(DATA_PATH, 'settings.json')
 KANBAN_DATA_FILE = os.path.join(DATA_PATH, 'kanban_board.json')
 GOALS_DATA_FILE = os.path.join(DATA_PATH, 'goals.json')
-
-
-# --- Data Helper Functions ---
-def load_json_data(file_path, default_data):
-    """Generic function to load data from a JSON file."""
-    if not os.path.exists(file_path):
-        return default_data
-    try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    except (IOError, json.JSONDecodeError):
-        return default_data
-
-def save_json_data(file_path, data):
-    """Generic function to save data to a JSON file."""
-    try:
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
-    except IOError as e:
-        print(f"Error saving data to {file_path}: {e}")
+# Set to an SQLite database path (e.g. data/agent_ui.db) to keep the board and
+# goals there instead of in the JSON files. The JSON files are imported on first use.
+DATABASE_FILE = os.environ.get('WELLNESS_AGENT_UI_DB', '')
+
+# --- Data Stores ---
+def open_stores(database_file=DATABASE_FILE):
+    """
+    The board and goal stores. By default the JSON data files are kept in
+    memory and changes are written back atomically shortly after they are
+    made (see storage.py); with a database file they live in SQLite.
+    """
+    if database_file:
+        db = SqliteDatabase(database_file)
+        if db.migrate_from_json(KANBAN_DATA_FILE, GOALS_DATA_FILE):
+            print(f"Imported {KANBAN_DATA_FILE} and {GOALS_DATA_FILE} into {database_file}.")
+        return SqliteBoardStore(db), SqliteGoalStore(db)
+    return BoardStore(KANBAN_DATA_FILE), GoalStore(GOALS_DATA_FILE)
+
+BOARD_STORE, GOAL_STORE = open_stores()
 
 # --- Static File Server for React App ---
-# Serves the static assets (JS, CSS, images) from the 'dist/assets' directory
+# Serves the static assets (JS, CSS, images) from the 'dist/assets' directory,
+# precompressed when available. Those with hashed names are cached by browsers for a year.
 @route('/assets/<filepath:path>')
 def server_assets(filepath):
-    return static_file(filepath, root=ASSETS_PATH)
+    return serve_static(filepath, ASSETS_PATH, hashed_names=True)
 
 # --- API Routes ---
 # These routes provide the backend functionality for the frontend application.
@@ -50,23 +59,60 @@ def server_assets(filepath):
 @route('/api/board', method='GET')
 def get_board_data():
     response.content_type = 'application/json'
-    return load_json_data(KANBAN_DATA_FILE, {"columns": []})
+    return BOARD_STORE.read_json()
+
+def version_conflict(e):
+    response.status = 409
+    return {"status": "error", "message": str(e), "version": e.version}
 
 @route('/api/board', method='POST')
 def save_board_data():
+    """Replaces the whole board. If the board includes a 'version', it must be the current one."""
     data = request.json
     if data is None:
         response.status = 400
         return {"status": "error", "message": "Invalid JSON payload."}
-    save_json_data(KANBAN_DATA_FILE, data)
-    return {"status": "success"}
+    try:
+        version = BOARD_STORE.replace(check_board(data), version=data.pop('version', None))
+    except BoardError as e:
+        response.status = 400
+        return {"status": "error", "message": str(e)}
+    except VersionConflict as e:
+        return version_conflict(e)
+    return {"status": "success", "version": version}
+
+@route('/api/board', method='PATCH')
+def update_board():
+    """
+    Applies card operations to the board, all or none:
+    {"version": 3, "operations": [{"op": "move_card", "card_id": ..., "column_id": ..., "position": 0}, ...]}.
+    Operations are add_card (column_id, card, position), move_card (card_id,
+    column_id, position), update_card (card_id, fields) and delete_card
+    (card_id); position defaults to the end of the column. If 'version' is
+    given and the board has changed since, nothing is applied and the
+    response is 409 with the current version.
+    """
+    data = request.json
+    if not isinstance(data, dict) or 'operations' not in data:
+        response.status = 400
+        return {"status": "error", "message": "Payload must include 'operations'."}
+    try:
+        operations = check_operations(data['operations'])
+        version = BOARD_STORE.apply(operations, version=data.get('version'))
+    except BoardError as e:
+        response.status = 400
+        return {"status": "error", "message": str(e)}
+    except VersionConflict as e:
+        return version_conflict(e)
+    added = [operation['card']['id'] for operation in operations if operation['op'] == 'add_card']
+    return {"status": "success", "version": version, "added": added}
 
 # --- Goals API ---
 @route('/api/goals', method='GET')
 def get_goals():
     """API endpoint to fetch all goals."""
     response.content_type = 'application/json'
-    return load_json_data(GOALS_DATA_FILE, {"goals": []})
+    return GOAL_STORE.read_json()
 
 @route('/api/goals', method='POST')
 def add_goal():
@@ -76,14 +122,12 @@ def add_goal():
         response.status = 400
         return {"status": "error", "message": "Payload must include 'content'."}
 
-    goals_data = load_json_data(GOALS_DATA_FILE, {"goals": []})
     new_goal = {
-        "id": f"goal-{int(time.time())}",
+        "id": f"goal-{uuid.uuid4().hex[:12]}",
         "content": data['content'],
         "status": "active"
     }
-    goals_data['goals'].append(new_goal)
-    save_json_data(GOALS_DATA_FILE, goals_data)
+    GOAL_STORE.add(new_goal)
     response.status = 201
     return new_goal
 
@@ -95,46 +139,59 @@ def update_goal_status(goal_id):
         response.status = 400
         return {"status": "error", "message": "Payload must include 'status'."}
 
-    goals_data = load_json_data(GOALS_DATA_FILE, {"goals": []})
-    goal_found = False
-    for goal in goals_data['goals']:
-        if goal['id'] == goal_id:
-            goal['status'] = data['status']
-            goal_found = True
-            break
-
-    if not goal_found:
+    if not GOAL_STORE.update(goal_id, status=data['status']):
         response.status = 404
         return {"status": "error", "message": "Goal not found."}
-
-    save_json_data(GOALS_DATA_FILE, goals_data)
     return {"status": "success"}
 
 @route('/api/goals/<goal_id>', method='DELETE')
 def delete_goal(goal_id):
     """API endpoint to delete a goal."""
-    goals_data = load_json_data(GOALS_DATA_FILE, {"goals": []})
-    initial_len = len(goals_data['goals'])
-    goals_data['goals'] = [g for g in goals_data['goals'] if g['id'] != goal_id]
-
-    if len(goals_data['goals']) == initial_len:
+    if not GOAL_STORE.delete(goal_id):
         response.status = 404
         return {"status": "error", "message": "Goal not found."}
-
-    save_json_data(GOALS_DATA_FILE, goals_data)
     return {"status": "success"}
 
 # --- SPA Catch-all Route ---
-# This route serves the main index.html for any non-API, non-asset request.
+# This route serves the main index.html (from memory) for any non-API,
+# non-asset request, and the other files at the root of 'dist' (e.g. favicons),
+# which keep their names across builds and so are always revalidated.
 # It allows React Router to handle the routing on the client side.
+INDEX_FILE = CachedFile(os.path.join(FRONTEND_PATH, 'index.html'))
+
 @route('/')
 @route('/<path:path>')
 def serve_react_app(path=None):
-    return static_file('index.html', root=FRONTEND_PATH)
+    if path and os.path.isfile(os.path.join(FRONTEND_PATH, path)):
+        return serve_static(path, FRONTEND_PATH)
+    if not os.path.isfile(INDEX_FILE.path):
+        return static_file('index.html', root=FRONTEND_PATH)
+    return INDEX_FILE.response()
 
 # --- Main Execution ---
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the WAVES personal dashboard backend.")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--production', action='store_true',
+                        help="Serve with a multi-threaded server (no debug mode or request log) and precompress the built frontend.")
+    parser.add_argument('--server', default='threaded',
+                        help="Server for --production: 'threaded' (standard library, the default) or any Bottle server adapter name, e.g. 'waitress'.")
+    return parser.parse_args(argv)
+
 if __name__ == '__main__':
-    print(f"Starting the WAVES backend server at http://{HOST}:{PORT}")
-    print(f"For development, run the React dev server from 'src/agent_ui/frontend' (npm run dev).")
-    print(f"For production, build the React app and this server will serve the static files.")
-    run(host=HOST, port=PORT, debug=True)
\ No newline at end of file
+    args = parse_args()
+    print(f"Starting the WAVES backend server at http://{args.host}:{args.port}")
+    if args.production:
+        if os.path.isdir(FRONTEND_PATH):
+            print(f"Precompressed {precompress(FRONTEND_PATH)} frontend files.")
+        else:
+            print(f"No built frontend at {FRONTEND_PATH}; run 'npm run build' in 'src/agent_ui/frontend' first.")
+        server = ThreadedServer if args.server == 'threaded' else args.server
+        # Exit normally on SIGTERM too, so pending data changes are flushed
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        run(host=args.host, port=args.port, server=server, quiet=True)
+    else:
+        print(f"For development, run the React dev server from 'src/agent_ui/frontend' (npm run dev).")
+        print(f"For production, build the React app and run this server with --production.")
+        run(host=args.host, port=args.port, debug=True)
\ No newline at end of file
@@ -0,0 +1,145 @@
+import gzip
+import mimetypes
+import os
+import re
+import socketserver
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+from bottle import HTTPResponse, ServerAdapter, request, static_file
+
+try:
+    import brotli
+except ImportError:
+    # Assets are then only precompressed with gzip
+    brotli = None
+
+# File types worth compressing; images and fonts are already compressed
+COMPRESSIBLE_EXTENSIONS = {'.html', '.js', '.mjs', '.css', '.json', '.svg', '.map', '.txt', '.xml', '.wasm'}
+# Files smaller than this are sent as they are
+MIN_COMPRESS_BYTES = 1024
+# Vite names the files it builds into assets/ like index-Bx3kQ9aZ.js; their content never changes under
+# the same name. Only those are cached for good: files copied as they are (favicons, manifests) keep their names.
+HASHED_NAME = re.compile(r'-[A-Za-z0-9_]{8,}\.(js|mjs|css|map|wasm|json|svg|png|jpe?g|gif|webp|avif|ico|woff2?|ttf|otf)$')
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+# Everything else may be cached but must be revalidated (cheap, thanks to ETags)
+REVALIDATE_CACHE = 'no-cache'
+
+def _compress_file(path, suffix, compress):
+    target = path + suffix
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+        return False
+    with open(path, 'rb') as f:
+        data = compress(f.read())
+    temp_path = target + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, target)
+    return True
+
+def precompress(root):
+    """
+    Write .gz (and .br, if the brotli package is installed) files next to
+    every compressible file under root that is missing or older than its
+    source. Returns the number of files written.
+    """
+    encoders = [('.gz', lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        encoders.append(('.br', lambda data: brotli.compress(data, quality=11)))
+    written = 0
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            if os.path.splitext(name)[1] not in COMPRESSIBLE_EXTENSIONS or os.path.getsize(path) < MIN_COMPRESS_BYTES:
+                continue
+            for suffix, compress in encoders:
+                written += _compress_file(path, suffix, compress)
+    return written
+
+def accepted_encodings():
+    """The content codings the client accepts (q=0 excluded)."""
+    accepted = set()
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        coding, _, params = part.partition(';')
+        params = params.replace(' ', '')
+        try:
+            q = float(params[2:]) if params.startswith('q=') else 1.0
+        except ValueError:
+            q = 1.0
+        if coding.strip() and q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+def serve_static(filepath, root, hashed_names=False):
+    """
+    Serve a file under root, sending its precompressed .br or .gz variant
+    when the client accepts it. If root is the bundler's output directory
+    (hashed_names), files with a content hash in their name are cached for
+    a year; other files must be revalidated.
+    """
+    path = os.path.abspath(os.path.join(root, filepath))
+    mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    cache_control = IMMUTABLE_CACHE if hashed_names and HASHED_NAME.search(filepath) else REVALIDATE_CACHE
+    accepted = accepted_encodings()
+    for suffix, coding in (('.br', 'br'), ('.gz', 'gzip')):
+        if (coding in accepted or '*' in accepted) and os.path.isfile(path + suffix):
+            result = static_file(filepath + suffix, root=root, mimetype=mimetype)
+            result.set_header('Content-Encoding', coding)
+            break
+    else:
+        result = static_file(filepath, root=root, mimetype=mimetype)
+    result.set_header('Vary', 'Accept-Encoding')
+    if result.status_code < 400:
+        result.set_header('Cache-Control', cache_control)
+    return result
+
+class CachedFile:
+    """
+    A small file (like the SPA's index.html) held in memory with its
+    compressed variants, reloaded when it changes on disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # (mtime, {coding: body}, etag), replaced as a whole so concurrent requests see a consistent version
+        self._state = (None, {}, None)
+
+    def _load(self):
+        mtime = os.path.getmtime(self.path)
+        state = self._state
+        if mtime == state[0]:
+            return state
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        variants = {None: data, 'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['br'] = brotli.compress(data, quality=11)
+        state = self._state = (mtime, variants, f'"{int(mtime * 1000):x}-{len(data):x}"')
+        return state
+
+    def response(self):
+        _, variants, etag = self._load()
+        headers = {'Content-Type': mimetypes.guess_type(self.path)[0] or 'application/octet-stream',
+                   'Cache-Control': REVALIDATE_CACHE, 'Vary': 'Accept-Encoding'}
+        accepted = accepted_encodings()
+        coding = next((c for c in ('br', 'gzip') if c in variants and c in accepted), None)
+        headers['ETag'] = etag[:-1] + (f'-{coding}"' if coding else '"')
+        if request.headers.get('If-None-Match') == headers['ETag']:
+            return HTTPResponse(status=304, headers=headers)
+        if coding:
+            headers['Content-Encoding'] = coding
+        return HTTPResponse(variants[coding], **headers)
+
+class ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+class QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+class ThreadedServer(ServerAdapter):
+    """Bottle adapter for the standard library WSGI server, handling each connection in its own thread."""
+
+    def run(self, handler):
+        handler_class = QuietHandler if self.quiet else WSGIRequestHandler
+        server = make_server(self.host, self.port, handler, server_class=ThreadingWSGIServer, handler_class=handler_class)
+        self.port = server.server_port
+        server.serve_forever()
@@ -0,0 +1,244 @@
+import json
+import sqlite3
+import threading
+
+from src.agent_ui.storage import BoardError, VersionConflict, load_json
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS goals (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS board_columns (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    column_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_by_column ON tasks (column_id, position);
+"""
+
+def encode(item, exclude=()):
+    """The JSON text stored for an item, without the fields kept in their own columns."""
+    return json.dumps({key: value for key, value in item.items() if key not in exclude}, separators=(',', ':'))
+
+class SqliteDatabase:
+    """
+    An SQLite database file for the agent_ui data, in WAL mode so reads
+    never wait for writes. Each thread gets its own connection.
+    """
+
+    def __init__(self, path, busy_timeout=5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self.connection().executescript(SCHEMA)
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; transactions are started explicitly by transaction()
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Safe with WAL: a power loss can only lose the last transactions, never corrupt the file
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def transaction(self):
+        """A write transaction, holding the database's write lock from the start so read-modify-writes cannot interleave."""
+        return _Transaction(self.connection())
+
+    def migrate_from_json(self, board_file, goals_file):
+        """
+        Import the JSON data files, once. Does nothing if the database has
+        already been migrated or already holds data. Returns whether it imported.
+        """
+        with self.transaction() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from_json'").fetchone():
+                return False
+            empty = not any(conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone()
+                            for table in ("goals", "board_columns", "tasks"))
+            if empty:
+                write_board(conn, load_json(board_file, {"columns": []}))
+                goals = load_json(goals_file, {"goals": []}).get("goals", [])
+                conn.executemany("INSERT OR IGNORE INTO goals (id, data) VALUES (?, ?)",
+                                 [(goal["id"], encode(goal, exclude=("id",))) for goal in goals])
+            conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+                         (json.dumps([board_file, goals_file]),))
+            return empty
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+
+def board_version(conn):
+    row = conn.execute("SELECT value FROM meta WHERE key = 'board_version'").fetchone()
+    return int(row[0]) if row else 0
+
+def bump_board_version(conn, version=None):
+    """Increment the board version, first checking it is still `version` if given. Returns the new version."""
+    current = board_version(conn)
+    if version is not None and version != current:
+        raise VersionConflict(current)
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('board_version', ?)", (str(current + 1),))
+    return current + 1
+
+def read_board(conn):
+    columns = []
+    by_id = {}
+    for column_id, data in conn.execute("SELECT id, data FROM board_columns ORDER BY position"):
+        column = dict(id=column_id, **json.loads(data), tasks=[])
+        by_id[column_id] = column
+        columns.append(column)
+    for task_id, column_id, data in conn.execute("SELECT id, column_id, data FROM tasks ORDER BY column_id, position"):
+        if column_id in by_id:
+            by_id[column_id]["tasks"].append(dict(id=task_id, **json.loads(data)))
+    return {"columns": columns, "version": board_version(conn)}
+
+def write_board(conn, board):
+    """
+    Make the stored board match `board`, writing only the columns and
+    tasks that were added, changed or moved and deleting the ones that are gone.
+    """
+    columns = {}
+    tasks = {}
+    for position, column in enumerate(board.get("columns", [])):
+        columns[column["id"]] = (position, encode(column, exclude=("id", "tasks")))
+        for task_position, task in enumerate(column.get("tasks", [])):
+            tasks[task["id"]] = (column["id"], task_position, encode(task, exclude=("id",)))
+
+    stored_columns = {row[0]: row[1:] for row in conn.execute("SELECT id, position, data FROM board_columns")}
+    conn.executemany("INSERT OR REPLACE INTO board_columns (id, position, data) VALUES (?, ?, ?)",
+                     [(column_id,) + row for column_id, row in columns.items() if stored_columns.get(column_id) != row])
+    conn.executemany("DELETE FROM board_columns WHERE id = ?", [(column_id,) for column_id in stored_columns
+                                                                if column_id not in columns])
+
+    stored_tasks = {row[0]: row[1:] for row in conn.execute("SELECT id, column_id, position, data FROM tasks")}
+    conn.executemany("INSERT OR REPLACE INTO tasks (id, column_id, position, data) VALUES (?, ?, ?, ?)",
+                     [(task_id,) + row for task_id, row in tasks.items() if stored_tasks.get(task_id) != row])
+    conn.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in stored_tasks if task_id not in tasks])
+
+class SqliteBoardStore:
+    """The Kanban board in SQLite, with the same interface as a JsonStore."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def read_json(self):
+        conn = self.db.connection()
+        # One read transaction, so the board and its version match
+        conn.execute("BEGIN")
+        try:
+            return json.dumps(read_board(conn))
+        finally:
+            conn.execute("COMMIT")
+
+    def replace(self, data, version=None):
+        with self.db.transaction() as conn:
+            version = bump_board_version(conn, version)
+            write_board(conn, data)
+            return version
+
+    def apply(self, operations, version=None):
+        """Apply board operations in one transaction, so they all apply or none do. Returns the new version."""
+        with self.db.transaction() as conn:
+            version = bump_board_version(conn, version)
+            for operation in operations:
+                self._apply(conn, operation)
+            return version
+
+    @staticmethod
+    def _position(conn, column_id, position):
+        """The position to insert at in a column, making room for it. Columns are short, so shifting is cheap."""
+        if not conn.execute("SELECT 1 FROM board_columns WHERE id = ?", (column_id,)).fetchone():
+            raise BoardError(f"Unknown column '{column_id}'.")
+        end = conn.execute("SELECT COUNT(*) FROM tasks WHERE column_id = ?", (column_id,)).fetchone()[0]
+        if position is None or position >= end:
+            return end
+        conn.execute("UPDATE tasks SET position = position + 1 WHERE column_id = ? AND position >= ?", (column_id, position))
+        return position
+
+    @staticmethod
+    def _take(conn, card_id):
+        """Remove a card from its column, closing the gap. Returns (column_id, data)."""
+        row = conn.execute("SELECT column_id, position, data FROM tasks WHERE id = ?", (card_id,)).fetchone()
+        if row is None:
+            raise BoardError(f"Unknown card '{card_id}'.")
+        column_id, position, data = row
+        conn.execute("DELETE FROM tasks WHERE id = ?", (card_id,))
+        conn.execute("UPDATE tasks SET position = position - 1 WHERE column_id = ? AND position > ?", (column_id, position))
+        return column_id, data
+
+    def _apply(self, conn, operation):
+        op = operation["op"]
+        if op == "add_card":
+            card = operation["card"]
+            if conn.execute("SELECT 1 FROM tasks WHERE id = ?", (card["id"],)).fetchone():
+                raise BoardError(f"Card '{card['id']}' already exists.")
+            position = self._position(conn, operation["column_id"], operation.get("position"))
+            conn.execute("INSERT INTO tasks (id, column_id, position, data) VALUES (?, ?, ?, ?)",
+                         (card["id"], operation["column_id"], position, encode(card, exclude=("id",))))
+        elif op == "move_card":
+            _, data = self._take(conn, operation["card_id"])
+            position = self._position(conn, operation["column_id"], operation.get("position"))
+            conn.execute("INSERT INTO tasks (id, column_id, position, data) VALUES (?, ?, ?, ?)",
+                         (operation["card_id"], operation["column_id"], position, data))
+        elif op == "update_card":
+            row = conn.execute("SELECT data FROM tasks WHERE id = ?", (operation["card_id"],)).fetchone()
+            if row is None:
+                raise BoardError(f"Unknown card '{operation['card_id']}'.")
+            data = dict(json.loads(row[0]), **operation["fields"])
+            conn.execute("UPDATE tasks SET data = ? WHERE id = ?", (encode(data), operation["card_id"]))
+        else:
+            self._take(conn, operation["card_id"])
+
+    def flush(self):
+        """Changes are committed as they are made; nothing to do."""
+
+class SqliteGoalStore:
+    """The goals in SQLite, looked up by their indexed id, with the same interface as a GoalStore."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def read_json(self):
+        rows = self.db.connection().execute("SELECT id, data FROM goals ORDER BY seq")
+        return json.dumps({"goals": [dict(id=goal_id, **json.loads(data)) for goal_id, data in rows]})
+
+    def add(self, goal):
+        with self.db.transaction() as conn:
+            cursor = conn.execute("INSERT OR IGNORE INTO goals (id, data) VALUES (?, ?)",
+                                  (goal["id"], encode(goal, exclude=("id",))))
+            return cursor.rowcount == 1
+
+    def update(self, goal_id, **fields):
+        with self.db.transaction() as conn:
+            row = conn.execute("SELECT data FROM goals WHERE id = ?", (goal_id,)).fetchone()
+            if row is None:
+                return False
+            data = json.loads(row[0])
+            data.update(fields)
+            conn.execute("UPDATE goals SET data = ? WHERE id = ?", (encode(data), goal_id))
+            return True
+
+    def delete(self, goal_id):
+        with self.db.transaction() as conn:
+            return conn.execute("DELETE FROM goals WHERE id = ?", (goal_id,)).rowcount == 1
+
+    def flush(self):
+        """Changes are committed as they are made; nothing to do."""
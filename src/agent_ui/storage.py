@@ -0,0 +1,345 @@
+import atexit
+import copy
+import json
+import os
+import tempfile
+import threading
+import uuid
+
+# How long a change may wait in memory before it is written out. Writes
+# within this window are coalesced into one.
+FLUSH_DELAY_SECONDS = 0.5
+
+# Board operations accepted by PATCH /api/board, with their required fields
+BOARD_OPERATIONS = {
+    "add_card": ("column_id", "card"),
+    "move_card": ("card_id", "column_id"),
+    "update_card": ("card_id", "fields"),
+    "delete_card": ("card_id",),
+}
+
+# One lock per data file, shared by every store opened on it
+_FILE_LOCKS = {}
+_FILE_LOCKS_GUARD = threading.Lock()
+
+def file_lock(file_path):
+    """The lock guarding a data file within this process."""
+    key = os.path.realpath(file_path)
+    with _FILE_LOCKS_GUARD:
+        return _FILE_LOCKS.setdefault(key, threading.RLock())
+
+class BoardError(ValueError):
+    """A board operation that cannot be applied, e.g. one naming an unknown card."""
+
+class VersionConflict(Exception):
+    """The board changed since the version the client based its change on."""
+
+    def __init__(self, version):
+        super().__init__(f"The board is at version {version}.")
+        self.version = version
+
+def check_operations(operations):
+    """
+    Validate the shape of a list of board operations, adding an id to new
+    cards that lack one. Raises BoardError.
+    """
+    if not isinstance(operations, list):
+        raise BoardError("'operations' must be a list.")
+    for operation in operations:
+        if not isinstance(operation, dict) or operation.get("op") not in BOARD_OPERATIONS:
+            raise BoardError(f"Each operation needs an 'op' of {', '.join(BOARD_OPERATIONS)}.")
+        missing = [field for field in BOARD_OPERATIONS[operation["op"]] if field not in operation]
+        if missing:
+            raise BoardError(f"'{operation['op']}' needs {', '.join(missing)}.")
+        if operation["op"] == "add_card":
+            if not isinstance(operation["card"], dict):
+                raise BoardError("'card' must be an object.")
+            operation["card"].setdefault("id", f"task-{uuid.uuid4().hex[:12]}")
+        if operation["op"] == "update_card" and (not isinstance(operation["fields"], dict) or "id" in operation["fields"]):
+            raise BoardError("'fields' must be an object and cannot change the card's id.")
+        position = operation.get("position")
+        if position is not None and (not isinstance(position, int) or position < 0):
+            raise BoardError("'position' must be a non-negative integer.")
+    return operations
+
+def check_board(board):
+    """
+    Validate the shape of a whole board: an object with a 'columns' list of
+    objects with an 'id', each with an optional 'tasks' list of objects with
+    an 'id'. Raises BoardError.
+    """
+    if not isinstance(board, dict):
+        raise BoardError("The board must be an object.")
+    columns = board.get("columns")
+    if not isinstance(columns, list):
+        raise BoardError("'columns' must be a list.")
+    for column in columns:
+        if not isinstance(column, dict) or "id" not in column:
+            raise BoardError("Each column must be an object with an 'id'.")
+        tasks = column.get("tasks", [])
+        if not isinstance(tasks, list) or not all(isinstance(task, dict) and "id" in task for task in tasks):
+            raise BoardError(f"The tasks of column '{column['id']}' must be a list of objects with an 'id'.")
+    return board
+
+def load_json(file_path, default_data):
+    """Read a JSON data file, or a copy of default_data if it is missing or unreadable."""
+    if os.path.exists(file_path):
+        try:
+            with open(file_path, 'r') as f:
+                return json.load(f)
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"Error loading data from {file_path}: {e}")
+    return copy.deepcopy(default_data)
+
+def atomic_write_json(file_path, data):
+    """
+    Write data to file_path as JSON without ever leaving a partial file:
+    it is written to a temporary file in the same directory, synced, then
+    renamed over the original.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(file_path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+class JsonStore:
+    """
+    A JSON data file held in memory.
+
+    Reads are served from memory (the serialized form is cached until the
+    next change), and changes are applied in memory under the file's lock
+    and written out by a background flush after `flush_delay` seconds, so a
+    burst of changes costs one write. Use `flush_delay=0` to write each
+    change before returning. Pending changes are flushed at exit.
+    """
+
+    def __init__(self, file_path, default_data, flush_delay=FLUSH_DELAY_SECONDS):
+        self.file_path = file_path
+        self.flush_delay = flush_delay
+        self._default_data = default_data
+        self._lock = file_lock(file_path)
+        self._data = None
+        self._serialized = None
+        self._dirty = False
+        self._timer = None
+        atexit.register(self.flush)
+
+    def _load(self, file_path):
+        return load_json(file_path, self._default_data)
+
+    def _loaded(self):
+        """The in-memory data, loaded on first use. Call with the lock held."""
+        if self._data is None:
+            self._data = self._load(self.file_path)
+        return self._data
+
+    def _to_json(self, data):
+        """The file's JSON document for the in-memory data."""
+        return data
+
+    def read_json(self):
+        """The data serialized as a JSON string."""
+        with self._lock:
+            if self._serialized is None:
+                self._serialized = json.dumps(self._to_json(self._loaded()))
+            return self._serialized
+
+    def mutate(self, change):
+        """Apply change(data) under the lock and schedule a flush. Returns what change returns."""
+        with self._lock:
+            result = change(self._loaded())
+            self._changed()
+            return result
+
+    def replace(self, data):
+        """Replace the whole document."""
+        with self._lock:
+            self._data = data
+            self._changed()
+
+    def _changed(self):
+        """Record that the in-memory data changed. Call with the lock held."""
+        self._serialized = None
+        self._dirty = True
+        if self.flush_delay <= 0:
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.flush_delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Write pending changes to disk now."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            try:
+                atomic_write_json(self.file_path, self._to_json(self._data))
+                self._dirty = False
+            except (IOError, OSError) as e:
+                print(f"Error saving data to {self.file_path}: {e}")
+
+class GoalStore(JsonStore):
+    """
+    The goals file, kept in memory as an id -> goal mapping (in insertion
+    order) so goals are found, updated and deleted without a scan.
+    """
+
+    def __init__(self, file_path, flush_delay=FLUSH_DELAY_SECONDS):
+        super().__init__(file_path, {"goals": []}, flush_delay)
+
+    def _load(self, file_path):
+        goals = super()._load(file_path).get("goals", [])
+        return {goal["id"]: goal for goal in goals}
+
+    def _to_json(self, data):
+        return {"goals": list(data.values())}
+
+    def add(self, goal):
+        """Add a goal. Returns False if a goal with its id already exists."""
+        with self._lock:
+            goals = self._loaded()
+            if goal["id"] in goals:
+                return False
+            goals[goal["id"]] = goal
+            self._changed()
+            return True
+
+    def update(self, goal_id, **fields):
+        """Update a goal's fields. Returns False if there is no such goal."""
+        with self._lock:
+            goal = self._loaded().get(goal_id)
+            if goal is None:
+                return False
+            goal.update(fields)
+            self._changed()
+            return True
+
+    def delete(self, goal_id):
+        """Delete a goal. Returns False if there is no such goal."""
+        with self._lock:
+            if self._loaded().pop(goal_id, None) is None:
+                return False
+            self._changed()
+            return True
+
+class BoardStore(JsonStore):
+    """
+    The Kanban board file, with an index from card id to column so single
+    card operations find their card without a scan. The board carries a
+    version that every change increments.
+    """
+
+    def __init__(self, file_path, flush_delay=FLUSH_DELAY_SECONDS):
+        super().__init__(file_path, {"columns": []}, flush_delay)
+        self._columns = {}
+        self._card_columns = {}
+
+    def _load(self, file_path):
+        board = super()._load(file_path)
+        board.setdefault("version", 0)
+        for column in board["columns"]:
+            column.setdefault("tasks", [])
+        self._index(board)
+        return board
+
+    def _index(self, board):
+        self._columns = {column["id"]: column for column in board["columns"]}
+        self._card_columns = {card["id"]: column for column in board["columns"] for card in column["tasks"]}
+
+    def _check_version(self, version):
+        current = self._loaded()["version"]
+        if version is not None and version != current:
+            raise VersionConflict(current)
+        return current
+
+    def replace(self, data, version=None):
+        """Replace the whole board. Returns the new version."""
+        with self._lock:
+            data = dict(data, version=self._check_version(version) + 1)
+            for column in data.setdefault("columns", []):
+                column.setdefault("tasks", [])
+            self._data = data
+            self._index(data)
+            self._changed()
+            return data["version"]
+
+    def apply(self, operations, version=None):
+        """
+        Apply board operations (see check_operations) in order, all or none.
+        Returns the new version. Raises VersionConflict if `version` is given
+        and is not the current one, and BoardError if an operation is invalid.
+        """
+        with self._lock:
+            board = self._loaded()
+            self._check_version(version)
+            undo = []
+            try:
+                for operation in operations:
+                    undo.append(self._apply(operation))
+            except BoardError:
+                for revert in reversed(undo):
+                    revert()
+                raise
+            board["version"] += 1
+            self._changed()
+            return board["version"]
+
+    def _column(self, column_id):
+        column = self._columns.get(column_id)
+        if column is None:
+            raise BoardError(f"Unknown column '{column_id}'.")
+        return column
+
+    def _locate(self, card_id):
+        column = self._card_columns.get(card_id)
+        if column is None:
+            raise BoardError(f"Unknown card '{card_id}'.")
+        tasks = column["tasks"]
+        return column, next(i for i, card in enumerate(tasks) if card["id"] == card_id)
+
+    def _insert(self, column, card, position):
+        tasks = column["tasks"]
+        tasks.insert(len(tasks) if position is None else min(position, len(tasks)), card)
+        self._card_columns[card["id"]] = column
+
+    def _remove(self, column, index):
+        card = column["tasks"].pop(index)
+        del self._card_columns[card["id"]]
+        return card
+
+    def _apply(self, operation):
+        """Apply one operation and return a function that undoes it."""
+        op = operation["op"]
+        if op == "add_card":
+            card = dict(operation["card"])
+            if card["id"] in self._card_columns:
+                raise BoardError(f"Card '{card['id']}' already exists.")
+            column = self._column(operation["column_id"])
+            self._insert(column, card, operation.get("position"))
+            return lambda: self._remove(column, self._locate(card["id"])[1])
+        if op == "move_card":
+            target = self._column(operation["column_id"])
+            column, index = self._locate(operation["card_id"])
+            card = self._remove(column, index)
+            self._insert(target, card, operation.get("position"))
+            return lambda: (self._remove(target, self._locate(card["id"])[1]), self._insert(column, card, index))
+        column, index = self._locate(operation["card_id"])
+        card = column["tasks"][index]
+        if op == "update_card":
+            previous = dict(card)
+            card.update(operation["fields"])
+            return lambda: (card.clear(), card.update(previous))
+        self._remove(column, index)
+        return lambda: self._insert(column, card, index)
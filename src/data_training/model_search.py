@@ -0,0 +1,158 @@
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+from src.data_training.tables import read_table
+from src.server.forest import compile_forest
+
+# Forest parameters explored by the search
+SEARCH_SPACE = {
+    "n_estimators": [25, 50, 100, 200],
+    "max_depth": [None, 6, 10, 16],
+    "min_samples_leaf": [1, 4, 16],
+    "max_features": ["sqrt", 0.6, None],
+}
+# Candidates drawn from the search space, and the fraction kept after each round
+N_CANDIDATES = 27
+HALVING_FACTOR = 3
+# Candidates within this much accuracy of the best are ranked by latency and size
+ACCURACY_TOLERANCE = 0.005
+# Latencies within this fraction of the fastest count as equal (timings are noisy); size decides
+LATENCY_TOLERANCE = 0.1
+# The smallest training subset a round may use
+MIN_ROWS = 500
+
+def single_row_latency_us(forest, X, iterations=200):
+    """Median time for the compiled forest to predict one row, in microseconds."""
+    row = np.ascontiguousarray(X[:1], dtype=np.float64)
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        forest.predict(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1e6
+
+def sample_candidates(space=SEARCH_SPACE, n_candidates=N_CANDIDATES, random_state=42):
+    """Up to n_candidates distinct parameter sets from the grid of space, drawn at random."""
+    grid = [dict(zip(space, values)) for values in itertools.product(*space.values())]
+    if n_candidates >= len(grid):
+        return grid
+    rng = np.random.default_rng(random_state)
+    return [grid[i] for i in sorted(rng.choice(len(grid), size=n_candidates, replace=False))]
+
+def halving_schedule(n_candidates, n_rows, factor=HALVING_FACTOR, min_rows=MIN_ROWS):
+    """
+    The (candidates, training rows) of each round. Each round keeps 1/factor
+    of the candidates and trains on factor times more rows; the last round
+    uses every row.
+    """
+    rounds = 1
+    while math.ceil(n_candidates / factor ** rounds) > 1 and n_rows // factor ** rounds >= min_rows:
+        rounds += 1
+    return [(math.ceil(n_candidates / factor ** r), n_rows // factor ** (rounds - 1 - r)) for r in range(rounds)]
+
+def rank(results, tolerance=ACCURACY_TOLERANCE, latency_tolerance=LATENCY_TOLERANCE):
+    """
+    Order results best first. Those within tolerance of the best accuracy
+    come first: the ones about as fast as the fastest of them (within
+    latency_tolerance) smallest first, then the others fastest first. The
+    remaining results follow by accuracy.
+    """
+    best_accuracy = max(result["accuracy"] for result in results)
+    accurate = [result for result in results if result["accuracy"] >= best_accuracy - tolerance]
+    fastest = min(result["latency_us"] for result in accurate)
+
+    def key(result):
+        if result["accuracy"] < best_accuracy - tolerance:
+            return (2, -result["accuracy"])
+        if result["latency_us"] <= fastest * (1 + latency_tolerance):
+            return (0, result["nbytes"], result["latency_us"])
+        return (1, result["latency_us"], result["nbytes"])
+    return sorted(results, key=key)
+
+# Data loaded once per worker process by _load_data
+_DATA = {}
+
+def _load_data(train_data_path, val_data_path, random_state):
+    train = read_table(train_data_path)
+    # Shuffled once, so each round's subset is a prefix of the next round's
+    order = np.random.default_rng(random_state).permutation(len(train))
+    _DATA["X_train"] = train.drop('wellness_label', axis=1).to_numpy(dtype=np.float32)[order]
+    _DATA["y_train"] = train['wellness_label'].to_numpy()[order]
+    val = read_table(val_data_path)
+    _DATA["X_val"] = val.drop('wellness_label', axis=1).to_numpy(dtype=np.float32)
+    _DATA["y_val"] = val['wellness_label'].to_numpy()
+
+def _evaluate(task):
+    """
+    Train one candidate, with the fixed settings every candidate shares, on
+    the first n_rows training rows and score it on the validation data.
+    """
+    params, fixed_params, n_rows, random_state = task
+    settings = dict(fixed_params, **params)
+    max_samples = settings.get("max_samples")
+    if isinstance(max_samples, int) and max_samples > n_rows:
+        # A row count larger than an early round's subset draws the whole subset
+        settings["max_samples"] = None
+    model = RandomForestClassifier(random_state=random_state, n_jobs=1, **settings)
+    start = time.perf_counter()
+    model.fit(_DATA["X_train"][:n_rows], _DATA["y_train"][:n_rows])
+    fit_seconds = time.perf_counter() - start
+    forest = compile_forest(model)
+    accuracy = float(np.mean(forest.predict(_DATA["X_val"]) == _DATA["y_val"]))
+    return {"params": params, "rows": n_rows, "accuracy": accuracy, "fit_seconds": round(fit_seconds, 3),
+            "nodes": len(forest.feature), "nbytes": forest.nbytes}, forest
+
+def successive_halving(train_data_path, val_data_path, candidates, factor=HALVING_FACTOR, min_rows=MIN_ROWS,
+                       tolerance=ACCURACY_TOLERANCE, workers=None, random_state=42, latency_tolerance=LATENCY_TOLERANCE,
+                       fixed_params=None):
+    """
+    Search forest parameters by successive halving: every candidate is
+    trained on a small subset of the training rows, the best 1/factor (see
+    rank) go on to a subset factor times larger, and so on until the
+    survivors are trained on every row. Candidates are trained in parallel
+    by a pool of worker processes, each holding its own copy of the data.
+    fixed_params (e.g. max_samples or max_leaf_nodes) are applied to every
+    candidate, so the results describe the model trained with them.
+
+    Single-row latency is measured in this process, one forest at a time
+    once the round's training has finished, so training does not skew it.
+
+    Returns:
+        tuple: The best result and the results of every round.
+    """
+    train_rows = len(read_table(train_data_path, columns=['wellness_label']))
+    schedule = halving_schedule(len(candidates), train_rows, factor, min_rows)
+    workers = min(workers or os.cpu_count() or 1, len(candidates))
+    if workers <= 1:
+        _load_data(train_data_path, val_data_path, random_state)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_load_data,
+                                   initargs=(train_data_path, val_data_path, random_state))
+    history = []
+    try:
+        X_val = read_table(val_data_path).drop('wellness_label', axis=1).to_numpy(dtype=np.float64)
+        for round_number, (n_keep, n_rows) in enumerate(schedule):
+            candidates = candidates[:n_keep]
+            tasks = [(params, fixed_params or {}, n_rows, random_state) for params in candidates]
+            start = time.perf_counter()
+            # Wait for the whole round, so latency is not timed while candidates are still training
+            evaluated = list(pool.map(_evaluate, tasks) if pool is not None else map(_evaluate, tasks))
+            results = []
+            for result, forest in evaluated:
+                result["latency_us"] = round(single_row_latency_us(forest, X_val), 1)
+                results.append(result)
+            results = rank(results, tolerance, latency_tolerance)
+            print(f"Round {round_number + 1}/{len(schedule)}: {len(results)} candidates on {n_rows} rows "
+                  f"in {time.perf_counter() - start:.1f}s; best accuracy {max(r['accuracy'] for r in results):.4f}")
+            history.append(results)
+            candidates = [result["params"] for result in results]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return history[-1][0], history
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+# Where stage outputs are cached, relative to the working directory
+CACHE_DIR = ".pipeline_cache"
+HASH_BLOCK_SIZE = 1 << 20
+
+def file_digest(path):
+    """The SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _copy_atomic(source, target):
+    """Copy a file so that target is never seen partly written."""
+    directory = os.path.dirname(os.path.abspath(target))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(target) + '.', suffix='.tmp')
+    os.close(fd)
+    try:
+        shutil.copyfile(source, temp_path)
+        os.replace(temp_path, target)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+class Stage:
+    """
+    One pipeline step: a command, the files it reads (data and code) and
+    the files it writes. Its parameters are its command-line arguments.
+    """
+
+    def __init__(self, name, command, inputs, outputs):
+        self.name = name
+        self.command = list(command)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+
+class ArtifactCache:
+    """
+    A content-addressed store of stage outputs.
+
+    Files are stored once under objects/ by the SHA-256 of their contents.
+    Each stage run is recorded under stages/ by its fingerprint (see
+    fingerprint) with the digests of the outputs it produced, so a stage
+    whose inputs and arguments have been seen before is not run again:
+    its outputs are copied back from the store. File digests are
+    remembered by size and modification time so unchanged files, however
+    large, are not read again.
+    """
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+        self._index_path = os.path.join(root, 'file_hashes.json')
+        try:
+            with open(self._index_path, 'r') as f:
+                self._index = json.load(f)
+        except (IOError, json.JSONDecodeError):
+            self._index = {}
+
+    def digest(self, path):
+        """The digest of a file's contents, or None if it does not exist."""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        key = os.path.realpath(path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        entry = self._index.get(key)
+        if entry is None or entry[:2] != signature:
+            entry = self._index[key] = signature + [file_digest(path)]
+        return entry[2]
+
+    def save_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        temp_path = self._index_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(temp_path, self._index_path)
+
+    def _object_path(self, digest):
+        return os.path.join(self.root, 'objects', digest[:2], digest[2:])
+
+    def put(self, path):
+        """Store a file's contents. Returns its digest."""
+        digest = self.digest(path)
+        if digest is None:
+            raise FileNotFoundError(f"Stage output {path} was not written.")
+        if not os.path.exists(self._object_path(digest)):
+            _copy_atomic(path, self._object_path(digest))
+        return digest
+
+    def restore(self, digest, path):
+        """Make path hold the stored contents with this digest. Returns whether it had to be copied."""
+        if self.digest(path) == digest:
+            return False
+        _copy_atomic(self._object_path(digest), path)
+        return True
+
+    def _manifest_path(self, stage_name, fingerprint):
+        return os.path.join(self.root, 'stages', stage_name, fingerprint + '.json')
+
+    def lookup(self, stage_name, fingerprint):
+        """The recorded run of a stage with this fingerprint, if its outputs are all still stored."""
+        try:
+            with open(self._manifest_path(stage_name, fingerprint), 'r') as f:
+                manifest = json.load(f)
+        except (IOError, json.JSONDecodeError):
+            return None
+        if all(os.path.exists(self._object_path(digest)) for digest in manifest['outputs'].values()):
+            return manifest
+        return None
+
+    def record(self, stage_name, fingerprint, outputs, log):
+        """Record a stage run: its output digests by path, and what it printed."""
+        path = self._manifest_path(stage_name, fingerprint)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'w') as f:
+            json.dump({'outputs': outputs, 'log': log}, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def fingerprint(self, stage):
+        """
+        A digest of everything that determines a stage's outputs: its
+        command (and so its parameters) and the contents of its inputs.
+        """
+        inputs = {}
+        for path in stage.inputs:
+            digest = self.digest(path)
+            if digest is None:
+                raise FileNotFoundError(f"Input {path} of stage '{stage.name}' does not exist.")
+            inputs[path] = digest
+        key = json.dumps({'command': stage.command, 'inputs': inputs}, sort_keys=True)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def run_command(command):
+    """Run a command, echoing its output as it goes. Returns the output."""
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    lines = []
+    for line in process.stdout:
+        sys.stdout.write(line)
+        lines.append(line)
+    if process.wait() != 0:
+        raise subprocess.CalledProcessError(process.returncode, command, ''.join(lines))
+    return ''.join(lines)
+
+def run_stage(cache, stage, force=False):
+    """
+    Run a stage unless a run with the same fingerprint is cached, in which
+    case its outputs are restored from the cache and its output replayed.
+    Returns whether the stage ran.
+    """
+    fingerprint = cache.fingerprint(stage)
+    manifest = None if force else cache.lookup(stage.name, fingerprint)
+    if manifest is not None:
+        restored = sum(cache.restore(digest, path) for path, digest in manifest['outputs'].items())
+        print(f"--- {stage.name}: unchanged, skipped ({restored} of {len(manifest['outputs'])} outputs restored from cache) ---")
+        sys.stdout.write(manifest['log'])
+        cache.save_index()
+        return False
+
+    print(f"--- {stage.name}: running {' '.join(stage.command)} ---")
+    sys.stdout.flush()
+    log = run_command(stage.command)
+    cache.record(stage.name, fingerprint, {path: cache.put(path) for path in stage.outputs}, log)
+    cache.save_index()
+    return True
+
+def run_pipeline(stages, cache_dir=CACHE_DIR, force=False):
+    """Run stages in order, skipping unchanged ones. Returns the names of the stages that ran."""
+    cache = ArtifactCache(cache_dir)
+    return [stage.name for stage in stages if run_stage(cache, stage, force)]
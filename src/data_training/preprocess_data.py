@@ -1,8 +1,20 @@
+import argparse
+import numpy as np
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 import pickle
 import os
+import sys
+
+if not __package__:
+    # Run as a script: make the project root importable
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.data_training.tables import TableWriter, read_chunks, read_table, write_table
+
+CATEGORICAL_COLS = ['department', 'wellness_label']
+# Rows read at a time by the streaming mode
+CHUNK_SIZE = 500_000
 
 def preprocess_data(input_path, output_train_path, output_val_path, artifacts_path, test_size=0.2, random_state=42, stratify=True):
     """
@@ -10,7 +22,7 @@ def preprocess_data(input_path, output_train_path, output_val_path, artifacts_pa
     Also saves the scaler and encoders used for transformation.
     """
     os.makedirs(artifacts_path, exist_ok=True)
-    df = pd.read_csv(input_path)
+    df = read_table(input_path)
 
     department_encoder = LabelEncoder()
     df['department'] = department_encoder.fit_transform(df['department'])
@@ -37,21 +49,98 @@ def preprocess_data(input_path, output_train_path, output_val_path, artifacts_pa
     with open(os.path.join(artifacts_path, 'scaler.pkl'), 'wb') as f:
         pickle.dump(scaler, f)
 
-    train_data = pd.concat([X_train, y_train.reset_index(drop=True)], axis=1)
-    val_data = pd.concat([X_val, y_val.reset_index(drop=True)], axis=1)
+    train_data = pd.concat([X_train.reset_index(drop=True), y_train.reset_index(drop=True)], axis=1)
+    val_data = pd.concat([X_val.reset_index(drop=True), y_val.reset_index(drop=True)], axis=1)
 
-    train_data.to_csv(output_train_path, index=False)
-    val_data.to_csv(output_val_path, index=False)
+    write_table(train_data, output_train_path)
+    write_table(val_data, output_val_path)
 
     print(f"Data preprocessed and saved to {output_train_path} and {output_val_path}")
     print(f"Scaler and encoders saved to {artifacts_path}")
     print(f"Training set shape: {train_data.shape}")
     print(f"Validation set shape: {val_data.shape}")
 
-if __name__ == "__main__":
-    INPUT_CSV = "data/synthetic_wellness_data.csv"
-    TRAIN_CSV = "data/train_data.csv"
-    VAL_CSV = "data/val_data.csv"
-    ARTIFACTS_DIR = "models"
+def validation_mask(chunk, test_size, random_state):
+    """
+    Which rows of a chunk belong to the validation split. Each row goes to
+    validation when a hash of its contents (salted with random_state) falls
+    below test_size, so the split needs no shuffle, does not depend on how
+    the file is chunked, and keeps duplicate rows on the same side.
+    """
+    hash_key = f"{random_state:016d}"[-16:]
+    hashes = pd.util.hash_pandas_object(chunk, index=False, hash_key=hash_key).to_numpy()
+    # The top 53 bits as a uniform number in [0, 1)
+    return (hashes >> np.uint64(11)).astype(np.float64) * 2.0 ** -53 < test_size
+
+def preprocess_data_streaming(input_path, output_train_path, output_val_path, artifacts_path, test_size=0.2,
+                              random_state=42, chunk_size=CHUNK_SIZE):
+    """
+    Preprocesses the data like preprocess_data, reading and writing it
+    chunk_size rows at a time so memory use does not depend on the file's size.
+
+    The input is read twice. The first pass learns the encoders' classes
+    and fits the scaler on the training rows with partial_fit. The second
+    pass transforms each chunk and appends it to the train or validation
+    file. The split is a per-row hash (see validation_mask) rather than a
+    stratified shuffle, so split sizes and label proportions are only
+    approximately test_size.
+    """
+    os.makedirs(artifacts_path, exist_ok=True)
+    numerical_cols = None
+    categories = {col: set() for col in CATEGORICAL_COLS}
+    scaler = StandardScaler()
+    for chunk in read_chunks(input_path, chunk_size):
+        numerical_cols = chunk.columns.drop(CATEGORICAL_COLS)
+        for col in CATEGORICAL_COLS:
+            categories[col].update(chunk[col].unique().tolist())
+        train_rows = chunk[~validation_mask(chunk, test_size, random_state)]
+        if len(train_rows):
+            scaler.partial_fit(train_rows[numerical_cols])
+
+    encoders = {}
+    for col, filename in (('department', 'department_encoder.pkl'), ('wellness_label', 'label_encoder.pkl')):
+        encoders[col] = LabelEncoder().fit(sorted(categories[col]))
+        with open(os.path.join(artifacts_path, filename), 'wb') as f:
+            pickle.dump(encoders[col], f)
+    with open(os.path.join(artifacts_path, 'scaler.pkl'), 'wb') as f:
+        pickle.dump(scaler, f)
+
+    # Every chunk is written with code types wide enough for all the classes
+    max_codes = {col: len(encoder.classes_) - 1 for col, encoder in encoders.items()}
+    with TableWriter(output_train_path, max_codes) as train_writer, TableWriter(output_val_path, max_codes) as val_writer:
+        for chunk in read_chunks(input_path, chunk_size):
+            val = validation_mask(chunk, test_size, random_state)
+            for col in CATEGORICAL_COLS:
+                chunk[col] = encoders[col].transform(np.asarray(chunk[col]))
+            chunk[numerical_cols] = scaler.transform(chunk[numerical_cols])
+            # Same column order as preprocess_data: the features, then the label
+            chunk = chunk[list(chunk.columns.drop('wellness_label')) + ['wellness_label']]
+            train_writer.write(chunk[~val])
+            val_writer.write(chunk[val])
 
-    preprocess_data(INPUT_CSV, TRAIN_CSV, VAL_CSV, ARTIFACTS_DIR, stratify=True)
\ No newline at end of file
+    print(f"Data preprocessed and saved to {output_train_path} and {output_val_path}")
+    print(f"Scaler and encoders saved to {artifacts_path}")
+    print(f"Training set rows: {train_writer.rows}")
+    print(f"Validation set rows: {val_writer.rows}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Encode, scale and split the synthetic wellness data.")
+    parser.add_argument("--input_path", default="data/synthetic_wellness_data.csv")
+    parser.add_argument("--train_path", default="data/train_data.csv",
+                        help="Training split output; a .parquet or .feather extension writes float32 features and compact integer codes (requires pyarrow).")
+    parser.add_argument("--val_path", default="data/val_data.csv", help="Validation split output, like --train_path.")
+    parser.add_argument("--artifacts_path", default="models", help="Directory for the scaler and encoders.")
+    parser.add_argument("--test_size", type=float, default=0.2)
+    parser.add_argument("--random_state", type=int, default=42)
+    parser.add_argument("--chunk_size", type=int, default=0,
+                        help="Stream the data this many rows at a time, with a hash-based split, for files larger than memory (default: load it all).")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.chunk_size:
+        preprocess_data_streaming(args.input_path, args.train_path, args.val_path, args.artifacts_path,
+                                  args.test_size, args.random_state, args.chunk_size)
+    else:
+        preprocess_data(args.input_path, args.train_path, args.val_path, args.artifacts_path,
+                        args.test_size, args.random_state, stratify=True)
\ No newline at end of file
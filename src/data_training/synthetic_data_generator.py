@@ -1,5 +1,8 @@
+import argparse
 import csv
-import random
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 
 # Define the wellness profiles with statistical parameters for each metric.
@@ -28,7 +31,57 @@ WELLNESS_PROFILES = {
 # List of departments for generating more varied data.
 DEPARTMENTS = ["engineering", "sales", "marketing", "hr", "product"]
 
-def generate_synthetic_data(num_records):
+LABELS = list(WELLNESS_PROFILES)
+# Numeric columns and the number of decimals they are rounded to
+NUMERIC_COLUMNS = {
+    "focus_session_length_minutes": 1,
+    "break_frequency_per_hour": 2,
+    "after_hours_activity_minutes": 1,
+    "communication_sentiment_score": 3,
+}
+COLUMNS = list(NUMERIC_COLUMNS) + ["department", "wellness_label"]
+
+# Records are generated in chunks of this many, each from its own seed stream,
+# so memory use is bounded and a chunk's records do not depend on the others.
+CHUNK_SIZE = 1_000_000
+# Records per output file when generating a sharded dataset
+SHARD_SIZE = 1_000_000
+
+def chunk_generators(num_records, seed=None, chunk_size=CHUNK_SIZE):
+    """
+    Yield (number of records, random Generator) for each chunk. Chunk i
+    draws from child i of the seed's SeedSequence, so the records generated
+    for a seed and chunk_size are always the same. seed may be an int or a
+    SeedSequence.
+    """
+    seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    num_chunks = -(-num_records // chunk_size)
+    for i, child in enumerate(seed_sequence.spawn(num_chunks)):
+        yield min(chunk_size, num_records - i * chunk_size), np.random.default_rng(child)
+
+def generate_columns(num_records, rng):
+    """
+    Draw num_records records with one NumPy call per column. Returns a dict
+    of arrays: the rounded numeric columns, and department and
+    wellness_label as int8 indexes into DEPARTMENTS and LABELS.
+    """
+    labels = rng.integers(0, len(LABELS), num_records, dtype=np.int8)
+    columns = {}
+    for name, decimals in NUMERIC_COLUMNS.items():
+        means = np.array([WELLNESS_PROFILES[label][name]["mean"] for label in LABELS], dtype=np.float64)
+        stds = np.array([WELLNESS_PROFILES[label][name]["std"] for label in LABELS], dtype=np.float64)
+        values = rng.normal(means[labels], stds[labels])
+        # Keep values within a logical range
+        if name == "communication_sentiment_score":
+            np.clip(values, 0, 1, out=values)
+        else:
+            np.maximum(values, 0, out=values)
+        columns[name] = np.round(values, decimals, out=values)
+    columns["department"] = rng.integers(0, len(DEPARTMENTS), num_records, dtype=np.int8)
+    columns["wellness_label"] = labels
+    return columns
+
+def generate_synthetic_data(num_records, seed=None, chunk_size=CHUNK_SIZE):
     """
     Generates a list of synthetic employee wellness records.
 
@@ -37,31 +90,135 @@ def generate_synthetic_data(num_records):
 
     Args:
         num_records (int): The number of data records to generate.
+        seed (int, optional): Seed for reproducible records.
+        chunk_size (int): Records drawn at a time; the same seed and chunk_size give the same records.
 
     Returns:
         list: A list of dictionaries, where each dictionary is a data record.
     """
     data = []
-    for _ in range(num_records):
-        profile_name = random.choice(list(WELLNESS_PROFILES.keys()))
-        profile = WELLNESS_PROFILES[profile_name]
-
-        # Helper to generate a value and ensure it stays within a logical range
-        def get_value(param, min_val=0):
-            val = np.random.normal(profile[param]["mean"], profile[param]["std"])
-            return max(min_val, val)
-
-        record = {
-            "focus_session_length_minutes": round(get_value("focus_session_length_minutes"), 1),
-            "break_frequency_per_hour": round(get_value("break_frequency_per_hour"), 2),
-            "after_hours_activity_minutes": round(get_value("after_hours_activity_minutes"), 1),
-            "communication_sentiment_score": round(np.clip(get_value("communication_sentiment_score", -1), 0, 1), 3),
-            "department": random.choice(DEPARTMENTS),
-            "wellness_label": profile_name,
-        }
-        data.append(record)
+    for size, rng in chunk_generators(num_records, seed, chunk_size):
+        columns = generate_columns(size, rng)
+        values = [columns[name].tolist() for name in NUMERIC_COLUMNS]
+        values.append([DEPARTMENTS[i] for i in columns["department"].tolist()])
+        values.append([LABELS[i] for i in columns["wellness_label"].tolist()])
+        data.extend(dict(zip(COLUMNS, row)) for row in zip(*values))
     return data
 
+# Formatted values ("41.2,") of each numeric column, indexed by value * 10**decimals
+_FORMATTED = {}
+
+def _formatted(name, max_code):
+    decimals = NUMERIC_COLUMNS[name]
+    table = _FORMATTED.get(name)
+    if table is None or len(table) <= max_code:
+        size = max(max_code + 1, 2 * len(table) if table is not None else 0)
+        table = np.array([f"{round(code / 10 ** decimals, decimals)},".encode() for code in range(size)])
+        _FORMATTED[name] = table
+    return table
+
+def format_csv_rows(columns):
+    """
+    Format generated columns as CSV lines. Every numeric value has few
+    possible values at its rounding, so each column is formatted by looking
+    its values up in a table of preformatted strings, and the lines are
+    concatenated column by column.
+    """
+    lines = None
+    for name, decimals in NUMERIC_COLUMNS.items():
+        codes = np.rint(columns[name] * 10 ** decimals).astype(np.int64)
+        field = _formatted(name, int(codes.max()))[codes]
+        lines = field if lines is None else np.strings.add(lines, field)
+    departments = np.array([f"{department},".encode() for department in DEPARTMENTS])
+    labels = np.array([f"{label}\n".encode() for label in LABELS])
+    lines = np.strings.add(np.strings.add(lines, departments[columns["department"]]), labels[columns["wellness_label"]])
+    return b"".join(lines.tolist())
+
+def write_dataset(filename, num_records, seed=None, chunk_size=CHUNK_SIZE, file_format=None):
+    """
+    Generate num_records records and write them to a CSV or Parquet file
+    one chunk at a time, so memory use does not grow with num_records.
+
+    Args:
+        filename (str): The path to the output file.
+        num_records (int): The number of records to generate.
+        seed (int or SeedSequence, optional): Seed for reproducible records.
+        chunk_size (int): Records generated and written at a time.
+        file_format (str, optional): "csv" or "parquet"; by default taken from the file extension.
+
+    Returns:
+        int: The number of records written.
+    """
+    if file_format is None:
+        file_format = "parquet" if filename.endswith(".parquet") else "csv"
+    chunks = (generate_columns(size, rng) for size, rng in chunk_generators(num_records, seed, chunk_size))
+    if file_format == "parquet":
+        write_parquet(filename, chunks)
+    elif file_format == "csv":
+        with open(filename, "wb") as f:
+            f.write((",".join(COLUMNS) + "\n").encode())
+            for columns in chunks:
+                f.write(format_csv_rows(columns))
+    else:
+        raise ValueError(f"Unknown file format '{file_format}'; use 'csv' or 'parquet'.")
+    return num_records
+
+def _write_shard(args):
+    filename, num_records, seed_sequence, chunk_size, file_format = args
+    return write_dataset(filename, num_records, seed_sequence, chunk_size, file_format)
+
+def write_shards(output_dir, num_records, seed=None, shard_size=SHARD_SIZE, workers=None, file_format="csv",
+                 chunk_size=CHUNK_SIZE):
+    """
+    Generate num_records records as files of shard_size records each
+    (part-00000.csv, part-00001.csv, ...) in output_dir, using a pool of
+    worker processes.
+
+    Shard i is generated from child i of the seed's SeedSequence, so its
+    contents depend only on the seed, shard_size and chunk_size, never on
+    the number of workers or the order in which shards finish.
+
+    Returns:
+        list: The paths of the shard files, in order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    num_shards = -(-num_records // shard_size)
+    shard_seeds = np.random.SeedSequence(seed).spawn(num_shards)
+    tasks = []
+    for i, shard_seed in enumerate(shard_seeds):
+        filename = os.path.join(output_dir, f"part-{i:05d}.{file_format}")
+        tasks.append((filename, min(shard_size, num_records - i * shard_size), shard_seed, chunk_size, file_format))
+    workers = min(workers or os.cpu_count() or 1, num_shards)
+    if workers <= 1:
+        for task in tasks:
+            _write_shard(task)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Consume the results so worker errors are raised here
+            list(pool.map(_write_shard, tasks))
+    return [task[0] for task in tasks]
+
+def write_parquet(filename, chunks):
+    """Write generated column chunks as row groups of a Parquet file, with categorical department and label."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    departments = pa.array(DEPARTMENTS)
+    labels = pa.array(LABELS)
+    writer = None
+    try:
+        for columns in chunks:
+            arrays = [pa.array(columns[name]) for name in NUMERIC_COLUMNS]
+            arrays.append(pa.DictionaryArray.from_arrays(columns["department"], departments))
+            arrays.append(pa.DictionaryArray.from_arrays(columns["wellness_label"], labels))
+            table = pa.Table.from_arrays(arrays, names=COLUMNS)
+            if writer is None:
+                writer = pq.ParquetWriter(filename, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
 def save_to_csv(data, filename):
     """
     Saves the generated data to a CSV file.
@@ -81,9 +238,34 @@ def save_to_csv(data, filename):
         writer.writerows(data)
     print("Successfully generated and saved {} records to {}".format(len(data), filename))
 
-if __name__ == "__main__":
-    NUM_RECORDS_TO_GENERATE = 5000
-    OUTPUT_FILENAME = "synthetic_wellness_data.csv"
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic employee wellness records.")
+    parser.add_argument("--num_records", type=int, default=5000, help="Number of records to generate.")
+    parser.add_argument("--output", default="synthetic_wellness_data.csv",
+                        help="Output file; a .parquet extension writes Parquet (requires pyarrow).")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible records.")
+    parser.add_argument("--chunk_size", type=int, default=CHUNK_SIZE, help="Records generated and written at a time.")
+    parser.add_argument("--format", choices=["csv", "parquet"], default=None,
+                        help="Output format (default: from the output file extension, or csv with --output_dir).")
+    parser.add_argument("--output_dir", default=None,
+                        help="Write the records as shard files of --shard_size records into this directory, in parallel, instead of to --output.")
+    parser.add_argument("--shard_size", type=int, default=SHARD_SIZE, help="Records per shard file with --output_dir.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes with --output_dir (default: one per CPU). Does not change the generated records.")
+    return parser.parse_args(argv)
 
-    synthetic_data = generate_synthetic_data(NUM_RECORDS_TO_GENERATE)
-    save_to_csv(synthetic_data, OUTPUT_FILENAME)
\ No newline at end of file
+if __name__ == "__main__":
+    args = parse_args()
+    start = time.perf_counter()
+    if args.output_dir:
+        paths = write_shards(args.output_dir, args.num_records, args.seed, args.shard_size, args.workers,
+                             args.format or "csv", args.chunk_size)
+        output = f"{len(paths)} files in {args.output_dir}"
+        size = sum(os.path.getsize(path) for path in paths)
+    else:
+        write_dataset(args.output, args.num_records, args.seed, args.chunk_size, args.format)
+        output = args.output
+        size = os.path.getsize(args.output)
+    elapsed = time.perf_counter() - start
+    print(f"Successfully generated and saved {args.num_records} records to {output} "
+          f"in {elapsed:.2f}s ({args.num_records / elapsed:,.0f} records/s, {size / 1e6:.1f} MB)")
@@ -0,0 +1,135 @@
+import os
+import numpy as np
+import pandas as pd
+
+# File formats for the preprocessed train/val splits, by file extension.
+# Parquet and Feather need pyarrow.
+TABLE_FORMATS = {".csv": "csv", ".parquet": "parquet", ".feather": "feather"}
+# Columns holding label-encoded categories, stored in the smallest integer
+# type that holds their codes (int8 for up to 128 categories)
+CODE_COLUMNS = ['department', 'wellness_label']
+CODE_DTYPES = [np.int8, np.int16, np.int32, np.int64]
+
+def table_format(path):
+    """The format of a data file, from its extension."""
+    file_format = TABLE_FORMATS.get(os.path.splitext(path)[1].lower())
+    if file_format is None:
+        raise ValueError(f"Unknown data file type '{path}'; use one of {', '.join(TABLE_FORMATS)}.")
+    return file_format
+
+def find_table(directory, name):
+    """
+    The path of the data file `name` (e.g. "train_data") in directory: the
+    most recently written of its CSV, Parquet and Feather versions, or the
+    CSV path if there are none.
+    """
+    paths = [os.path.join(directory, name + extension) for extension in TABLE_FORMATS]
+    existing = [path for path in paths if os.path.exists(path)]
+    return max(existing, key=os.path.getmtime) if existing else paths[0]
+
+def code_dtype(max_code):
+    """The smallest integer type that holds category codes up to max_code."""
+    return next(dtype for dtype in CODE_DTYPES if max_code <= np.iinfo(dtype).max)
+
+def compact_dtypes(df, max_codes=None):
+    """
+    The data as stored in the binary formats: float32 features and category
+    codes in the smallest integer type that holds them. max_codes gives the
+    largest possible code per column; by default it is taken from the data.
+    """
+    max_codes = max_codes or {}
+    dtypes = {}
+    for col in df.columns:
+        if col in CODE_COLUMNS:
+            max_code = max_codes.get(col, df[col].max() if len(df) else 0)
+            dtypes[col] = code_dtype(max_code)
+        else:
+            dtypes[col] = np.float32
+    return df.astype(dtypes)
+
+def read_table(path, columns=None):
+    """
+    Read a preprocessed data file (CSV, Parquet or Feather) into a
+    DataFrame. Binary files keep their stored float32 and integer code types.
+    """
+    file_format = table_format(path)
+    if file_format == "parquet":
+        return pd.read_parquet(path, columns=columns)
+    if file_format == "feather":
+        return pd.read_feather(path, columns=columns)
+    return pd.read_csv(path, usecols=columns)
+
+def read_chunks(path, chunk_size):
+    """Iterate over a data file (CSV, Parquet or Feather) as DataFrames of up to chunk_size rows."""
+    file_format = table_format(path)
+    if file_format == "csv":
+        yield from pd.read_csv(path, chunksize=chunk_size)
+        return
+    import pyarrow as pa
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_size)
+    else:
+        reader = pa.ipc.open_file(path)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    for batch in batches:
+        # Feather batches are as large as they were written; split them to bound memory
+        for offset in range(0, batch.num_rows, chunk_size):
+            yield batch.slice(offset, chunk_size).to_pandas()
+
+def write_table(df, path):
+    """Write a DataFrame to a CSV, Parquet or Feather file, by its extension."""
+    TableWriter(path).write(df).close()
+
+class TableWriter:
+    """
+    Writes a DataFrame to a data file a chunk at a time, so a file larger
+    than memory can be written. Parquet chunks become row groups and
+    Feather chunks record batches; binary formats are written with
+    compact_dtypes. Every chunk must fit the column types of the first, so
+    pass max_codes (the largest code of each category column) when later
+    chunks may hold larger codes than the first.
+    """
+
+    def __init__(self, path, max_codes=None):
+        self.path = path
+        self.format = table_format(path)
+        self.max_codes = max_codes
+        self.rows = 0
+        self._writer = None
+        self._schema = None
+
+    def write(self, df):
+        if self.format == "csv":
+            df.to_csv(self.path, mode='w' if self._writer is None else 'a', header=self._writer is None, index=False)
+            self._writer = True
+        else:
+            import pyarrow as pa
+            table = pa.Table.from_pandas(compact_dtypes(df, self.max_codes), preserve_index=False)
+            if self._schema is not None:
+                # A safe cast, so codes too large for the file's type raise instead of wrapping
+                table = table.cast(self._schema)
+            else:
+                self._schema = table.schema
+                if self.format == "parquet":
+                    import pyarrow.parquet as pq
+                    self._writer = pq.ParquetWriter(self.path, table.schema)
+                else:
+                    # Feather (version 2) is the Arrow IPC file format
+                    self._writer = pa.ipc.new_file(self.path, table.schema)
+            self._writer.write_table(table)
+        self.rows += len(df)
+        return self
+
+    def close(self):
+        """Finish the file; one with no rows written is left empty or not created."""
+        if self._writer not in (None, True):
+            self._writer.close()
+        self._writer = None
+        self._schema = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
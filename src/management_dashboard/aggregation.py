@@ -0,0 +1,247 @@
+import threading
+import numpy as np
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+# --- Scoring ---
+# A department's wellness score is the mean of its predictions' label scores,
+# so 100 means every recent prediction was Healthy and 0 means all were Burnout.
+LABELS = ("Healthy", "Stressed", "Burnout")
+LABEL_SCORES = {"Healthy": 100.0, "Stressed": 50.0, "Burnout": 0.0}
+# Average focus session length that counts as a focus score of 100
+FOCUS_TARGET_MINUTES = 50.0
+# Departments scoring below this are reported as at risk
+AT_RISK_SCORE = 60.0
+# Aggregates cover the predictions of the last WINDOW_DAYS days (today included)
+WINDOW_DAYS = 30
+# The KPI trend compares the last TREND_DAYS days with the TREND_DAYS before them
+TREND_DAYS = 7
+
+DEPARTMENT_NAMES = {
+    "engineering": "Engineering",
+    "sales": "Sales",
+    "marketing": "Marketing",
+    "hr": "Human Resources",
+    "product": "Product",
+    "support": "Customer Support",
+}
+
+def department_name(department: str) -> str:
+    """The display name for a department code."""
+    return DEPARTMENT_NAMES.get(department, department.replace("_", " ").title())
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+class Totals:
+    """Running sums for one group of predictions. Totals can be added and subtracted."""
+
+    __slots__ = ("count", "label_counts", "score_sum", "focus_sum", "employees")
+
+    def __init__(self):
+        self.count = 0
+        self.label_counts = [0] * len(LABELS)
+        self.score_sum = 0.0
+        self.focus_sum = 0.0
+        # Employee id -> number of predictions. Predictions without an id are
+        # counted but are not employees: they cannot tell one person from many.
+        self.employees = Counter()
+
+    def add(self, other: "Totals", sign: int = 1):
+        self.count += sign * other.count
+        for i, n in enumerate(other.label_counts):
+            self.label_counts[i] += sign * n
+        self.score_sum += sign * other.score_sum
+        self.focus_sum += sign * other.focus_sum
+        if sign > 0:
+            self.employees.update(other.employees)
+        else:
+            self.employees.subtract(other.employees)
+            for employee_id in other.employees:
+                if self.employees[employee_id] <= 0:
+                    del self.employees[employee_id]
+
+    @property
+    def headcount(self) -> int:
+        """Distinct employees with predictions."""
+        return len(self.employees)
+
+    @property
+    def score(self) -> float:
+        return self.score_sum / self.count if self.count else 0.0
+
+    @property
+    def burnout_risk(self) -> float:
+        """Percentage of predictions labelled Burnout."""
+        return 100.0 * self.label_counts[LABELS.index("Burnout")] / self.count if self.count else 0.0
+
+    @property
+    def focus_score(self) -> float:
+        """Average focus session length relative to FOCUS_TARGET_MINUTES, capped at 100."""
+        return min(100.0, 100.0 * (self.focus_sum / self.count) / FOCUS_TARGET_MINUTES) if self.count else 0.0
+
+class WellnessAggregator:
+    """
+    Rolling per-department aggregates of wellness predictions.
+
+    Each prediction is added to a per-day, per-department bucket and to the
+    running totals for the window. When a day falls out of the window its
+    buckets are subtracted from the running totals, so recording a
+    prediction is O(1) and reading the dashboard is O(departments) (plus
+    O(days) for the trend series), however many predictions have been seen.
+    """
+
+    def __init__(self, window_days: int = WINDOW_DAYS, today: Callable[[], date] = utc_today):
+        if window_days < 1:
+            raise ValueError("window_days must be at least 1.")
+        self.window_days = window_days
+        self._today = today
+        self._days: Dict[date, Dict[str, Totals]] = {}
+        self._window: Dict[str, Totals] = {}
+        self._window_start = today() - timedelta(days=window_days - 1)
+        self._lock = threading.Lock()
+        # Incremented whenever the aggregates change, so readers can cache what they derive from them
+        self.version = 0
+
+    def _expire(self):
+        """Drop the buckets of days that have left the window. Call with the lock held."""
+        window_start = self._today() - timedelta(days=self.window_days - 1)
+        if window_start <= self._window_start:
+            return
+        self._window_start = window_start
+        self.version += 1
+        for day in [d for d in self._days if d < window_start]:
+            for department, totals in self._days.pop(day).items():
+                self._window[department].add(totals, sign=-1)
+                if self._window[department].count == 0:
+                    del self._window[department]
+
+    def record(self, department: str, wellness_label: str, focus_session_length_minutes: float,
+               timestamp: Optional[datetime] = None, employee_id: Optional[str] = None) -> bool:
+        """
+        Add one prediction to the aggregates. Returns False if the prediction
+        is older than the window and so was not counted.
+        """
+        if wellness_label not in LABEL_SCORES:
+            raise ValueError(f"Unknown wellness label '{wellness_label}'.")
+        if timestamp is None:
+            day = self._today()
+        else:
+            if timestamp.tzinfo is not None:
+                timestamp = timestamp.astimezone(timezone.utc)
+            day = timestamp.date()
+
+        delta = Totals()
+        delta.count = 1
+        delta.label_counts[LABELS.index(wellness_label)] = 1
+        delta.score_sum = LABEL_SCORES[wellness_label]
+        delta.focus_sum = float(focus_session_length_minutes)
+        if employee_id is not None:
+            delta.employees[employee_id] = 1
+
+        return self._add(day, {department: delta}) > 0
+
+    def record_day(self, day: date, departments: np.ndarray, wellness_labels: np.ndarray,
+                   focus_session_length_minutes: np.ndarray, employee_ids: np.ndarray) -> int:
+        """
+        Add many predictions made on one day, given as parallel arrays
+        (employee_ids holds None for unknown employees). Returns the number
+        of predictions counted.
+        """
+        unknown = set(np.unique(wellness_labels).tolist()) - set(LABEL_SCORES)
+        if unknown:
+            raise ValueError(f"Unknown wellness labels {sorted(unknown)}.")
+        deltas = {}
+        for department in np.unique(departments).tolist():
+            selected = departments == department
+            delta = Totals()
+            delta.count = int(selected.sum())
+            labels = wellness_labels[selected]
+            for i, label in enumerate(LABELS):
+                delta.label_counts[i] = int((labels == label).sum())
+                delta.score_sum += delta.label_counts[i] * LABEL_SCORES[label]
+            delta.focus_sum = float(np.asarray(focus_session_length_minutes[selected], dtype=np.float64).sum())
+            known = [employee_id for employee_id in employee_ids[selected].tolist() if employee_id is not None]
+            delta.employees.update(known)
+            deltas[department] = delta
+        return self._add(day, deltas)
+
+    def _add(self, day: date, deltas: Dict[str, Totals]) -> int:
+        with self._lock:
+            self._expire()
+            if day < self._window_start:
+                return 0
+            self.version += 1
+            buckets = self._days.setdefault(day, {})
+            for department, delta in deltas.items():
+                buckets.setdefault(department, Totals()).add(delta)
+                self._window.setdefault(department, Totals()).add(delta)
+        return sum(delta.count for delta in deltas.values())
+
+    def _organization(self) -> Totals:
+        organization = Totals()
+        for totals in self._window.values():
+            organization.count += totals.count
+            organization.score_sum += totals.score_sum
+        return organization
+
+    def _average_score(self, first_day: date, last_day: date) -> Optional[float]:
+        count, score_sum = 0, 0.0
+        for day, departments in self._days.items():
+            if first_day <= day <= last_day:
+                for totals in departments.values():
+                    count += totals.count
+                    score_sum += totals.score_sum
+        return score_sum / count if count else None
+
+    def state(self) -> tuple:
+        """A key that changes whenever any dashboard read could return something different."""
+        with self._lock:
+            self._expire()
+            return self.version, self._today()
+
+    def kpis(self) -> Dict:
+        """Organization-wide score, number of at-risk departments and the week-over-week score change."""
+        with self._lock:
+            self._expire()
+            organization = self._organization()
+            at_risk = sum(1 for totals in self._window.values() if totals.score < AT_RISK_SCORE)
+            today = self._today()
+            recent = self._average_score(today - timedelta(days=TREND_DAYS - 1), today)
+            previous = self._average_score(today - timedelta(days=2 * TREND_DAYS - 1), today - timedelta(days=TREND_DAYS))
+
+        change = round(100.0 * (recent - previous) / previous) if recent is not None and previous else 0
+        return {
+            "overall_score": round(organization.score),
+            "departments_at_risk": at_risk,
+            "positive_trend": f"{change:+d}%",
+        }
+
+    def departments(self) -> List[Dict]:
+        """Each department's score and headcount over the window, best score first."""
+        with self._lock:
+            self._expire()
+            rows = [{"name": department_name(department), "score": round(totals.score), "headcount": totals.headcount}
+                    for department, totals in self._window.items()]
+        return sorted(rows, key=lambda row: (-row["score"], row["name"]))
+
+    def heatmap(self) -> List[Dict]:
+        """Burnout risk against focus score per department, sized by headcount."""
+        with self._lock:
+            self._expire()
+            points = [{"x": round(totals.burnout_risk), "y": round(totals.focus_score), "r": totals.headcount,
+                       "label": department_name(department)}
+                      for department, totals in self._window.items()]
+        return sorted(points, key=lambda point: point["label"])
+
+    def trends(self) -> List[Dict]:
+        """The organization's daily average score over the window, oldest first. Days without predictions are omitted."""
+        with self._lock:
+            self._expire()
+            series = []
+            for day in sorted(self._days):
+                count = sum(totals.count for totals in self._days[day].values())
+                score_sum = sum(totals.score_sum for totals in self._days[day].values())
+                series.append({"date": day, "score": round(score_sum / count)})
+        return series
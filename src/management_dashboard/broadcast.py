@@ -0,0 +1,112 @@
+import asyncio
+import json
+from typing import Dict, List, Optional, Set
+from fastapi.encoders import jsonable_encoder
+
+from src.management_dashboard.snapshot import DashboardSnapshot
+
+# Key identifying a row of each list section, so deltas can name rows to replace or remove
+ROW_KEYS = {"departments": "name", "heatmap": "label", "trends": "date"}
+# Events a slow client may fall behind by before it is disconnected (EventSource reconnects
+# on its own and starts again from a full snapshot)
+CLIENT_QUEUE_SIZE = 64
+
+def format_event(event: str, data, event_id: Optional[int] = None) -> bytes:
+    """Encode one server-sent event."""
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(jsonable_encoder(data), separators=(",", ":")))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+def list_delta(previous: List[Dict], current: List[Dict], key: str) -> Optional[Dict]:
+    """The rows of `current` that are new or changed, and the keys of rows that are gone."""
+    before = {row[key]: row for row in previous}
+    after = {row[key]: row for row in current}
+    upsert = [row for k, row in after.items() if before.get(k) != row]
+    remove = [k for k in before if k not in after]
+    if not upsert and not remove:
+        return None
+    return {"upsert": upsert, "remove": remove}
+
+def snapshot_delta(previous: DashboardSnapshot, current: DashboardSnapshot) -> Optional[Dict]:
+    """
+    What changed between two snapshots: the new KPIs if they changed, and
+    upserted/removed rows for each list section that changed. Returns None
+    if nothing visible changed.
+    """
+    delta = {}
+    if previous.etags["kpis"] != current.etags["kpis"]:
+        delta["kpis"] = current.sections["kpis"]
+    for section, key in ROW_KEYS.items():
+        if previous.etags[section] != current.etags[section]:
+            changes = list_delta(previous.sections[section], current.sections[section], key)
+            if changes:
+                delta[section] = changes
+    if not delta:
+        return None
+    delta["generated_at"] = current.generated_at
+    return delta
+
+class Broadcaster:
+    """
+    Fans dashboard updates out to every connected live-feed client.
+
+    Each published snapshot is diffed against the previous one and the
+    delta is encoded once; delivering it is then one queue put per client.
+    New clients start from a full snapshot event followed by the deltas
+    published after it. Must be used from the event loop's thread.
+    """
+
+    def __init__(self, queue_size: int = CLIENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.current: Optional[DashboardSnapshot] = None
+        self.event_id = 0
+        self._snapshot_event = b""
+        self._clients: Set[asyncio.Queue] = set()
+
+    @property
+    def clients(self) -> int:
+        return len(self._clients)
+
+    def publish(self, snapshot: DashboardSnapshot) -> int:
+        """Send clients what changed since the last published snapshot. Returns the number of clients sent to."""
+        if snapshot is self.current:
+            return 0
+        previous, self.current = self.current, snapshot
+        self.event_id += 1
+        self._snapshot_event = b"".join([
+            f"id: {self.event_id}\nevent: snapshot\ndata: ".encode("utf-8"), snapshot.bodies["combined"], b"\n\n"])
+        delta = snapshot_delta(previous, snapshot) if previous is not None else None
+        if delta is None:
+            return 0
+        event = format_event("delta", delta, self.event_id)
+        for queue in list(self._clients):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too far behind to catch up with deltas; end its stream so it resyncs
+                self._end(queue)
+        return len(self._clients)
+
+    def _end(self, queue: asyncio.Queue):
+        self._clients.discard(queue)
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Register a client. Its queue starts with the current snapshot; None marks the end of the stream."""
+        if self.current is None:
+            raise RuntimeError("Nothing has been published yet.")
+        queue = asyncio.Queue(maxsize=self.queue_size + 1)
+        queue.put_nowait(self._snapshot_event)
+        self._clients.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._clients.discard(queue)
+
+    def close(self):
+        """End every client's stream."""
+        for queue in list(self._clients):
+            self._end(queue)
@@ -1,10 +1,47 @@
-from fastapi import FastAPI
+import asyncio
+import csv
+import os
+import sys
+from fastapi import FastAPI, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Dict, List, Optional
 import uvicorn
-from datetime import date, timedelta
-import random
+from datetime import date, datetime, timedelta, timezone
+
+# Allow `python src/management_dashboard/server.py` as well as `uvicorn src.management_dashboard.server:app` from the project root
+if not __package__:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.management_dashboard.aggregation import LABEL_SCORES, WellnessAggregator, department_name
+from src.management_dashboard.broadcast import Broadcaster
+from src.management_dashboard.snapshot import SnapshotCache, etag_matches
+from src.server.prediction_store import PredictionStore
+
+# The prediction server's store of recorded predictions (shared through the
+# filesystem). Set WELLNESS_PREDICTION_STORE="" to run without it.
+PREDICTION_STORE_PATH = os.environ.get("WELLNESS_PREDICTION_STORE", "data/predictions")
+# How often to pick up predictions newly written to the store
+STORE_POLL_SECONDS = float(os.environ.get("WELLNESS_DASHBOARD_POLL_SECONDS", "2"))
+# Synthetic labelled records to load at startup for demos, e.g. data/synthetic_wellness_data.csv.
+# Only used without a prediction store, so made-up rows are never mixed with real predictions.
+SEED_CSV_PATH = os.environ.get("WELLNESS_DASHBOARD_SEED_CSV", "")
+
+# How often the background task checks for new data and rebuilds the dashboard snapshot
+SNAPSHOT_REFRESH_SECONDS = float(os.environ.get("WELLNESS_DASHBOARD_REFRESH_SECONDS", "1"))
+# Idle live-feed connections get a comment this often so proxies do not time them out
+STREAM_HEARTBEAT_SECONDS = float(os.environ.get("WELLNESS_DASHBOARD_HEARTBEAT_SECONDS", "15"))
+
+# Rolling aggregates behind every dashboard endpoint, and the precomputed
+# responses served from them
+AGGREGATOR = WellnessAggregator()
+SNAPSHOTS = SnapshotCache(AGGREGATOR)
+SNAPSHOT_TASK = None
+# Pushes snapshot changes to every dashboard connected to the live feed
+BROADCASTER = Broadcaster()
+STORE_TAIL = None
+STORE_POLL_TASK = None
 
 # --- Pydantic Models for API Responses ---
 class KPISnapshot(BaseModel):
@@ -27,6 +64,34 @@ class TrendsDataPoint(BaseModel):
     date: date
     score: int
 
+class DashboardData(BaseModel):
+    kpis: KPISnapshot
+    departments: List[DepartmentWellness]
+    heatmap: List[HeatmapDataPoint]
+    trends: List[TrendsDataPoint]
+    generated_at: datetime
+
+class PredictionRecord(BaseModel):
+    department: str = Field(..., example="sales")
+    wellness_label: str = Field(..., example="Stressed")
+    focus_session_length_minutes: float = Field(..., example=35)
+    employee_id: Optional[str] = Field(None, example="E1024")
+    timestamp: Optional[datetime] = Field(None, description="When the prediction was made (defaults to now).")
+
+class HistoryDataPoint(BaseModel):
+    period: date = Field(..., description="First day of the period.")
+    department: str
+    count: int = Field(..., description="Predictions in the period.")
+    score: int
+    label_counts: Dict[str, int]
+
+class PredictionRecordBatch(BaseModel):
+    records: List[PredictionRecord]
+
+class RecordResult(BaseModel):
+    recorded: int = Field(..., description="Records added to the aggregates.")
+    skipped: int = Field(..., description="Records older than the aggregation window.")
+
 # --- FastAPI Application ---
 app = FastAPI(
     title="Management Dashboard API",
@@ -49,62 +114,215 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def seed_from_csv(aggregator: WellnessAggregator, path: str) -> int:
+    """
+    Record every labelled row of a synthetic data CSV, spreading the rows
+    evenly over the aggregation window. Returns the number of rows recorded.
+    """
+    now = datetime.now(timezone.utc)
+    recorded = 0
+    with open(path, newline="") as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            timestamp = now - timedelta(days=i % aggregator.window_days)
+            aggregator.record(row["department"], row["wellness_label"], float(row["focus_session_length_minutes"]), timestamp)
+            recorded += 1
+    return recorded
+
+def poll_store(aggregator: WellnessAggregator, tail, since: Optional[date] = None) -> int:
+    """Add the predictions committed to the store since the last poll. Returns the number added."""
+    recorded = 0
+    columns = ("department", "wellness_label", "focus_session_length_minutes", "employee")
+    for chunk in tail.poll(since, columns):
+        recorded += aggregator.record_day(chunk["day"], chunk["department"], chunk["wellness_label"],
+                                          chunk["focus_session_length_minutes"], chunk["employee"])
+    return recorded
+
+async def follow_store(interval: float):
+    """Keep the aggregates up to date with predictions written to the store."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            # Yesterday is included so rows flushed just after midnight are not missed
+            since = datetime.now(timezone.utc).date() - timedelta(days=1)
+            await run_in_threadpool(poll_store, AGGREGATOR, STORE_TAIL, since)
+        except Exception as e:
+            print(f"Failed to read new predictions from the store: {e}")
+
+@app.on_event("startup")
+async def load_aggregates():
+    """
+    Build the aggregates from the window's predictions in the store, then
+    follow the store for new ones. Without a store, the seed CSV (if any)
+    is loaded instead.
+    """
+    global STORE_TAIL, STORE_POLL_TASK
+    if PREDICTION_STORE_PATH:
+        if SEED_CSV_PATH:
+            print(f"Not seeding from {SEED_CSV_PATH}: the dashboard shows the predictions in {PREDICTION_STORE_PATH}.")
+        STORE_TAIL = PredictionStore(PREDICTION_STORE_PATH).tail()
+        window_start = datetime.now(timezone.utc).date() - timedelta(days=AGGREGATOR.window_days - 1)
+        recorded = await run_in_threadpool(poll_store, AGGREGATOR, STORE_TAIL, window_start)
+        print(f"Loaded {recorded} predictions from {PREDICTION_STORE_PATH}.")
+        if STORE_POLL_SECONDS > 0:
+            STORE_POLL_TASK = asyncio.create_task(follow_store(STORE_POLL_SECONDS))
+    elif SEED_CSV_PATH:
+        print(f"Seeded dashboard aggregates with {seed_from_csv(AGGREGATOR, SEED_CSV_PATH)} records from {SEED_CSV_PATH}.")
+
+@app.on_event("shutdown")
+async def stop_following_store():
+    global STORE_POLL_TASK
+    if STORE_POLL_TASK is not None:
+        STORE_POLL_TASK.cancel()
+        STORE_POLL_TASK = None
+
+async def refresh_snapshots(interval: float):
+    """Rebuild the dashboard snapshot whenever the aggregates have changed, and push the changes to the live feed."""
+    while True:
+        try:
+            BROADCASTER.publish(SNAPSHOTS.refresh())
+        except Exception as e:
+            print(f"Failed to refresh the dashboard snapshot: {e}")
+        await asyncio.sleep(interval)
+
+@app.on_event("startup")
+async def start_snapshot_refresh():
+    global SNAPSHOT_TASK
+    if SNAPSHOT_REFRESH_SECONDS > 0:
+        SNAPSHOT_TASK = asyncio.create_task(refresh_snapshots(SNAPSHOT_REFRESH_SECONDS))
+
+@app.on_event("shutdown")
+async def stop_snapshot_refresh():
+    global SNAPSHOT_TASK
+    if SNAPSHOT_TASK is not None:
+        SNAPSHOT_TASK.cancel()
+        SNAPSHOT_TASK = None
+    BROADCASTER.close()
+
+def snapshot_response(section: str, if_none_match: Optional[str]) -> Response:
+    """Serve one section of the current snapshot, or a 304 if the client already has it."""
+    snapshot = SNAPSHOTS.get()
+    etag = snapshot.etags[section]
+    # Clients may reuse a response only after revalidating it with its ETag
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.bodies[section], media_type="application/json", headers=headers)
+
 # --- API Endpoints ---
+@app.post("/api/v1/predictions", response_model=RecordResult)
+async def record_predictions(batch: PredictionRecordBatch):
+    """Adds wellness predictions to the dashboard aggregates."""
+    # Validate the whole batch first so a bad record does not leave it half recorded
+    for record in batch.records:
+        if record.wellness_label not in LABEL_SCORES:
+            raise HTTPException(status_code=400, detail=f"Unknown wellness label '{record.wellness_label}'.")
+    recorded = 0
+    for record in batch.records:
+        recorded += AGGREGATOR.record(record.department, record.wellness_label, record.focus_session_length_minutes,
+                                      record.timestamp, record.employee_id)
+    return RecordResult(recorded=recorded, skipped=len(batch.records) - recorded)
+
+@app.get("/api/v1/dashboard", response_model=DashboardData)
+async def get_dashboard(if_none_match: Optional[str] = Header(None)):
+    """Returns the KPIs, departments, heatmap and trends together, so the dashboard loads in one request."""
+    return snapshot_response("combined", if_none_match)
+
+async def stream_events(broadcaster: Broadcaster, heartbeat: float):
+    if broadcaster.current is None:
+        broadcaster.publish(SNAPSHOTS.get())
+    queue = broadcaster.subscribe()
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+                continue
+            if event is None:
+                return
+            yield event
+    finally:
+        broadcaster.unsubscribe(queue)
+
+@app.get("/api/v1/dashboard/stream")
+async def stream_dashboard():
+    """
+    Server-sent events feed of the dashboard: a `snapshot` event with the
+    same document as /api/v1/dashboard, then a `delta` event with the
+    changed KPIs and the changed or removed department, heatmap and trend
+    rows each time the snapshot is refreshed.
+    """
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(stream_events(BROADCASTER, STREAM_HEARTBEAT_SECONDS), media_type="text/event-stream",
+                             headers=headers)
+
 @app.get("/api/v1/dashboard/kpis", response_model=KPISnapshot)
-async def get_kpi_snapshot():
+async def get_kpi_snapshot(if_none_match: Optional[str] = Header(None)):
     """Provides a high-level snapshot of organization-wide wellness metrics."""
-    return KPISnapshot(
-        overall_score=82,
-        departments_at_risk=2,
-        positive_trend="+3%"
-    )
+    return snapshot_response("kpis", if_none_match)
 
 @app.get("/api/v1/dashboard/departments", response_model=List[DepartmentWellness])
-async def get_department_wellness():
+async def get_department_wellness(if_none_match: Optional[str] = Header(None)):
     """Returns a list of departments and their current wellness scores."""
-    return [
-        DepartmentWellness(name="Engineering", score=88, headcount=52),
-        DepartmentWellness(name="Sales", score=75, headcount=31),
-        DepartmentWellness(name="Marketing", score=81, headcount=18),
-        DepartmentWellness(name="Human Resources", score=92, headcount=12),
-        DepartmentWellness(name="Product", score=79, headcount=25),
-        DepartmentWellness(name="Customer Support", score=72, headcount=45),
-    ]
+    return snapshot_response("departments", if_none_match)
 
 @app.get("/api/v1/dashboard/heatmap", response_model=List[HeatmapDataPoint])
-async def get_heatmap_data():
-    """Generates random data for the department wellness heatmap."""
-    departments = ["Engineering", "Sales", "Marketing", "HR", "Product", "Support"]
-    data = []
-    for dept in departments:
-        data.append(HeatmapDataPoint(
-            x=random.randint(20, 80),  # Burnout risk
-            y=random.randint(50, 95),  # Focus score
-            r=random.randint(10, 50),   # Headcount
-            label=dept
-        ))
-    return data
+async def get_heatmap_data(if_none_match: Optional[str] = Header(None)):
+    """Returns burnout risk, focus score and headcount per department for the wellness heatmap."""
+    return snapshot_response("heatmap", if_none_match)
 
 @app.get("/api/v1/dashboard/trends", response_model=List[TrendsDataPoint])
-async def get_trends_data():
-    """Generates random time-series data for the wellness trends chart."""
-    data = []
-    today = date.today()
-    current_score = 80
-    for i in range(30):  # Last 30 days
-        d = today - timedelta(days=i)
-        # Add some random fluctuation
-        current_score += random.randint(-2, 2)
-        current_score = max(70, min(90, current_score)) # Clamp between 70-90
-        data.append(TrendsDataPoint(date=d, score=current_score))
-    return list(reversed(data)) # Return in chronological order
+async def get_trends_data(if_none_match: Optional[str] = Header(None)):
+    """Returns the organization's daily wellness score over the last 30 days, in chronological order."""
+    return snapshot_response("trends", if_none_match)
+
+@app.get("/api/v1/dashboard/history", response_model=List[HistoryDataPoint])
+async def get_history(start: date, end: date, freq: str = Query("day", pattern="^(day|week)$"),
+                      department: Optional[str] = None):
+    """
+    Returns daily or weekly per-department rollups of the stored predictions
+    between start and end (inclusive), for history beyond the live 30-day window.
+    """
+    if not PREDICTION_STORE_PATH:
+        raise HTTPException(status_code=404, detail="No prediction store is configured.")
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start.")
+    store = PredictionStore(PREDICTION_STORE_PATH)
+    range_start = datetime(start.year, start.month, start.day, tzinfo=timezone.utc)
+    range_end = datetime(end.year, end.month, end.day, tzinfo=timezone.utc) + timedelta(days=1)
+    rows = await run_in_threadpool(store.rollup, range_start, range_end, freq, [department] if department else None)
+    return [
+        HistoryDataPoint(
+            period=row["period"],
+            department=department_name(row["department"]),
+            count=row["count"],
+            score=round(sum(LABEL_SCORES.get(label, 0.0) * n for label, n in row["label_counts"].items()) / row["count"]),
+            label_counts=row["label_counts"],
+        )
+        for row in rows
+    ]
 
 @app.get("/")
 def read_root():
     """A simple health check endpoint."""
     return {"status": "ok", "message": "Management Dashboard API is running."}
 
+class DashboardServer(uvicorn.Server):
+    """
+    Ends the live feeds as soon as the server is asked to stop. Uvicorn
+    waits for open connections to close before shutting the app down, and
+    live-feed connections would otherwise never close.
+    """
+
+    def handle_exit(self, sig, frame):
+        super().handle_exit(sig, frame)
+        asyncio.get_event_loop().call_soon_threadsafe(BROADCASTER.close)
+
 if __name__ == "__main__":
     print("Starting Management Dashboard API server...")
     print("Access the API docs at http://127.0.0.1:8001/docs")
-    uvicorn.run(app, host="127.0.0.1", port=8001)
\ No newline at end of file
+    try:
+        DashboardServer(uvicorn.Config(app, host="127.0.0.1", port=8001)).run()
+    except KeyboardInterrupt:
+        # Uvicorn re-raises the signal it stopped on; uvicorn.run() ignores it the same way
+        pass
\ No newline at end of file
@@ -0,0 +1,73 @@
+import hashlib
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from fastapi.encoders import jsonable_encoder
+
+SECTIONS = ("kpis", "departments", "heatmap", "trends")
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison, as HTTP specifies for it)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+class DashboardSnapshot:
+    """
+    Every dashboard response, serialized once. Each section and the combined
+    document are kept as ready-to-send JSON bytes with their ETags.
+    """
+
+    def __init__(self, state: tuple, sections: Dict):
+        self.state = state
+        self.sections = sections
+        self.generated_at = datetime.now(timezone.utc)
+        self.bodies = {}
+        self.etags = {}
+        for name in SECTIONS:
+            self._add(name, sections[name])
+        combined = dict(sections, generated_at=self.generated_at)
+        self._add("combined", combined)
+
+    def _add(self, name: str, content):
+        body = json.dumps(jsonable_encoder(content), separators=(",", ":")).encode("utf-8")
+        self.bodies[name] = body
+        self.etags[name] = make_etag(body)
+
+class SnapshotCache:
+    """
+    Holds the current DashboardSnapshot of an aggregator. `refresh()`
+    rebuilds it only when the aggregator's state has changed, so it can run
+    on a short schedule at the cost of one version check when nothing happened.
+    """
+
+    def __init__(self, aggregator):
+        self.aggregator = aggregator
+        self.refreshes = 0
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> DashboardSnapshot:
+        with self._lock:
+            state = self.aggregator.state()
+            snapshot = self._snapshot
+            if force or snapshot is None or snapshot.state != state:
+                # Aggregates recorded while the sections are read only make the snapshot
+                # newer than `state`, so the next refresh rebuilds it again
+                sections = {name: getattr(self.aggregator, name)() for name in SECTIONS}
+                snapshot = self._snapshot = DashboardSnapshot(state, sections)
+                self.refreshes += 1
+            return snapshot
+
+    def get(self) -> DashboardSnapshot:
+        """The current snapshot, built on first use."""
+        snapshot = self._snapshot
+        return snapshot if snapshot is not None else self.refresh()
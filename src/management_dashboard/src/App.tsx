@@ -1,4 +1,4 @@
-import React from 'react';
+import React, { useState, useEffect } from 'react';
 import Layout from './Layout';
 import { Grid } from '@mui/material';
 import KPICard from './components/KPICard';
@@ -6,25 +6,77 @@ import HeatmapCard from './components/HeatmapCard';
 import TrendsCard from './components/TrendsCard';
 import DepartmentList from './components/DepartmentList';
 
+// Rows of each list section are identified by these keys in live-feed deltas
+const ROW_KEYS = { departments: 'name', heatmap: 'label', trends: 'date' };
+
+// Keep each section in the order the API serves it
+const SORTS = {
+  departments: (a, b) => b.score - a.score || a.name.localeCompare(b.name),
+  heatmap: (a, b) => a.label.localeCompare(b.label),
+  trends: (a, b) => a.date.localeCompare(b.date),
+};
+
+function applyDelta(dashboard, delta) {
+  const next = { ...dashboard, generated_at: delta.generated_at };
+  if (delta.kpis) {
+    next.kpis = delta.kpis;
+  }
+  Object.entries(ROW_KEYS).forEach(([section, key]) => {
+    const changes = delta[section];
+    if (!changes) {
+      return;
+    }
+    const replaced = new Set([...changes.remove, ...changes.upsert.map((row) => row[key])]);
+    next[section] = dashboard[section]
+      .filter((row) => !replaced.has(row[key]))
+      .concat(changes.upsert)
+      .sort(SORTS[section]);
+  });
+  return next;
+}
+
 function App() {
+  // The whole dashboard comes from one precomputed snapshot, then live-feed deltas keep it current
+  const [dashboard, setDashboard] = useState(null);
+  const [error, setError] = useState(false);
+
+  useEffect(() => {
+    // EventSource reconnects by itself; each connection starts with a fresh snapshot
+    const source = new EventSource('/api/v1/dashboard/stream');
+    source.addEventListener('snapshot', (event) => {
+      setDashboard(JSON.parse(event.data));
+      setError(false);
+    });
+    source.addEventListener('delta', (event) => {
+      const delta = JSON.parse(event.data);
+      setDashboard((current) => (current ? applyDelta(current, delta) : current));
+    });
+    source.onerror = () => {
+      if (source.readyState === EventSource.CLOSED) {
+        setError(true);
+      }
+    };
+    return () => source.close();
+  }, []);
+
   return (
     <Layout>
       <Grid container spacing={3}>
         <Grid item xs={12}>
-          <KPICard />
+          <KPICard kpiData={dashboard?.kpis} error={error} />
         </Grid>
         <Grid item xs={12} md={6}>
-          <HeatmapCard />
+          <HeatmapCard heatmap={dashboard?.heatmap} error={error} />
         </Grid>
         <Grid item xs={12} md={6}>
-          <TrendsCard />
+          <TrendsCard trends={dashboard?.trends} error={error} />
         </Grid>
         <Grid item xs={12}>
-          <DepartmentList />
+          <DepartmentList departments={dashboard?.departments} error={error} />
         </Grid>
       </Grid>
     </Layout>
   );
 }
 
-export default App;
\ No newline at end of file
+export default App;
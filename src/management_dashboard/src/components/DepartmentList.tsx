@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React from 'react';
 import {
   List,
   ListItem,
@@ -8,28 +8,19 @@ import {
   CardContent,
 } from '@mui/material';
 
-const DepartmentList = () => {
-  const [departments, setDepartments] = useState([]);
-  const [error, setError] = useState(null);
-
-  useEffect(() => {
-    fetch('/api/v1/dashboard/departments')
-      .then((res) => res.json())
-      .then((data) => setDepartments(data))
-      .catch(() => setError('Could not load department data.'));
-  }, []);
-
+const DepartmentList = ({ departments, error }) => {
   return (
     <Card>
       <CardContent>
         <Typography variant="h5" component="div" gutterBottom>
           Wellness by Department
         </Typography>
-        {error && <Typography color="error">{error}</Typography>}
-        {!error && departments.length === 0 && (
-          <Typography>Loading departments...</Typography>
+        {error && <Typography color="error">Could not load department data.</Typography>}
+        {!error && !departments && <Typography>Loading departments...</Typography>}
+        {!error && departments && departments.length === 0 && (
+          <Typography>No predictions in the last 30 days.</Typography>
         )}
-        {!error && departments.length > 0 && (
+        {!error && departments && departments.length > 0 && (
           <List>
             {departments.map((dept) => (
               <ListItem key={dept.name}>
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useMemo } from 'react';
 import { Card, CardContent, Typography } from '@mui/material';
 import {
   Chart as ChartJS,
@@ -11,25 +11,30 @@ import { Bubble } from 'react-chartjs-2';
 
 ChartJS.register(LinearScale, PointElement, Tooltip, Legend);
 
-const HeatmapCard = () => {
-  const [chartData, setChartData] = useState(null);
-  const [error, setError] = useState(null);
+// A stable colour per department, so bubbles keep their colour across live updates
+const labelColor = (label) => {
+  let hash = 0;
+  for (let i = 0; i < label.length; i += 1) {
+    hash = (hash * 31 + label.charCodeAt(i)) % 360;
+  }
+  return `hsla(${hash}, 60%, 55%, 0.7)`;
+};
 
-  useEffect(() => {
-    fetch('/api/v1/dashboard/heatmap')
-      .then((response) => response.json())
-      .then((data) => {
-        const datasets = data.map((dept) => ({
-          label: dept.label,
-          data: [{ x: dept.x, y: dept.y, r: dept.r / 2 }],
-          backgroundColor: `rgba(${Math.random() * 255}, ${
-            Math.random() * 255
-          }, ${Math.random() * 255}, 0.7)`,
-        }));
-        setChartData({ datasets });
-      })
-      .catch(() => setError('Error fetching heatmap data.'));
-  }, []);
+const HeatmapCard = ({ heatmap, error }) => {
+  // Only rebuild the chart when the heatmap section of the snapshot changes
+  const chartData = useMemo(() => {
+    if (!heatmap) {
+      return null;
+    }
+    // Headcounts can be in the thousands; scale bubbles relative to the largest department
+    const maxHeadcount = Math.max(1, ...heatmap.map((dept) => dept.r));
+    const datasets = heatmap.map((dept) => ({
+      label: dept.label,
+      data: [{ x: dept.x, y: dept.y, r: 5 + (20 * dept.r) / maxHeadcount }],
+      backgroundColor: labelColor(dept.label),
+    }));
+    return { datasets };
+  }, [heatmap]);
 
   const options = {
     responsive: true,
@@ -43,7 +48,7 @@ const HeatmapCard = () => {
       },
       y: {
         title: { display: true, text: 'Focus Score' },
-        min: 40,
+        min: 0,
         max: 100,
       },
     },
@@ -56,7 +61,7 @@ const HeatmapCard = () => {
           Department Wellness Heatmap
         </Typography>
         <div style={{ height: '300px' }}>
-          {error && <Typography color="error">{error}</Typography>}
+          {error && <Typography color="error">Error fetching heatmap data.</Typography>}
           {!error && !chartData && <Typography>Loading chart...</Typography>}
           {!error && chartData && <Bubble options={options} data={chartData} />}
         </div>
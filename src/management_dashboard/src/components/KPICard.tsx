@@ -1,22 +1,12 @@
-import React, { useState, useEffect } from 'react';
+import React from 'react';
 import { Card, CardContent, Typography, Grid } from '@mui/material';
 
-const KPICard = () => {
-  const [kpiData, setKpiData] = useState(null);
-  const [error, setError] = useState(null);
-
-  useEffect(() => {
-    fetch('/api/v1/dashboard/kpis')
-      .then((res) => res.json())
-      .then((data) => setKpiData(data))
-      .catch(() => setError('Could not load KPI data.'));
-  }, []);
-
+const KPICard = ({ kpiData, error }) => {
   if (error) {
     return (
       <Card>
         <CardContent>
-          <Typography color="error">{error}</Typography>
+          <Typography color="error">Could not load KPI data.</Typography>
         </CardContent>
       </Card>
     );
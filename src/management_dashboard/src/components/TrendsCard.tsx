@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useMemo } from 'react';
 import { Card, CardContent, Typography } from '@mui/material';
 import {
   Chart as ChartJS,
@@ -24,32 +24,25 @@ ChartJS.register(
   Legend
 );
 
-const TrendsCard = () => {
-  const [chartData, setChartData] = useState(null);
-  const [error, setError] = useState(null);
-
-  useEffect(() => {
-    fetch('/api/v1/dashboard/trends')
-      .then((response) => response.json())
-      .then((data) => {
-        const labels = data.map((d) => new Date(d.date).toLocaleDateString());
-        const scores = data.map((d) => d.score);
-        setChartData({
-          labels,
-          datasets: [
-            {
-              label: 'Overall Wellness Score',
-              data: scores,
-              fill: true,
-              backgroundColor: 'rgba(74, 144, 164, 0.2)',
-              borderColor: 'rgb(74, 144, 164)',
-              tension: 0.4,
-            },
-          ],
-        });
-      })
-      .catch(() => setError('Error fetching trends data.'));
-  }, []);
+const TrendsCard = ({ trends, error }) => {
+  const chartData = useMemo(() => {
+    if (!trends) {
+      return null;
+    }
+    return {
+      labels: trends.map((d) => new Date(d.date).toLocaleDateString()),
+      datasets: [
+        {
+          label: 'Overall Wellness Score',
+          data: trends.map((d) => d.score),
+          fill: true,
+          backgroundColor: 'rgba(74, 144, 164, 0.2)',
+          borderColor: 'rgb(74, 144, 164)',
+          tension: 0.4,
+        },
+      ],
+    };
+  }, [trends]);
 
   const options = {
     responsive: true,
@@ -58,7 +51,7 @@ const TrendsCard = () => {
     scales: {
       y: {
         beginAtZero: false,
-        min: 60,
+        min: 0,
         max: 100,
         title: { display: true, text: 'Wellness Score' },
       },
@@ -73,7 +66,7 @@ const TrendsCard = () => {
           Wellness Trends (30 Days)
         </Typography>
         <div style={{ height: '300px' }}>
-            {error && <Typography color="error">{error}</Typography>}
+            {error && <Typography color="error">Error fetching trends data.</Typography>}
             {!error && !chartData && <Typography>Loading chart...</Typography>}
             {!error && chartData && <Line options={options} data={chartData} />}
         </div>
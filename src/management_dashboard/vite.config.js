@@ -7,8 +7,9 @@ export default defineConfig({
   server: {
     port: 3000,
     proxy: {
+      // /api/v1/dashboard/* is served by the dashboard API (server.py, port 8001), not the prediction server on 8000
       '/api': {
-        target: 'http://127.0.0.1:8000',
+        target: 'http://127.0.0.1:8001',
         changeOrigin: true,
       },
     },
@@ -0,0 +1,146 @@
+import json
+import os
+import pickle
+import struct
+import time
+import numpy as np
+from typing import Dict
+from src.server.forest import CompiledForest, compile_forest, load_forest
+
+# --- Bundle Format ---
+# A bundle is one file holding everything the prediction server needs:
+#
+#   MAGIC (8 bytes) | header length (uint64, little-endian) | JSON header | padding | array data
+#
+# The JSON header carries the format version, the small metadata (class names,
+# feature order, resource library) and, for each numeric array, its dtype,
+# shape and offset into the data section. Arrays start on ALIGNMENT-byte
+# boundaries, so the loader can map the file read-only and hand out zero-copy
+# views: workers on the same host share the pages through the OS page cache.
+MAGIC = b"WLBUNDLE"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREFIX = struct.Struct("<8sQ")
+
+FOREST_ARRAYS = ('feature', 'threshold', 'children', 'missing_go_to_left', 'leaf_id', 'value', 'roots', 'classes')
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def write_bundle(path: str, forest: CompiledForest, scaler, department_encoder, label_encoder, resource_library: Dict, feature_names):
+    """
+    Write a versioned model bundle.
+
+    The file is written next to its destination and renamed into place, so
+    a server loading the bundle never sees a partially written file.
+    """
+    arrays = {name: getattr(forest, 'classes_' if name == 'classes' else name) for name in FOREST_ARRAYS}
+    arrays['scaler_mean'] = scaler.mean_ if scaler.with_mean else np.zeros(scaler.n_features_in_)
+    arrays['scaler_scale'] = scaler.scale_ if scaler.with_std else np.ones(scaler.n_features_in_)
+
+    array_specs, data_offset = {}, 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        if array.dtype.hasobject:
+            raise ValueError(f"Array '{name}' has dtype {array.dtype} and cannot be stored in a bundle.")
+        arrays[name] = array
+        data_offset = _aligned(data_offset)
+        array_specs[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": data_offset}
+        data_offset += array.nbytes
+
+    header = json.dumps({
+        "format_version": FORMAT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "feature_names": list(feature_names),
+        "department_classes": [str(c) for c in department_encoder.classes_],
+        "label_classes": [str(c) for c in label_encoder.classes_],
+        "forest": {"n_features": forest.n_features_in_, "max_depth": forest.max_depth},
+        "resource_library": resource_library,
+        "arrays": array_specs,
+    }).encode("utf-8")
+    data_start = _aligned(_PREFIX.size + len(header))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.seek(data_start + array_specs[name]["offset"])
+            f.write(array.tobytes())
+        f.truncate(data_start + data_offset)
+    os.replace(tmp_path, path)
+
+def build_bundle(models_path: str, resource_library_path: str, output_path: str, forest: CompiledForest = None):
+    """
+    Package the training pipeline's outputs in models_path (the compiled
+    forest or model pickle, scaler and encoders) with the resource library.
+    """
+    if forest is None:
+        compiled_path = os.path.join(models_path, 'wellness_model.npz')
+        if os.path.exists(compiled_path):
+            forest = load_forest(compiled_path)
+        else:
+            with open(os.path.join(models_path, 'wellness_model.pkl'), 'rb') as f:
+                forest = compile_forest(pickle.load(f))
+
+    transformers = {}
+    for name in ('scaler', 'department_encoder', 'label_encoder'):
+        with open(os.path.join(models_path, f'{name}.pkl'), 'rb') as f:
+            transformers[name] = pickle.load(f)
+    with open(resource_library_path, 'r') as f:
+        resource_library = json.load(f)
+
+    write_bundle(output_path, forest, transformers['scaler'], transformers['department_encoder'],
+                 transformers['label_encoder'], resource_library, getattr(forest, 'feature_names_in_', []))
+
+def read_bundle_header(path: str):
+    """Read and validate a bundle's JSON header. Returns (header, data_start)."""
+    with open(path, "rb") as f:
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) != _PREFIX.size:
+            raise ValueError(f"{path} is too short to be a model bundle.")
+        magic, header_length = _PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a model bundle.")
+        header = json.loads(f.read(header_length).decode("utf-8"))
+    if header.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported bundle format version {header.get('format_version')} (expected {FORMAT_VERSION}).")
+    return header, _aligned(_PREFIX.size + header_length)
+
+def load_bundle(path: str) -> Dict:
+    """
+    Memory-map a bundle and return the artifacts the prediction server uses:
+    the compiled model, the inference lookup tables and the resource library.
+    Numeric arrays are read-only views into the mapped file.
+    """
+    header, data_start = read_bundle_header(path)
+    mapped = np.memmap(path, dtype=np.uint8, mode='r')
+
+    arrays = {}
+    for name, spec in header["arrays"].items():
+        dtype = np.dtype(spec["dtype"])
+        count = int(np.prod(spec["shape"], dtype=np.int64))
+        arrays[name] = np.frombuffer(mapped, dtype=dtype, count=count, offset=data_start + spec["offset"]).reshape(spec["shape"])
+
+    model = CompiledForest(
+        feature=arrays['feature'],
+        threshold=arrays['threshold'],
+        children=arrays['children'],
+        missing_go_to_left=arrays['missing_go_to_left'],
+        leaf_id=arrays['leaf_id'],
+        value=arrays['value'],
+        roots=arrays['roots'],
+        classes=arrays['classes'],
+        n_features=header["forest"]["n_features"],
+        max_depth=header["forest"]["max_depth"],
+        feature_names=header["feature_names"],
+    )
+    return {
+        'model': model,
+        'department_codes': {name: float(code) for code, name in enumerate(header["department_classes"])},
+        'scaler_mean': arrays['scaler_mean'],
+        'scaler_scale': arrays['scaler_scale'],
+        'label_classes': np.asarray(header["label_classes"], dtype=object),
+        'resource_library': header["resource_library"],
+        'bundle_created_at': header["created_at"],
+    }
@@ -0,0 +1,186 @@
+import numpy as np
+
+# Dtypes of the flattened arrays. Thresholds are stored as float32 (see compile_forest)
+# and node indices as int32, which keeps the artifact a fraction of the pickle's size.
+FEATURE_DTYPE = np.int16
+INDEX_DTYPE = np.int32
+
+class CompiledForest:
+    """
+    A RandomForestClassifier flattened into contiguous NumPy arrays.
+
+    All trees are laid out back to back in one node table, with each node's
+    (left, right) children stored side by side. Leaves point to themselves,
+    so every tree can be walked in lock-step for `max_depth` steps with plain
+    array gathers and no per-tree Python loop. Predictions are bit-for-bit
+    identical to the sklearn model it was compiled from.
+
+    The gathers are far cheaper than sklearn's per-call validation and joblib
+    dispatch for small batches; for batches of a few thousand rows sklearn's
+    compiled traversal catches up and overtakes it.
+    """
+
+    def __init__(self, feature, threshold, children, missing_go_to_left, leaf_id, value, roots, classes, n_features, max_depth, feature_names=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.missing_go_to_left = missing_go_to_left
+        self.leaf_id = leaf_id
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.n_features_in_ = int(n_features)
+        self.max_depth = int(max_depth)
+        if feature_names is not None:
+            self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+
+    @property
+    def n_estimators(self) -> int:
+        return len(self.roots)
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the node and leaf tables."""
+        return sum(getattr(self, name).nbytes for name in
+                   ('feature', 'threshold', 'children', 'missing_go_to_left', 'leaf_id', 'value', 'roots'))
+
+    def apply(self, X) -> np.ndarray:
+        """Return the leaf index reached in each tree, with shape (n_trees, n_samples)."""
+        # sklearn evaluates trees on float32 inputs; do the same so splits match exactly
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected a 2D array with {self.n_features_in_} features, got shape {X.shape}.")
+
+        n_samples, n_features = X.shape
+        flat_X = X.ravel()
+        flat_children = self.children.ravel()
+        # Trees are laid out tree-major: position t * n_samples + i is sample i in tree t
+        row_offsets = np.tile(np.arange(n_samples, dtype=INDEX_DTYPE) * n_features, self.n_estimators)
+        nodes = np.repeat(self.roots, n_samples)
+        for _ in range(self.max_depth):
+            x = np.take(flat_X, row_offsets + np.take(self.feature, nodes))
+            go_right = x > np.take(self.threshold, nodes)
+            missing = np.isnan(x)
+            if missing.any():
+                go_right[missing] = ~np.take(self.missing_go_to_left, nodes[missing])
+            nodes = np.take(flat_children, 2 * nodes + go_right)
+        return np.take(self.leaf_id, nodes).reshape(self.n_estimators, n_samples)
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Average the per-tree class distributions, accumulating in tree order like sklearn."""
+        leaf_values = self.value[self.apply(X)]
+        proba = np.zeros(leaf_values.shape[1:], dtype=np.float64)
+        for tree_values in leaf_values:
+            proba += tree_values
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        """Predict class labels, matching RandomForestClassifier.predict."""
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+def _float32_threshold(threshold: np.ndarray) -> np.ndarray:
+    """
+    Round float64 split thresholds down to the nearest float32.
+
+    Inputs are float32, and for any float32 x, `x <= t` holds exactly when
+    `x <= t32` where t32 is the largest float32 not above t, so the
+    narrower thresholds give identical decisions.
+    """
+    threshold32 = threshold.astype(np.float32)
+    too_high = threshold32.astype(np.float64) > threshold
+    threshold32[too_high] = np.nextafter(threshold32[too_high], np.float32(-np.inf))
+    return threshold32
+
+def compile_forest(model) -> CompiledForest:
+    """Flatten a fitted RandomForestClassifier into a CompiledForest."""
+    if getattr(model, 'n_outputs_', 1) != 1:
+        raise ValueError("Only single-output forests can be compiled.")
+
+    n_classes = int(model.n_classes_)
+    features, thresholds, children, missing, leaf_ids, values, roots = [], [], [], [], [], [], []
+    node_offset = leaf_offset = 0
+    max_depth = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        node_ids = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+
+        roots.append(node_offset)
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+        # Leaves loop back to themselves so extra traversal steps are no-ops
+        children.append(np.column_stack([
+            np.where(is_leaf, node_ids, tree.children_left),
+            np.where(is_leaf, node_ids, tree.children_right),
+        ]) + node_offset)
+        tree_missing = getattr(tree, 'missing_go_to_left', None)
+        missing.append(np.zeros(tree.node_count, dtype=bool) if tree_missing is None else tree_missing.astype(bool))
+
+        leaf_ids.append(np.where(is_leaf, np.cumsum(is_leaf) - 1 + leaf_offset, 0))
+        # Same normalisation as DecisionTreeClassifier.predict_proba
+        leaf_value = tree.value[is_leaf, 0, :n_classes].astype(np.float64)
+        normalizer = leaf_value.sum(axis=1)[:, np.newaxis]
+        normalizer[normalizer == 0.0] = 1.0
+        values.append(leaf_value / normalizer)
+
+        node_offset += tree.node_count
+        leaf_offset += int(is_leaf.sum())
+        max_depth = max(max_depth, tree.max_depth)
+
+    feature = np.concatenate(features)
+    if model.n_features_in_ > np.iinfo(FEATURE_DTYPE).max:
+        raise ValueError("Forest uses too many features to compile.")
+    if node_offset > np.iinfo(INDEX_DTYPE).max:
+        raise ValueError("Forest has too many nodes to compile.")
+
+    return CompiledForest(
+        feature=feature.astype(FEATURE_DTYPE),
+        threshold=_float32_threshold(np.concatenate(thresholds)),
+        children=np.ascontiguousarray(np.concatenate(children), dtype=INDEX_DTYPE),
+        missing_go_to_left=np.concatenate(missing),
+        leaf_id=np.concatenate(leaf_ids).astype(INDEX_DTYPE),
+        value=np.concatenate(values),
+        roots=np.asarray(roots, dtype=INDEX_DTYPE),
+        classes=np.asarray(model.classes_),
+        n_features=model.n_features_in_,
+        max_depth=max_depth,
+        feature_names=getattr(model, 'feature_names_in_', None),
+    )
+
+def save_forest(forest: CompiledForest, path: str):
+    """Save a CompiledForest to a compressed .npz file."""
+    arrays = {
+        'feature': forest.feature,
+        'threshold': forest.threshold,
+        'children': forest.children,
+        'missing_go_to_left': forest.missing_go_to_left,
+        'leaf_id': forest.leaf_id,
+        'value': forest.value,
+        'roots': forest.roots,
+        'classes': forest.classes_,
+        'n_features': np.asarray(forest.n_features_in_),
+        'max_depth': np.asarray(forest.max_depth),
+    }
+    if hasattr(forest, 'feature_names_in_'):
+        arrays['feature_names'] = np.asarray(forest.feature_names_in_, dtype=str)
+    with open(path, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+
+def load_forest(path: str) -> CompiledForest:
+    """Load a CompiledForest saved by save_forest."""
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {name: data[name] for name in data.files}
+    return CompiledForest(
+        feature=arrays['feature'],
+        threshold=arrays['threshold'],
+        children=arrays['children'],
+        missing_go_to_left=arrays['missing_go_to_left'],
+        leaf_id=arrays['leaf_id'],
+        value=arrays['value'],
+        roots=arrays['roots'],
+        classes=arrays['classes'],
+        n_features=arrays['n_features'],
+        max_depth=arrays['max_depth'],
+        feature_names=arrays.get('feature_names'),
+    )
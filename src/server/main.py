@@ -1,13 +1,80 @@
+import os
+import sys
+import argparse
+import hmac
 import pickle
 import json
-import pandas as pd
-from fastapi import FastAPI, HTTPException
+import time
+import threading
+import warnings
+import numpy as np
+from collections import OrderedDict
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+# Allow `python src/server/main.py` as well as `uvicorn src.server.main:app` from the project root
+if not __package__:
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.server.batching import MicroBatcher
+from src.server.forest import load_forest
+from src.server.bundle import load_bundle
+from src.server.prediction_store import PredictionStore
+from src.server.metrics import CONTENT_TYPE, STAGE_BUCKETS, MetricsMiddleware, MetricsRegistry
 
 # --- Global objects to hold the model and other artifacts ---
+# ARTIFACTS is never mutated: a reload builds a complete new dict and swaps the
+# reference, and each request reads it once, so in-flight requests finish on
+# the artifact set they started with.
 ARTIFACTS = {}
 
+# The single-file bundle written by the training pipeline is preferred. Without it,
+# the separate artifacts are loaded, using the compiled forest (written by
+# scripts/train_model.py or scripts/compile_model.py) over the sklearn pickle.
+BUNDLE_PATH = "models/wellness_bundle.bin"
+MODEL_PATH = "models/wellness_model.pkl"
+COMPILED_MODEL_PATH = "models/wellness_model.npz"
+SCALER_PATH = "models/scaler.pkl"
+DEPARTMENT_ENCODER_PATH = "models/department_encoder.pkl"
+LABEL_ENCODER_PATH = "models/label_encoder.pkl"
+RESOURCE_LIBRARY_PATH = "src/server/resource_library.json"
+
+# --- Micro-batching Configuration (opt-in) ---
+# When enabled, concurrent /predict requests arriving within the window are
+# coalesced into a single vectorized model.predict call.
+MICROBATCH_ENABLED = os.environ.get("WELLNESS_MICROBATCH", "0") == "1"
+MICROBATCH_MAX_SIZE = int(os.environ.get("WELLNESS_MICROBATCH_MAX_SIZE", "64"))
+MICROBATCH_WINDOW_MS = float(os.environ.get("WELLNESS_MICROBATCH_WINDOW_MS", "2"))
+BATCHER = None
+
+# --- Hot Reload Configuration ---
+# New artifacts can be loaded without a restart through POST /admin/reload, or by
+# polling the artifact files every RELOAD_POLL_SECONDS (0 disables the watcher).
+# When WELLNESS_ADMIN_TOKEN is set, admin endpoints require it in X-Admin-Token.
+RELOAD_POLL_SECONDS = float(os.environ.get("WELLNESS_RELOAD_POLL_SECONDS", "0"))
+ADMIN_TOKEN = os.environ.get("WELLNESS_ADMIN_TOKEN", "")
+RELOAD_LOCK = threading.Lock()
+# Set when artifacts were loaded before the server started (pre-fork mode), so
+# worker processes serve the inherited copy instead of loading their own
+PRELOADED = False
+WATCHER_STOP = threading.Event()
+WATCHER_THREAD = None
+
+# --- Prediction Cache Configuration ---
+# Dashboards poll the same employees repeatedly; identical inputs are answered
+# from a bounded LRU cache. A size of 0 disables caching.
+CACHE_MAX_SIZE = int(os.environ.get("WELLNESS_CACHE_SIZE", "10000"))
+CACHE_TTL_SECONDS = float(os.environ.get("WELLNESS_CACHE_TTL_SECONDS", "300"))
+
+# --- Prediction Store ---
+# Every prediction is appended to this columnar store for the dashboard's
+# trends and history. Set WELLNESS_PREDICTION_STORE="" to disable it.
+PREDICTION_STORE_PATH = os.environ.get("WELLNESS_PREDICTION_STORE", "data/predictions")
+STORE_FLUSH_SECONDS = float(os.environ.get("WELLNESS_PREDICTION_STORE_FLUSH_SECONDS", "1"))
+STORE_WRITER = None
+
 # --- Pydantic Models ---
 class PredictionInput(BaseModel):
     """Defines the structure for a single prediction request."""
@@ -16,6 +83,7 @@ class PredictionInput(BaseModel):
     after_hours_activity_minutes: float
     communication_sentiment_score: float
     department: str
+    employee_id: Optional[str] = Field(None, description="Optional id used to count distinct employees in the prediction store.")
 
 class Resource(BaseModel):
     """Defines the structure for a single wellness resource."""
@@ -28,70 +96,521 @@ class PredictionOutput(BaseModel):
     wellness_label: str
     recommended_resources: List[Resource]
 
+class BatchPredictionInput(BaseModel):
+    """Defines the structure for a batch prediction request."""
+    records: List[PredictionInput]
+
+class BatchPredictionOutput(BaseModel):
+    """Defines the structure for a batch prediction response, in request order."""
+    predictions: List[PredictionOutput]
+
+class ModelInfo(BaseModel):
+    """Defines the structure describing the artifact set being served."""
+    source: str
+    loaded_at: str
+    bundle_created_at: Optional[str] = None
+
+class CacheStats(BaseModel):
+    """Defines the structure for the prediction cache statistics."""
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    hit_rate: float
+
+# --- Prediction Cache ---
+class PredictionCache:
+    """
+    Thread-safe LRU cache of predicted labels with a per-entry TTL.
+
+    `clear()` starts a new generation; a `put()` tagged with an older
+    generation is dropped, so predictions computed with artifacts that were
+    replaced mid-request never reach the cache.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key):
+        """Return the cached label for key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            label, expires_at = entry
+            if self.ttl_seconds > 0 and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return label
+
+    def put(self, key, label, generation: int):
+        """Cache a label computed during the given generation, evicting the least recently used entries."""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._entries[key] = (label, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry and start a new generation."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+PREDICTION_CACHE = PredictionCache(CACHE_MAX_SIZE, CACHE_TTL_SECONDS)
+
+# --- Metrics ---
+# Exposed at /metrics in the Prometheus text format. In pre-fork mode each
+# worker keeps its own metrics, so a scrape reports the worker that served it.
+METRICS = MetricsRegistry()
+REQUESTS_TOTAL = METRICS.counter("wellness_http_requests_total", "HTTP requests handled.", ("method", "path", "status"))
+REQUEST_ERRORS_TOTAL = METRICS.counter("wellness_http_request_errors_total", "HTTP requests answered with a 4xx or 5xx status.", ("method", "path", "status"))
+REQUESTS_IN_FLIGHT = METRICS.gauge("wellness_http_requests_in_flight", "HTTP requests currently being handled.")
+REQUEST_SECONDS = METRICS.histogram("wellness_http_request_duration_seconds", "HTTP request latency.", ("method", "path"))
+# validation: body read and pydantic validation; cache: prediction cache lookup;
+# encode: department encoding; scale: feature scaling; predict: model evaluation
+# (including the wait for a batch when micro-batching); decode: label lookup;
+# resources: resource library lookup
+PREDICT_STAGE_SECONDS = METRICS.histogram("wellness_predict_stage_duration_seconds", "Time spent in each /predict stage.", ("stage",), STAGE_BUCKETS)
+
+def observe_stage(stage: str, start: float) -> float:
+    """Record the time since start against a /predict stage and return the current time."""
+    now = time.perf_counter()
+    PREDICT_STAGE_SECONDS.observe(now - start, stage)
+    return now
+
+def cache_key(input_data: PredictionInput) -> tuple:
+    """Normalize an input into a hashable key; field order matches TRAINING_COLS."""
+    return (
+        float(input_data.focus_session_length_minutes),
+        float(input_data.break_frequency_per_hour),
+        float(input_data.after_hours_activity_minutes),
+        float(input_data.communication_sentiment_score),
+        input_data.department,
+    )
+
+# --- Feature Layout ---
+# Column order the RandomForest was trained on (see preprocess_data.py).
+TRAINING_COLS = ['focus_session_length_minutes', 'break_frequency_per_hour',
+                 'after_hours_activity_minutes', 'communication_sentiment_score', 'department']
+NUMERICAL_COLS = TRAINING_COLS[:-1]
+REQUIRED_ARTIFACTS = ['model', 'department_codes', 'scaler_mean', 'scaler_scale', 'label_classes', 'resource_library']
+
+# The model was fitted on a DataFrame, but inference feeds it a plain float64 array
+# built in TRAINING_COLS order (verified against feature_names_in_ at load time).
+warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
+
 # --- FastAPI Application ---
 app = FastAPI(
     title="Employee Wellbeing Analytics Hub",
     description="A server for analyzing employee wellness data and providing personalized resources.",
     version="1.2.0"
 )
+app.add_middleware(MetricsMiddleware, requests=REQUESTS_TOTAL, errors=REQUEST_ERRORS_TOTAL,
+                   in_flight=REQUESTS_IN_FLIGHT, duration=REQUEST_SECONDS, excluded_paths=("/metrics",))
+
+def verify_feature_order(model):
+    """Ensure the model expects features in TRAINING_COLS order, which the fast path relies on."""
+    model_features = getattr(model, 'feature_names_in_', None)
+    if model_features is not None and list(model_features) != TRAINING_COLS:
+        raise RuntimeError(f"Model was trained on columns {list(model_features)}, expected {TRAINING_COLS}.")
+
+def build_lookup_tables(artifacts: Dict) -> Dict:
+    """
+    Precompute the plain Python/NumPy tables used by the inference fast path,
+    so requests never go through pandas or the sklearn transformers.
+    """
+    scaler = artifacts['scaler']
+    n_numerical = len(NUMERICAL_COLS)
+    scaler_mean = scaler.mean_ if scaler.with_mean else np.zeros(n_numerical)
+    scaler_scale = scaler.scale_ if scaler.with_std else np.ones(n_numerical)
+
+    department_classes = artifacts['department_encoder'].classes_
+    return {
+        'department_codes': {str(name): float(code) for code, name in enumerate(department_classes)},
+        'scaler_mean': np.asarray(scaler_mean, dtype=np.float64),
+        'scaler_scale': np.asarray(scaler_scale, dtype=np.float64),
+        'label_classes': np.asarray(artifacts['label_encoder'].classes_, dtype=object),
+    }
+
+def load_separate_artifacts() -> Dict:
+    """Load the model, transformers, and resource library from their individual files."""
+    artifacts = {}
+    if os.path.exists(COMPILED_MODEL_PATH):
+        artifacts['model'] = load_forest(COMPILED_MODEL_PATH)
+        print(f"Using compiled forest from {COMPILED_MODEL_PATH}.")
+    else:
+        with open(MODEL_PATH, "rb") as f:
+            artifacts['model'] = pickle.load(f)
+    with open(SCALER_PATH, "rb") as f:
+        artifacts['scaler'] = pickle.load(f)
+    with open(DEPARTMENT_ENCODER_PATH, "rb") as f:
+        artifacts['department_encoder'] = pickle.load(f)
+    with open(LABEL_ENCODER_PATH, "rb") as f:
+        artifacts['label_encoder'] = pickle.load(f)
+
+    # Load the resource library
+    with open(RESOURCE_LIBRARY_PATH, "r") as f:
+        artifacts['resource_library'] = json.load(f)
+
+    artifacts.update(build_lookup_tables(artifacts))
+    return artifacts
+
+def artifact_fingerprint() -> tuple:
+    """Identify the artifact files on disk by path, size and modification time."""
+    if os.path.exists(BUNDLE_PATH):
+        paths = [BUNDLE_PATH]
+    else:
+        paths = [COMPILED_MODEL_PATH, MODEL_PATH, SCALER_PATH, DEPARTMENT_ENCODER_PATH,
+                 LABEL_ENCODER_PATH, RESOURCE_LIBRARY_PATH]
+    fingerprint = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            fingerprint.append((path, stat.st_size, stat.st_mtime_ns))
+        except FileNotFoundError:
+            fingerprint.append((path, None, None))
+    return tuple(fingerprint)
+
+def read_artifacts() -> Dict:
+    """Load a complete artifact set from disk without touching the one being served."""
+    # Taken before reading, so files replaced mid-load are picked up by the next poll
+    fingerprint = artifact_fingerprint()
+    if os.path.exists(BUNDLE_PATH):
+        artifacts = load_bundle(BUNDLE_PATH)
+        artifacts['source'] = BUNDLE_PATH
+    else:
+        artifacts = load_separate_artifacts()
+        artifacts['source'] = "separate artifact files"
+    verify_feature_order(artifacts['model'])
+
+    artifacts['fingerprint'] = fingerprint
+    artifacts['loaded_at'] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    return artifacts
+
+def smoke_test(artifacts: Dict):
+    """Run one prediction through a freshly loaded artifact set before it is served."""
+    missing = [k for k in REQUIRED_ARTIFACTS if k not in artifacts]
+    if missing:
+        raise RuntimeError(f"Artifact set is missing {missing}.")
+    # The scaler mean is a typical input for every numerical feature
+    sample = PredictionInput(
+        **{col: float(mean) for col, mean in zip(NUMERICAL_COLS, artifacts['scaler_mean'])},
+        department=next(iter(artifacts['department_codes'])),
+    )
+    label = predict_labels([sample], artifacts)[0]
+    if label not in set(artifacts['label_classes']):
+        raise RuntimeError(f"Smoke prediction returned unknown label '{label}'.")
+
+def swap_artifacts(artifacts: Dict):
+    """Atomically replace the artifact set being served and invalidate cached predictions."""
+    global ARTIFACTS
+    ARTIFACTS = artifacts
+    # Cleared after the swap: requests that read the cache generation before the swap never cache old labels
+    PREDICTION_CACHE.clear()
+
+def reload_artifacts() -> Dict:
+    """Load, validate and swap in a new artifact set. On failure the current set keeps serving."""
+    with RELOAD_LOCK:
+        artifacts = read_artifacts()
+        smoke_test(artifacts)
+        swap_artifacts(artifacts)
+    return model_info(artifacts)
+
+def model_info(artifacts: Dict) -> Dict:
+    return {
+        "source": artifacts['source'],
+        "loaded_at": artifacts['loaded_at'],
+        "bundle_created_at": artifacts.get('bundle_created_at'),
+    }
+
+def watch_artifacts(interval: float):
+    """Poll the artifact files and hot-reload when they change."""
+    failed_fingerprint = None
+    while not WATCHER_STOP.wait(interval):
+        fingerprint = artifact_fingerprint()
+        if fingerprint in (ARTIFACTS.get('fingerprint'), failed_fingerprint):
+            continue
+        try:
+            info = reload_artifacts()
+            failed_fingerprint = None
+            print(f"Reloaded artifacts from {info['source']}.")
+        except Exception as e:
+            # Typically a file still being written; it is retried once the files change again
+            failed_fingerprint = fingerprint
+            print(f"Artifact reload failed, still serving the previous artifacts: {e}")
 
 # --- Startup Event Handler ---
 @app.on_event("startup")
 def load_artifacts():
     """Load the model, transformers, and resource library into memory."""
+    if PRELOADED and ARTIFACTS:
+        return
     print("Loading artifacts...")
     try:
-        # Load ML model and transformers
-        with open("models/wellness_model.pkl", "rb") as f:
-            ARTIFACTS['model'] = pickle.load(f)
-        with open("models/scaler.pkl", "rb") as f:
-            ARTIFACTS['scaler'] = pickle.load(f)
-        with open("models/department_encoder.pkl", "rb") as f:
-            ARTIFACTS['department_encoder'] = pickle.load(f)
-        with open("models/label_encoder.pkl", "rb") as f:
-            ARTIFACTS['label_encoder'] = pickle.load(f)
-
-        # Load the resource library
-        with open("src/server/resource_library.json", "r") as f:
-            ARTIFACTS['resource_library'] = json.load(f)
-
-        print("Artifacts loaded successfully.")
+        artifacts = read_artifacts()
+        smoke_test(artifacts)
+        swap_artifacts(artifacts)
+        print(f"Artifacts loaded successfully from {artifacts['source']}.")
     except FileNotFoundError as e:
         print(f"Error loading artifacts: {e}")
         raise RuntimeError("Could not load all required artifacts. Ensure training has been run and resource_library.json exists.")
 
+@app.on_event("startup")
+def start_artifact_watcher():
+    """Start polling the artifact files for changes if it has been enabled."""
+    global WATCHER_THREAD
+    if RELOAD_POLL_SECONDS > 0 and WATCHER_THREAD is None:
+        WATCHER_STOP.clear()
+        WATCHER_THREAD = threading.Thread(target=watch_artifacts, args=(RELOAD_POLL_SECONDS,), name="artifact-watcher", daemon=True)
+        WATCHER_THREAD.start()
+        print(f"Watching artifact files for changes every {RELOAD_POLL_SECONDS}s.")
+
+@app.on_event("shutdown")
+def stop_artifact_watcher():
+    """Stop the artifact watcher."""
+    global WATCHER_THREAD
+    if WATCHER_THREAD is not None:
+        WATCHER_STOP.set()
+        WATCHER_THREAD.join()
+        WATCHER_THREAD = None
+
+@app.on_event("startup")
+def open_prediction_store():
+    """Start recording predictions if a prediction store is configured."""
+    global STORE_WRITER
+    if PREDICTION_STORE_PATH and STORE_WRITER is None:
+        STORE_WRITER = PredictionStore(PREDICTION_STORE_PATH).writer(flush_interval=STORE_FLUSH_SECONDS)
+        print(f"Recording predictions to {PREDICTION_STORE_PATH}.")
+
+@app.on_event("shutdown")
+def close_prediction_store():
+    """Write any buffered predictions to the store."""
+    global STORE_WRITER
+    if STORE_WRITER is not None:
+        STORE_WRITER.close()
+        STORE_WRITER = None
+
+def record_prediction(input_data: PredictionInput, prediction_label: str):
+    """Queue a prediction for the prediction store, if one is open."""
+    writer = STORE_WRITER
+    if writer is not None:
+        writer.append(input_data.department, prediction_label,
+                      (input_data.focus_session_length_minutes, input_data.break_frequency_per_hour,
+                       input_data.after_hours_activity_minutes, input_data.communication_sentiment_score),
+                      employee_id=input_data.employee_id)
+
+@app.on_event("startup")
+async def start_batcher():
+    """Start the micro-batcher if it has been enabled."""
+    global BATCHER
+    if MICROBATCH_ENABLED:
+        BATCHER = MicroBatcher(predict_encoded, max_batch_size=MICROBATCH_MAX_SIZE, max_wait_ms=MICROBATCH_WINDOW_MS)
+        await BATCHER.start()
+        print(f"Micro-batching enabled (max batch size {MICROBATCH_MAX_SIZE}, window {MICROBATCH_WINDOW_MS}ms).")
+
+@app.on_event("shutdown")
+async def stop_batcher():
+    """Stop the micro-batcher, failing any requests it has not processed."""
+    global BATCHER
+    if BATCHER is not None:
+        await BATCHER.stop()
+        BATCHER = None
+
 # --- API Endpoints ---
 @app.get("/")
 def read_root():
     """A simple health check endpoint."""
     return {"status": "ok", "message": "Analytics Hub is running."}
 
-@app.post("/predict", response_model=PredictionOutput)
-def predict_wellness(input_data: PredictionInput):
+def encode_records(records: List[PredictionInput], artifacts: Dict) -> np.ndarray:
+    """Encode a list of inputs into an unscaled float64 feature matrix in training column order."""
+    department_codes = artifacts['department_codes']
+    rows = []
+    for record in records:
+        department_code = department_codes.get(record.department)
+        if department_code is None:
+            raise ValueError(f"Unknown department '{record.department}'.")
+        rows.append((record.focus_session_length_minutes, record.break_frequency_per_hour,
+                     record.after_hours_activity_minutes, record.communication_sentiment_score,
+                     department_code))
+
+    return np.array(rows, dtype=np.float64).reshape(len(rows), len(TRAINING_COLS))
+
+def scale_features(features: np.ndarray, artifacts: Dict) -> np.ndarray:
+    """Standardize the numerical columns of an encoded feature matrix in place."""
+    numerical = features[:, :len(NUMERICAL_COLS)]
+    numerical -= artifacts['scaler_mean']
+    numerical /= artifacts['scaler_scale']
+    return features
+
+def build_features(records: List[PredictionInput], artifacts: Dict = None) -> np.ndarray:
+    """Encode and scale a list of inputs into a float64 feature matrix in training column order."""
+    artifacts = ARTIFACTS if artifacts is None else artifacts
+    return scale_features(encode_records(records, artifacts), artifacts)
+
+def predict_encoded(items: List[tuple]) -> list:
     """
-    Predicts the wellness level and returns relevant resources.
+    Run (artifacts, feature row) pairs collected by the micro-batcher through the model.
+    Rows are grouped by artifact set, so a batch spanning a reload still uses each
+    request's own model; normally there is a single group and a single predict call.
     """
-    required_artifacts = ['model', 'scaler', 'department_encoder', 'label_encoder', 'resource_library']
-    if not all(k in ARTIFACTS for k in required_artifacts):
+    groups = {}
+    for i, (artifacts, _) in enumerate(items):
+        groups.setdefault(id(artifacts), (artifacts, []))[1].append(i)
+
+    results = [None] * len(items)
+    for artifacts, indices in groups.values():
+        predictions = artifacts['model'].predict(np.vstack([items[i][1] for i in indices]))
+        for i, prediction in zip(indices, predictions):
+            results[i] = prediction
+    return results
+
+def predict_labels(records: List[PredictionInput], artifacts: Dict = None) -> List[str]:
+    """Run the whole batch through the model with a single predict call."""
+    artifacts = ARTIFACTS if artifacts is None else artifacts
+    prediction_encoded = artifacts['model'].predict(build_features(records, artifacts))
+    return artifacts['label_classes'].take(prediction_encoded).tolist()
+
+def predict_one_timed(input_data: PredictionInput, artifacts: Dict) -> str:
+    """Predict a single label, recording the time spent in each stage."""
+    start = time.perf_counter()
+    features = encode_records([input_data], artifacts)
+    start = observe_stage("encode", start)
+    scale_features(features, artifacts)
+    start = observe_stage("scale", start)
+    prediction_encoded = artifacts['model'].predict(features)
+    start = observe_stage("predict", start)
+    prediction_label = artifacts['label_classes'][prediction_encoded[0]]
+    observe_stage("decode", start)
+    return prediction_label
+
+async def predict_label(input_data: PredictionInput, artifacts: Dict, cache_generation: int) -> str:
+    """Predict one label from the cache, or through the micro-batcher when it is running."""
+    if PREDICTION_CACHE.enabled:
+        start = time.perf_counter()
+        key = cache_key(input_data)
+        cached_label = PREDICTION_CACHE.get(key)
+        observe_stage("cache", start)
+        if cached_label is not None:
+            return cached_label
+
+    if BATCHER is None:
+        prediction_label = await run_in_threadpool(predict_one_timed, input_data, artifacts)
+    else:
+        # Encoding is cheap; doing it here means a bad record only fails its own request
+        start = time.perf_counter()
+        features = encode_records([input_data], artifacts)
+        start = observe_stage("encode", start)
+        scale_features(features, artifacts)
+        start = observe_stage("scale", start)
+        prediction_encoded = await BATCHER.submit((artifacts, features[0]))
+        start = observe_stage("predict", start)
+        prediction_label = artifacts['label_classes'][prediction_encoded]
+        observe_stage("decode", start)
+
+    if PREDICTION_CACHE.enabled:
+        PREDICTION_CACHE.put(key, prediction_label, cache_generation)
+    return prediction_label
+
+def current_artifacts() -> Dict:
+    """Return the artifact set being served, or raise a 503 if none has been loaded."""
+    artifacts = ARTIFACTS
+    if not all(k in artifacts for k in REQUIRED_ARTIFACTS):
         raise HTTPException(status_code=503, detail="Artifacts are not loaded. The service is unavailable.")
+    return artifacts
+
+def check_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """Require the admin token on admin endpoints when one is configured."""
+    if ADMIN_TOKEN and not hmac.compare_digest(x_admin_token or "", ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="A valid X-Admin-Token header is required.")
 
+@app.get("/admin/model", response_model=ModelInfo, dependencies=[Depends(check_admin_token)])
+def get_model_info():
+    """Describes the artifact set currently being served."""
+    return model_info(current_artifacts())
+
+@app.post("/admin/reload", response_model=ModelInfo, dependencies=[Depends(check_admin_token)])
+def reload_model():
+    """
+    Loads the artifacts on disk, validates them with a smoke prediction and swaps
+    them in. Requests already in flight finish on the previous artifacts.
+    """
     try:
-        # 1. Convert input to a DataFrame and preprocess
-        input_df = pd.DataFrame([input_data.dict()])
-        input_df['department'] = ARTIFACTS['department_encoder'].transform(input_df['department'])
-        numerical_cols = input_df.columns.drop('department')
-        input_df[numerical_cols] = ARTIFACTS['scaler'].transform(input_df[numerical_cols])
+        return reload_artifacts()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Reload failed; still serving the previous artifacts: {e}")
+
+@app.get("/cache/stats", response_model=CacheStats)
+def get_cache_stats():
+    """Returns prediction cache counters for sizing the cache."""
+    return PREDICTION_CACHE.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Request, error and per-stage latency metrics in the Prometheus text format."""
+    return PlainTextResponse(METRICS.render(), media_type=CONTENT_TYPE)
+
+@app.post("/predict", response_model=PredictionOutput)
+async def predict_wellness(input_data: PredictionInput, request: Request):
+    """
+    Predicts the wellness level and returns relevant resources.
+    """
+    # The metrics middleware stamps the request start; everything up to here is body parsing and validation
+    request_start = request.scope.get("metrics.start")
+    if request_start is not None:
+        observe_stage("validation", request_start)
 
-        training_cols = ['focus_session_length_minutes', 'break_frequency_per_hour',
-                         'after_hours_activity_minutes', 'communication_sentiment_score', 'department']
-        input_df = input_df[training_cols]
+    # Read the cache generation before the artifacts (see swap_artifacts)
+    cache_generation = PREDICTION_CACHE.generation
+    artifacts = current_artifacts()
 
-        # 2. Make a prediction
-        prediction_encoded = ARTIFACTS['model'].predict(input_df)
-        prediction_label = ARTIFACTS['label_encoder'].inverse_transform(prediction_encoded)[0]
+    try:
+        # 1. Preprocess and make a prediction
+        prediction_label = await predict_label(input_data, artifacts, cache_generation)
+        record_prediction(input_data, prediction_label)
 
-        # 3. Look up recommended resources
-        resources = ARTIFACTS['resource_library'].get(prediction_label, [])
+        # 2. Look up recommended resources
+        start = time.perf_counter()
+        resources = artifacts['resource_library'].get(prediction_label, [])
+        observe_stage("resources", start)
 
         return {
             "wellness_label": prediction_label,
@@ -101,10 +620,51 @@ def predict_wellness(input_data: PredictionInput):
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"An error occurred during prediction: {e}")
 
+@app.post("/predict/batch", response_model=BatchPredictionOutput)
+def predict_wellness_batch(batch: BatchPredictionInput):
+    """
+    Predicts the wellness level for many records with one vectorized model call.
+    Predictions are returned in the same order as the input records.
+    """
+    artifacts = current_artifacts()
+    if not batch.records:
+        return {"predictions": []}
+
+    try:
+        prediction_labels = predict_labels(batch.records, artifacts)
+        for record, label in zip(batch.records, prediction_labels):
+            record_prediction(record, label)
+        resource_library = artifacts['resource_library']
+        return {
+            "predictions": [
+                {"wellness_label": label, "recommended_resources": resource_library.get(label, [])}
+                for label in prediction_labels
+            ]
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"An error occurred during batch prediction: {e}")
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Run the Employee Wellbeing Analytics Hub.")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Interface to bind to.")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on.")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WELLNESS_WORKERS", "1")),
+                        help="Number of pre-forked worker processes sharing the loaded artifacts.")
+    parser.add_argument("--graceful_timeout", type=float, default=30.0, help="Seconds workers get to finish in-flight requests on shutdown.")
+    return parser.parse_args()
+
 # --- To run this server locally ---
 # uvicorn src.server.main:app --reload
+# or, with several worker processes: python src/server/main.py --workers 4
 if __name__ == "__main__":
-    import uvicorn
+    from src.server.prefork import serve
+    args = parse_args()
     print("Starting FastAPI server...")
-    print("Access the API docs at http://127.0.0.1:8000/docs")
-    uvicorn.run(app, host="127.0.0.1", port=8000)
\ No newline at end of file
+    print(f"Access the API docs at http://{args.host}:{args.port}/docs")
+    if args.workers > 1:
+        # Load once in the parent; forked workers share the pages copy-on-write
+        load_artifacts()
+        PRELOADED = True
+    serve(app, args.host, args.port, args.workers, graceful_timeout=args.graceful_timeout)
@@ -0,0 +1,413 @@
+import json
+import os
+import threading
+import time
+import uuid
+import numpy as np
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Sequence
+
+# --- Store Layout ---
+# An append-only, columnar store of timestamped predictions:
+#
+#   <root>/day=YYYY-MM-DD/<segment>/<column>.bin   raw little-endian column values
+#   <root>/day=YYYY-MM-DD/<segment>/<name>.dict    dictionary of a string column, one JSON string per line
+#   <root>/day=YYYY-MM-DD/<segment>/meta.json      committed row count and dictionary sizes
+#
+# Rows are partitioned by UTC day, so range scans and daily/weekly rollups only
+# open the partitions they need. Each writer process appends to its own
+# segment, which keeps concurrent writers (e.g. pre-forked server workers)
+# lock-free. Column files are appended first and meta.json is replaced last,
+# so readers only ever see whole, committed rows. Columns are memory-mapped
+# when read, so scans never load more than one segment's columns at a time.
+FORMAT_VERSION = 1
+COLUMNS = {
+    "timestamp": np.dtype("<i8"),  # microseconds since the Unix epoch, UTC
+    "department": np.dtype("<u2"),  # code into the segment's department dictionary
+    "wellness_label": np.dtype("u1"),  # code into the segment's wellness_label dictionary
+    "employee": np.dtype("<i4"),  # code into the segment's employee dictionary, -1 if unknown
+    "focus_session_length_minutes": np.dtype("<f4"),
+    "break_frequency_per_hour": np.dtype("<f4"),
+    "after_hours_activity_minutes": np.dtype("<f4"),
+    "communication_sentiment_score": np.dtype("<f4"),
+}
+FEATURE_COLUMNS = ("focus_session_length_minutes", "break_frequency_per_hour",
+                   "after_hours_activity_minutes", "communication_sentiment_score")
+DICTIONARY_COLUMNS = ("department", "wellness_label", "employee")
+PARTITION_PREFIX = "day="
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def to_micros(timestamp: datetime) -> int:
+    """Microseconds since the epoch; naive datetimes are taken to be UTC."""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return (timestamp - _EPOCH) // timedelta(microseconds=1)
+
+def from_micros(micros: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(micros))
+
+def _partition_name(day: date) -> str:
+    return f"{PARTITION_PREFIX}{day.isoformat()}"
+
+def _write_json_atomic(path: str, data: Dict):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+class _SegmentWriter:
+    """Appends rows for one day to one segment, growing its dictionaries as needed."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.rows = 0
+        self.codes = {name: {} for name in DICTIONARY_COLUMNS}
+        if os.path.exists(os.path.join(path, "meta.json")):
+            self._resume()
+
+    def _resume(self):
+        """Continue an existing segment, dropping anything written after its last commit."""
+        segment = Segment(None, self.path)
+        self.rows = segment.rows
+        for name, dtype in COLUMNS.items():
+            column_path = os.path.join(self.path, f"{name}.bin")
+            with open(column_path, "ab") as f:
+                f.truncate(self.rows * dtype.itemsize)
+        for name in DICTIONARY_COLUMNS:
+            values = segment.dictionary(name)
+            self.codes[name] = {value: code for code, value in enumerate(values)}
+            dictionary_path = os.path.join(self.path, f"{name}.dict")
+            if values or os.path.exists(dictionary_path):
+                with open(dictionary_path, "w") as f:
+                    f.write("".join(json.dumps(value) + "\n" for value in values))
+
+    def _encode(self, name: str, values: Sequence[str], dtype) -> np.ndarray:
+        """
+        Encode values with the column's dictionary, adding new values to it.
+        If the codes would not fit in dtype, the dictionary is left as it was.
+        """
+        codes = self.codes[name]
+        max_code = np.iinfo(dtype).max
+        new_values = []
+        encoded = np.empty(len(values), dtype=dtype)
+        for i, value in enumerate(values):
+            if value is None:
+                encoded[i] = -1
+                continue
+            code = codes.get(value)
+            if code is None:
+                if len(codes) > max_code:
+                    for new_value in new_values:
+                        del codes[new_value]
+                    raise ValueError(f"Too many distinct {name} values for one segment.")
+                code = codes[value] = len(codes)
+                new_values.append(value)
+            encoded[i] = code
+        if new_values:
+            with open(os.path.join(self.path, f"{name}.dict"), "a") as f:
+                f.write("".join(json.dumps(value) + "\n" for value in new_values))
+        return encoded
+
+    def append(self, rows: List[tuple]):
+        """Append (micros, department, label, employee_id, *features) rows and commit them."""
+        columns = list(zip(*rows))
+        arrays = {
+            "timestamp": np.asarray(columns[0], dtype=COLUMNS["timestamp"]),
+            "department": self._encode("department", columns[1], COLUMNS["department"]),
+            "wellness_label": self._encode("wellness_label", columns[2], COLUMNS["wellness_label"]),
+            "employee": self._encode("employee", columns[3], COLUMNS["employee"]),
+        }
+        for name, values in zip(FEATURE_COLUMNS, columns[4:]):
+            arrays[name] = np.asarray(values, dtype=COLUMNS[name])
+
+        for name, array in arrays.items():
+            with open(os.path.join(self.path, f"{name}.bin"), "ab") as f:
+                f.write(array.tobytes())
+        self.rows += len(rows)
+        _write_json_atomic(os.path.join(self.path, "meta.json"), {
+            "format_version": FORMAT_VERSION,
+            "rows": self.rows,
+            "columns": {name: dtype.str for name, dtype in COLUMNS.items()},
+            "dictionary_sizes": {name: len(codes) for name, codes in self.codes.items()},
+        })
+
+class StoreWriter:
+    """
+    Buffers predictions in memory and appends them to the store in batches,
+    from a background thread every `flush_interval` seconds and whenever
+    `flush_rows` rows are waiting. `append` only wakes the thread, so
+    callers (e.g. request handlers on an event loop) never wait for disk
+    I/O. Without the thread (flush_interval <= 0) a full buffer is flushed
+    by `append` itself. `close()` flushes what is left.
+    """
+
+    def __init__(self, root: str, flush_rows: int = 1024, flush_interval: float = 1.0):
+        self.root = root
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.segment_name = f"seg-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._buffer = []
+        self._segments = {}
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        if flush_interval > 0:
+            self._thread = threading.Thread(target=self._run, name="prediction-store-flusher", daemon=True)
+            self._thread.start()
+
+    def append(self, department: str, wellness_label: str, features: Sequence[float],
+               employee_id: Optional[str] = None, timestamp: Optional[datetime] = None):
+        """Queue one prediction. features are in FEATURE_COLUMNS order."""
+        micros = to_micros(timestamp) if timestamp is not None else time.time_ns() // 1000
+        with self._buffer_lock:
+            self._buffer.append((micros, department, wellness_label, employee_id, *features))
+            should_flush = len(self._buffer) >= self.flush_rows
+        if should_flush:
+            if self._thread is not None:
+                self._wake.set()
+            else:
+                self.flush()
+
+    def flush(self):
+        """Write every buffered row to its day's segment."""
+        with self._flush_lock:
+            with self._buffer_lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return
+            by_day = {}
+            for row in rows:
+                by_day.setdefault(from_micros(row[0]).date(), []).append(row)
+            for day, day_rows in by_day.items():
+                segment = self._segments.get(day)
+                if segment is None:
+                    segment = self._segments[day] = _SegmentWriter(
+                        os.path.join(self.root, _partition_name(day), self.segment_name))
+                segment.append(day_rows)
+            # Only the current day normally receives rows; forget older segments
+            if len(self._segments) > 2:
+                for day in sorted(self._segments)[:-2]:
+                    del self._segments[day]
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Failed to write predictions to the store: {e}")
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+class Segment:
+    """A read-only view of one committed segment."""
+
+    def __init__(self, day: date, path: str):
+        self.day = day
+        self.path = path
+        with open(os.path.join(path, "meta.json"), "r") as f:
+            meta = json.load(f)
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported prediction store format version {meta.get('format_version')} in {path}.")
+        self.rows = meta["rows"]
+        self.dictionary_sizes = meta["dictionary_sizes"]
+
+    def column(self, name: str, start: int = 0) -> np.ndarray:
+        """Memory-map rows [start, rows) of a column."""
+        dtype = COLUMNS[name]
+        if self.rows - start <= 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.path, f"{name}.bin"), dtype=dtype, mode="r",
+                         offset=start * dtype.itemsize, shape=(self.rows - start,))
+
+    def dictionary(self, name: str) -> List[str]:
+        size = self.dictionary_sizes[name]
+        if size == 0:
+            return []
+        values = []
+        with open(os.path.join(self.path, f"{name}.dict"), "r") as f:
+            for line in f:
+                values.append(json.loads(line))
+                if len(values) == size:
+                    break
+        return values
+
+class PredictionStore:
+    """Reads (and hands out writers for) a prediction store rooted at `root`."""
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def writer(self, flush_rows: int = 1024, flush_interval: float = 1.0) -> StoreWriter:
+        return StoreWriter(self.root, flush_rows, flush_interval)
+
+    def days(self, start: Optional[date] = None, end: Optional[date] = None) -> List[date]:
+        """The days with a partition, oldest first, optionally limited to [start, end]."""
+        if not os.path.isdir(self.root):
+            return []
+        days = []
+        for name in os.listdir(self.root):
+            if not name.startswith(PARTITION_PREFIX):
+                continue
+            day = date.fromisoformat(name[len(PARTITION_PREFIX):])
+            if (start is None or day >= start) and (end is None or day <= end):
+                days.append(day)
+        return sorted(days)
+
+    def segments(self, day: date) -> List[Segment]:
+        partition = os.path.join(self.root, _partition_name(day))
+        segments = []
+        for name in sorted(os.listdir(partition)):
+            path = os.path.join(partition, name)
+            if os.path.exists(os.path.join(path, "meta.json")):
+                segments.append(Segment(day, path))
+        return segments
+
+    def _segments_in_range(self, start: Optional[datetime], end: Optional[datetime],
+                           departments: Optional[Sequence[str]]) -> Iterator[tuple]:
+        """Yield (segment, mask) for each segment with rows in range; mask is None when every row matches."""
+        start_micros = to_micros(start) if start is not None else None
+        end_micros = to_micros(end) if end is not None else None
+        first_day = from_micros(start_micros).date() if start is not None else None
+        last_day = from_micros(end_micros - 1).date() if end is not None else None
+
+        for day in self.days(first_day, last_day):
+            # Only the first and last partitions can hold rows outside the range
+            needs_mask = day in (first_day, last_day)
+            for segment in self.segments(day):
+                if segment.rows == 0:
+                    continue
+                mask = None
+                if needs_mask:
+                    timestamps = segment.column("timestamp")
+                    mask = np.ones(segment.rows, dtype=bool)
+                    if start_micros is not None:
+                        mask &= timestamps >= start_micros
+                    if end_micros is not None:
+                        mask &= timestamps < end_micros
+                if departments is not None:
+                    names = np.asarray(segment.dictionary("department"), dtype=object)
+                    wanted = np.flatnonzero(np.isin(names, list(departments)))
+                    department_mask = np.isin(segment.column("department"), wanted)
+                    mask = department_mask if mask is None else mask & department_mask
+                if mask is not None and not mask.any():
+                    continue
+                yield segment, mask
+
+    def scan(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+             columns: Sequence[str] = tuple(COLUMNS), departments: Optional[Sequence[str]] = None) -> Iterator[Dict]:
+        """
+        Yield the predictions with start <= timestamp < end, one chunk per
+        segment. A chunk maps each requested column to an array; department,
+        wellness_label and employee are decoded to strings (None for a missing
+        employee id). Chunks also carry the partition's "day".
+        """
+        for segment, mask in self._segments_in_range(start, end, departments):
+            chunk = {"day": segment.day}
+            for name in columns:
+                values = segment.column(name)
+                if name in DICTIONARY_COLUMNS:
+                    dictionary = np.asarray(segment.dictionary(name) + [None], dtype=object)
+                    # Missing employees are stored as -1, which indexes the trailing None
+                    values = dictionary[values]
+                chunk[name] = values[mask] if mask is not None else np.asarray(values)
+            yield chunk
+
+    def rollup(self, start: Optional[datetime] = None, end: Optional[datetime] = None, freq: str = "day",
+               departments: Optional[Sequence[str]] = None) -> List[Dict]:
+        """
+        Downsample predictions to one row per period and department: the
+        prediction count, the count of each wellness label and the mean of
+        each feature. freq is "day" or "week" (weeks start on Monday).
+        Rows are ordered by period, then department.
+        """
+        if freq not in ("day", "week"):
+            raise ValueError("freq must be 'day' or 'week'.")
+        groups = {}
+        for segment, mask in self._segments_in_range(start, end, departments):
+            day = segment.day
+            period = day - timedelta(days=day.weekday()) if freq == "week" else day
+            # Every row in a segment shares its partition's day, so only departments need grouping.
+            # Grouping works on the dictionary codes; names are only looked up per group.
+            department_names = segment.dictionary("department")
+            label_names = segment.dictionary("wellness_label")
+            department_codes = segment.column("department")
+            label_codes = segment.column("wellness_label")
+            if mask is not None:
+                department_codes, label_codes = department_codes[mask], label_codes[mask]
+            department_codes = department_codes.astype(np.intp)
+            n_departments, n_labels = len(department_names), len(label_names)
+            counts = np.bincount(department_codes, minlength=n_departments)
+            label_counts = np.bincount(department_codes * n_labels + label_codes,
+                                       minlength=n_departments * n_labels).reshape(n_departments, n_labels)
+            feature_sums = {}
+            for name in FEATURE_COLUMNS:
+                values = segment.column(name)
+                if mask is not None:
+                    values = values[mask]
+                feature_sums[name] = np.bincount(department_codes, weights=values, minlength=n_departments)
+
+            for i in np.flatnonzero(counts):
+                group = groups.get((period, department_names[i]))
+                if group is None:
+                    group = groups[(period, department_names[i])] = {
+                        "count": 0, "label_counts": {}, "feature_sums": dict.fromkeys(FEATURE_COLUMNS, 0.0)}
+                group["count"] += int(counts[i])
+                for j in np.flatnonzero(label_counts[i]):
+                    label = label_names[j]
+                    group["label_counts"][label] = group["label_counts"].get(label, 0) + int(label_counts[i, j])
+                for name in FEATURE_COLUMNS:
+                    group["feature_sums"][name] += float(feature_sums[name][i])
+
+        rows = []
+        for (period, department), group in sorted(groups.items()):
+            row = {"period": period, "department": department, "count": group["count"],
+                   "label_counts": dict(sorted(group["label_counts"].items()))}
+            for name in FEATURE_COLUMNS:
+                row[f"mean_{name}"] = group["feature_sums"][name] / group["count"]
+            rows.append(row)
+        return rows
+
+    def tail(self) -> "StoreTail":
+        return StoreTail(self)
+
+class StoreTail:
+    """Follows a store, returning only the rows committed since the previous poll."""
+
+    def __init__(self, store: PredictionStore):
+        self.store = store
+        # Day -> segment path -> rows already returned
+        self._seen: Dict[date, Dict[str, int]] = {}
+
+    def poll(self, since: Optional[date] = None, columns: Sequence[str] = tuple(COLUMNS)) -> Iterator[Dict]:
+        """
+        Yield chunks (as in PredictionStore.scan) of rows committed since the
+        last poll, looking only at partitions from `since` onwards. What was
+        returned from earlier partitions is forgotten.
+        """
+        if since is not None:
+            for day in [d for d in self._seen if d < since]:
+                del self._seen[day]
+        for day in self.store.days(since):
+            seen_rows = self._seen.setdefault(day, {})
+            for segment in self.store.segments(day):
+                seen = seen_rows.get(segment.path, 0)
+                if segment.rows <= seen:
+                    continue
+                seen_rows[segment.path] = segment.rows
+                chunk = {"day": day}
+                for name in columns:
+                    values = np.asarray(segment.column(name, start=seen))
+                    if name in DICTIONARY_COLUMNS:
+                        values = np.asarray(segment.dictionary(name) + [None], dtype=object)[values]
+                    chunk[name] = values
+                yield chunk
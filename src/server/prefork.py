@@ -0,0 +1,127 @@
+import gc
+import os
+import signal
+import socket
+import time
+import uvicorn
+
+class PreforkServer:
+    """
+    Serves an ASGI app from several forked uvicorn worker processes.
+
+    The parent binds the listening socket and should load everything the
+    workers need before `run()` is called. Forked workers then share those
+    pages copy-on-write instead of each loading its own copy. The parent
+    supervises the workers: it replaces any that die and, on SIGTERM or
+    SIGINT, asks them to shut down gracefully, killing stragglers after
+    `graceful_timeout` seconds.
+    """
+
+    def __init__(self, app, host: str = "127.0.0.1", port: int = 8000, workers: int = 2,
+                 graceful_timeout: float = 30.0, log_level: str = "info"):
+        if workers < 1:
+            raise ValueError("workers must be at least 1.")
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+        self.children = {}
+        self.should_exit = False
+        self.shutdown_deadline = None
+
+    def bind(self) -> socket.socket:
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def spawn(self, sock: socket.socket):
+        """Fork one worker that serves the app on the shared socket."""
+        pid = os.fork()
+        if pid == 0:
+            # The worker's uvicorn server installs its own graceful-shutdown handlers
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            exit_code = 0
+            try:
+                config = uvicorn.Config(self.app, log_level=self.log_level,
+                                        timeout_graceful_shutdown=self.graceful_timeout)
+                uvicorn.Server(config).run(sockets=[sock])
+            except BaseException as e:
+                print(f"Worker {os.getpid()} crashed: {e}")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+        self.children[pid] = time.monotonic()
+        print(f"Started worker {pid}.")
+        if self.should_exit:
+            # Shutdown began while this worker was being forked
+            os.kill(pid, signal.SIGTERM)
+
+    def handle_exit(self, signum, frame):
+        if self.should_exit:
+            return
+        self.should_exit = True
+        self.shutdown_deadline = time.monotonic() + self.graceful_timeout
+        print(f"Received {signal.Signals(signum).name}, shutting down {len(self.children)} workers...")
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def run(self):
+        sock = self.bind()
+        # Move everything loaded so far out of the garbage collector's reach, so its
+        # bookkeeping does not write to (and so copy) the shared pages in each worker
+        gc.collect()
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self.handle_exit)
+        signal.signal(signal.SIGINT, self.handle_exit)
+        for _ in range(self.workers):
+            self.spawn(sock)
+        print(f"Serving on http://{self.host}:{self.port} with {self.workers} workers (parent {os.getpid()}).")
+
+        while self.children:
+            if self.should_exit and time.monotonic() > self.shutdown_deadline:
+                for pid in list(self.children):
+                    print(f"Worker {pid} did not stop in time, killing it.")
+                    try:
+                        os.kill(pid, signal.SIGKILL)
+                    except ProcessLookupError:
+                        pass
+                self.shutdown_deadline = float("inf")
+
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(0.1)
+                continue
+
+            started_at = self.children.pop(pid, None)
+            if not self.should_exit:
+                print(f"Worker {pid} exited unexpectedly, starting a replacement.")
+                # Avoid a tight respawn loop when workers crash on startup
+                if started_at is not None and time.monotonic() - started_at < 1.0:
+                    time.sleep(1.0)
+                self.spawn(sock)
+
+        sock.close()
+        print("All workers stopped.")
+
+def serve(app, host: str, port: int, workers: int, graceful_timeout: float = 30.0, log_level: str = "info"):
+    """Serve the app with `workers` pre-forked processes, or in-process for a single worker."""
+    if workers <= 1 or not hasattr(os, "fork"):
+        if workers > 1:
+            print("Pre-fork serving needs os.fork; falling back to a single process.")
+        uvicorn.run(app, host=host, port=port, log_level=log_level, timeout_graceful_shutdown=graceful_timeout)
+        return
+    PreforkServer(app, host, port, workers, graceful_timeout, log_level).run()
@@ -0,0 +1,301 @@
+import unittest
+import gzip
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from wsgiref.util import setup_testing_defaults
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import bottle
+import src.agent_ui.main as agent_ui
+from src.agent_ui.serving import CachedFile, precompress
+from src.agent_ui.sqlite_store import SqliteBoardStore, SqliteDatabase, SqliteGoalStore
+from src.agent_ui.storage import BoardStore, GoalStore, JsonStore
+
+def request(method, path, body=b"", headers=None):
+    """Send a request to the agent_ui app and return (status code, headers with lowercase names, body)."""
+    environ = {"REQUEST_METHOD": method, "PATH_INFO": path, "CONTENT_TYPE": "application/json",
+               "CONTENT_LENGTH": str(len(body)), "wsgi.input": io.BytesIO(body)}
+    for name, value in (headers or {}).items():
+        environ["HTTP_" + name.upper().replace("-", "_")] = value
+    setup_testing_defaults(environ)
+    started = []
+    chunks = bottle.default_app()(environ, lambda status, headers, exc_info=None: started.append((status, headers)))
+    content = b"".join(chunks)
+    status, response_headers = started[0]
+    return int(status.split()[0]), {name.lower(): value for name, value in response_headers}, content
+
+def call(method, path, payload=None):
+    """Send a JSON request to the agent_ui app and return (status code, decoded JSON body)."""
+    status, _, content = request(method, path, b"" if payload is None else json.dumps(payload).encode("utf-8"))
+    return status, json.loads(content) if content else None
+
+class TestJsonStore(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.data_dir, "goals.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def read_file(self):
+        with open(self.path) as f:
+            return json.load(f)
+
+    def test_changes_are_written_behind_and_coalesced(self):
+        """Test that changes are served from memory at once and written to disk together on flush."""
+        store = GoalStore(self.path, flush_delay=60)
+        for i in range(3):
+            store.add({"id": f"goal-{i}", "content": "Walk", "status": "active"})
+        self.assertEqual(len(json.loads(store.read_json())["goals"]), 3)
+        self.assertFalse(os.path.exists(self.path))
+
+        store.flush()
+        self.assertEqual([goal["id"] for goal in self.read_file()["goals"]], ["goal-0", "goal-1", "goal-2"])
+        # Only the data file is left behind, no temporary files
+        self.assertEqual(os.listdir(self.data_dir), ["goals.json"])
+
+    def test_goals_are_updated_and_deleted_by_id(self):
+        """Test that updates and deletes find goals by id and report missing ones."""
+        with open(self.path, "w") as f:
+            json.dump({"goals": [{"id": "a", "content": "Read", "status": "active"},
+                                 {"id": "b", "content": "Walk", "status": "active"}]}, f)
+        store = GoalStore(self.path, flush_delay=0)
+        self.assertTrue(store.update("b", status="completed"))
+        self.assertFalse(store.update("missing", status="completed"))
+        self.assertTrue(store.delete("a"))
+        self.assertFalse(store.delete("a"))
+        self.assertFalse(store.add({"id": "b", "content": "Duplicate", "status": "active"}))
+        self.assertEqual(self.read_file(), {"goals": [{"id": "b", "content": "Walk", "status": "completed"}]})
+
+    def test_concurrent_changes_are_not_lost(self):
+        """Test that goals added from many threads at once all end up in the file."""
+        store = GoalStore(self.path, flush_delay=0.01)
+
+        def add_goals(worker):
+            for i in range(50):
+                store.add({"id": f"goal-{worker}-{i}", "content": "Stretch", "status": "active"})
+
+        threads = [threading.Thread(target=add_goals, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        store.flush()
+        self.assertEqual(len(self.read_file()["goals"]), 400)
+
+    def test_unreadable_file_falls_back_to_default(self):
+        """Test that a corrupt data file is treated as the default document."""
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        store = JsonStore(self.path, {"columns": []}, flush_delay=0)
+        self.assertEqual(json.loads(store.read_json()), {"columns": []})
+
+BOARD = {"columns": [
+    {"id": "todo", "title": "To Do", "tasks": [{"id": "task-1", "content": "Plan"}, {"id": "task-2", "content": "Write"}]},
+    {"id": "done", "title": "Done", "tasks": [{"id": "task-3", "content": "Review"}]},
+]}
+
+class TestSqliteStore(unittest.TestCase):
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.board_file = os.path.join(self.data_dir, "kanban_board.json")
+        self.goals_file = os.path.join(self.data_dir, "goals.json")
+        with open(self.board_file, "w") as f:
+            json.dump(BOARD, f)
+        with open(self.goals_file, "w") as f:
+            json.dump({"goals": [{"id": "goal-1", "content": "Walk", "status": "active"}]}, f)
+        self.db = SqliteDatabase(os.path.join(self.data_dir, "agent_ui.db"))
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_json_files_are_migrated_once(self):
+        """Test that the JSON data is imported on first use and not again after it changes."""
+        self.assertTrue(self.db.migrate_from_json(self.board_file, self.goals_file))
+        self.assertEqual(json.loads(SqliteBoardStore(self.db).read_json()), dict(BOARD, version=0))
+        goals = SqliteGoalStore(self.db)
+        self.assertEqual(json.loads(goals.read_json())["goals"][0]["content"], "Walk")
+
+        goals.delete("goal-1")
+        self.assertFalse(self.db.migrate_from_json(self.board_file, self.goals_file))
+        self.assertEqual(json.loads(goals.read_json()), {"goals": []})
+
+    def test_moving_a_card_writes_only_the_changed_rows(self):
+        """Test that saving a board with one card moved to the end of another column writes just that card (and the version)."""
+        self.db.migrate_from_json(self.board_file, self.goals_file)
+        board = json.loads(json.dumps(BOARD))
+        board["columns"][1]["tasks"].append(board["columns"][0]["tasks"].pop(1))
+        conn = self.db.connection()
+        before = conn.total_changes
+        SqliteBoardStore(self.db).replace(board)
+        self.assertEqual(conn.total_changes - before, 2)
+        self.assertEqual(json.loads(SqliteBoardStore(self.db).read_json()), dict(board, version=1))
+
+    def test_goals_are_found_by_id(self):
+        """Test that goal updates and deletes report missing goals and keep insertion order."""
+        goals = SqliteGoalStore(self.db)
+        for goal_id in ("b", "a"):
+            self.assertTrue(goals.add({"id": goal_id, "content": "Stretch", "status": "active"}))
+        self.assertFalse(goals.add({"id": "a", "content": "Duplicate", "status": "active"}))
+        self.assertTrue(goals.update("a", status="completed"))
+        self.assertFalse(goals.update("missing", status="completed"))
+        self.assertFalse(goals.delete("missing"))
+        self.assertEqual(json.loads(goals.read_json())["goals"], [
+            {"id": "b", "content": "Stretch", "status": "active"},
+            {"id": "a", "content": "Stretch", "status": "completed"},
+        ])
+
+class TestAgentUIRoutes(unittest.TestCase):
+
+    def open_stores(self):
+        return BoardStore(os.path.join(self.data_dir, "kanban_board.json")), GoalStore(os.path.join(self.data_dir, "goals.json"))
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.original_stores = agent_ui.BOARD_STORE, agent_ui.GOAL_STORE
+        agent_ui.BOARD_STORE, agent_ui.GOAL_STORE = self.open_stores()
+
+    def tearDown(self):
+        agent_ui.BOARD_STORE.flush()
+        agent_ui.GOAL_STORE.flush()
+        agent_ui.BOARD_STORE, agent_ui.GOAL_STORE = self.original_stores
+        shutil.rmtree(self.data_dir)
+
+    def test_goal_lifecycle(self):
+        """Test that goals can be added, updated, listed and deleted through the API."""
+        status, goal = call("POST", "/api/goals", {"content": "Drink water"})
+        self.assertEqual(status, 201)
+        self.assertEqual(call("PUT", f"/api/goals/{goal['id']}", {"status": "completed"})[0], 200)
+        self.assertEqual(call("GET", "/api/goals")[1]["goals"], [dict(goal, status="completed")])
+        self.assertEqual(call("DELETE", f"/api/goals/{goal['id']}")[0], 200)
+        self.assertEqual(call("DELETE", f"/api/goals/{goal['id']}")[0], 404)
+        self.assertEqual(call("POST", "/api/goals", {})[0], 400)
+
+    def test_board_is_saved_and_served(self):
+        """Test that a posted board is returned by later reads with its version."""
+        self.assertEqual(call("POST", "/api/board", BOARD), (200, {"status": "success", "version": 1}))
+        self.assertEqual(call("GET", "/api/board")[1], dict(BOARD, version=1))
+        status, body = call("POST", "/api/board", dict(BOARD, version=0))
+        self.assertEqual((status, body["version"]), (409, 1))
+
+    def test_malformed_boards_are_rejected(self):
+        """Test that a board that is not an object, or whose columns or tasks lack ids, is rejected and changes nothing."""
+        call("POST", "/api/board", BOARD)
+        for board in ([BOARD], "board", {"columns": {"todo": []}}, {"columns": ["todo"]},
+                      {"columns": [{"title": "No id"}]}, {"columns": [{"id": "todo", "tasks": [{"content": "No id"}]}]}):
+            status, body = call("POST", "/api/board", board)
+            self.assertEqual((status, body["status"]), (400, "error"), board)
+        self.assertEqual(call("POST", "/api/board", [BOARD])[1]["message"], "The board must be an object.")
+        self.assertEqual(call("PATCH", "/api/board", [{"op": "delete_card", "card_id": "task-1"}])[0], 400)
+        self.assertEqual(call("GET", "/api/board")[1], dict(BOARD, version=1))
+
+    def test_card_operations(self):
+        """Test that card operations change just those cards and bump the board version."""
+        call("POST", "/api/board", BOARD)
+        status, body = call("PATCH", "/api/board", {"version": 1, "operations": [
+            {"op": "move_card", "card_id": "task-2", "column_id": "done", "position": 0},
+            {"op": "add_card", "column_id": "todo", "card": {"content": "Test"}},
+            {"op": "update_card", "card_id": "task-3", "fields": {"content": "Review again"}},
+            {"op": "delete_card", "card_id": "task-1"},
+        ]})
+        self.assertEqual(status, 200)
+        self.assertEqual(body["version"], 2)
+        added = body["added"][0]
+        board = call("GET", "/api/board")[1]
+        self.assertEqual(board, {"version": 2, "columns": [
+            {"id": "todo", "title": "To Do", "tasks": [{"id": added, "content": "Test"}]},
+            {"id": "done", "title": "Done", "tasks": [{"id": "task-2", "content": "Write"},
+                                                      {"id": "task-3", "content": "Review again"}]},
+        ]})
+
+    def test_failed_operations_change_nothing(self):
+        """Test that a stale version or an invalid operation leaves the whole board unchanged."""
+        call("POST", "/api/board", BOARD)
+        operations = [{"op": "move_card", "card_id": "task-1", "column_id": "done"},
+                      {"op": "update_card", "card_id": "missing", "fields": {"content": "?"}}]
+        self.assertEqual(call("PATCH", "/api/board", {"operations": operations})[0], 400)
+        self.assertEqual(call("PATCH", "/api/board", {"operations": [{"op": "rename_board"}]})[0], 400)
+        status, body = call("PATCH", "/api/board", {"version": 0, "operations": operations[:1]})
+        self.assertEqual((status, body["version"]), (409, 1))
+        self.assertEqual(call("GET", "/api/board")[1], dict(BOARD, version=1))
+
+class TestAgentUIRoutesWithSqlite(TestAgentUIRoutes):
+
+    def open_stores(self):
+        db = SqliteDatabase(os.path.join(self.data_dir, "agent_ui.db"))
+        return SqliteBoardStore(db), SqliteGoalStore(db)
+
+class TestStaticServing(unittest.TestCase):
+
+    def setUp(self):
+        self.dist = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.dist, "assets"))
+        self.script = b"console.log('wellness');\n" * 200
+        self.files = {"index.html": b"<html><body><div id='root'></div></body></html>\n" * 40,
+                      "assets/index-Bx3kQ9aZ.js": self.script,
+                      "assets/small-Ck82jsQ1.css": b"body{margin:0}",
+                      "assets/logo-Dk3_a9Qe.png": b"png",
+                      "assets/favicon.ico": b"ico",
+                      "vite.svg": b"<svg></svg>",
+                      "apple-touch-icon.png": b"png",
+                      "android-chrome-192x192.png": b"png",
+                      "site-manifest.json": b"{}"}
+        for name, content in self.files.items():
+            with open(os.path.join(self.dist, name), "wb") as f:
+                f.write(content)
+        self.original = agent_ui.FRONTEND_PATH, agent_ui.ASSETS_PATH, agent_ui.INDEX_FILE
+        agent_ui.FRONTEND_PATH = self.dist
+        agent_ui.ASSETS_PATH = os.path.join(self.dist, "assets")
+        agent_ui.INDEX_FILE = CachedFile(os.path.join(self.dist, "index.html"))
+
+    def tearDown(self):
+        agent_ui.FRONTEND_PATH, agent_ui.ASSETS_PATH, agent_ui.INDEX_FILE = self.original
+        shutil.rmtree(self.dist)
+
+    def test_hashed_assets_are_precompressed_and_cached_long(self):
+        """Test that hashed assets are sent gzipped to clients that accept it, with a year-long cache lifetime."""
+        self.assertEqual(precompress(self.dist), 2)
+        self.assertEqual(precompress(self.dist), 0)
+        self.assertFalse(os.path.exists(os.path.join(self.dist, "assets", "small-Ck82jsQ1.css.gz")))
+
+        status, headers, body = request("GET", "/assets/index-Bx3kQ9aZ.js", headers={"Accept-Encoding": "gzip, br;q=0"})
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["content-encoding"], "gzip")
+        self.assertIn("javascript", headers["content-type"])
+        self.assertIn("immutable", headers["cache-control"])
+        self.assertEqual(gzip.decompress(body), self.script)
+
+        status, headers, body = request("GET", "/assets/index-Bx3kQ9aZ.js")
+        self.assertNotIn("content-encoding", headers)
+        self.assertEqual(body, self.script)
+
+    def test_index_is_served_from_memory_for_client_routes(self):
+        """Test that client-side routes get index.html, revalidated with its ETag, while root files are served as they are."""
+        status, headers, body = request("GET", "/goals", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(status, 200)
+        self.assertEqual(headers["cache-control"], "no-cache")
+        self.assertEqual(gzip.decompress(body), self.files["index.html"])
+        status, _, body = request("GET", "/", headers={"Accept-Encoding": "gzip", "If-None-Match": headers["etag"]})
+        self.assertEqual((status, body), (304, b""))
+
+        self.assertEqual(request("GET", "/vite.svg")[2], self.files["vite.svg"])
+
+    def test_only_hashed_assets_are_immutable(self):
+        """Test that root files and unhashed assets are revalidated, even when their names look like they carry a hash."""
+        self.assertIn("immutable", request("GET", "/assets/logo-Dk3_a9Qe.png")[1]["cache-control"])
+        for path in ("/apple-touch-icon.png", "/android-chrome-192x192.png", "/site-manifest.json", "/vite.svg",
+                     "/assets/favicon.ico"):
+            status, headers, body = request("GET", path)
+            self.assertEqual(status, 200)
+            self.assertEqual(headers["cache-control"], "no-cache", path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.management_dashboard.aggregation import WellnessAggregator
+
+class TestWellnessAggregator(unittest.TestCase):
+
+    def setUp(self):
+        """Create an aggregator whose clock the tests control."""
+        self.today = date(2024, 3, 31)
+        self.aggregator = WellnessAggregator(window_days=30, today=lambda: self.today)
+
+    def at(self, days_ago):
+        day = self.today - timedelta(days=days_ago)
+        return datetime(day.year, day.month, day.day, 12, tzinfo=timezone.utc)
+
+    def test_department_scores_and_headcounts(self):
+        """Test that scores average the label scores and headcount counts distinct employees, not unattributed predictions."""
+        self.aggregator.record("sales", "Healthy", 50, self.at(0), employee_id="a")
+        self.aggregator.record("sales", "Burnout", 20, self.at(1), employee_id="a")
+        self.aggregator.record("sales", "Stressed", 35, self.at(2), employee_id="b")
+        for _ in range(10):
+            self.aggregator.record("hr", "Healthy", 60, self.at(0))
+
+        departments = {row["name"]: row for row in self.aggregator.departments()}
+        self.assertEqual(departments["Sales"], {"name": "Sales", "score": 50, "headcount": 2})
+        self.assertEqual(departments["Human Resources"], {"name": "Human Resources", "score": 100, "headcount": 0})
+        self.assertEqual([row["name"] for row in self.aggregator.departments()], ["Human Resources", "Sales"])
+
+    def test_kpis_and_heatmap(self):
+        """Test the organization score, at-risk count, week-over-week trend and heatmap points."""
+        for _ in range(3):
+            self.aggregator.record("sales", "Burnout", 20, self.at(1))
+        self.aggregator.record("sales", "Healthy", 50, self.at(1))
+        self.aggregator.record("hr", "Healthy", 50, self.at(10))
+
+        kpis = self.aggregator.kpis()
+        self.assertEqual(kpis["overall_score"], 40)
+        self.assertEqual(kpis["departments_at_risk"], 1)
+        # Last week averaged 25, the week before averaged 100
+        self.assertEqual(kpis["positive_trend"], "-75%")
+
+        sales = [point for point in self.aggregator.heatmap() if point["label"] == "Sales"][0]
+        self.assertEqual(sales, {"x": 75, "y": 55, "r": 0, "label": "Sales"})
+
+    def test_old_days_leave_the_window(self):
+        """Test that predictions older than the window are dropped from every aggregate."""
+        self.aggregator.record("sales", "Burnout", 20, self.at(29), employee_id="a")
+        self.aggregator.record("sales", "Healthy", 50, self.at(0), employee_id="a")
+        self.assertFalse(self.aggregator.record("sales", "Healthy", 50, self.at(30)))
+        self.assertEqual(self.aggregator.departments()[0]["score"], 50)
+        self.assertEqual(len(self.aggregator.trends()), 2)
+
+        self.today += timedelta(days=1)
+        self.assertEqual(self.aggregator.departments(), [{"name": "Sales", "score": 100, "headcount": 1}])
+        self.assertEqual(self.aggregator.trends(), [{"date": self.today - timedelta(days=1), "score": 100}])
+
+        self.today += timedelta(days=30)
+        self.assertEqual(self.aggregator.departments(), [])
+        self.assertEqual(self.aggregator.kpis()["overall_score"], 0)
+
+    def test_trends_are_daily_averages_in_order(self):
+        """Test that the trend series has one point per day with predictions, oldest first."""
+        self.aggregator.record("sales", "Healthy", 50, self.at(0))
+        self.aggregator.record("hr", "Stressed", 50, self.at(3))
+        self.aggregator.record("hr", "Burnout", 50, self.at(3))
+        self.assertEqual(self.aggregator.trends(), [
+            {"date": self.today - timedelta(days=3), "score": 25},
+            {"date": self.today, "score": 100},
+        ])
+
+    def test_unknown_label_is_rejected(self):
+        """Test that labels the model does not produce raise a ValueError."""
+        with self.assertRaises(ValueError):
+            self.aggregator.record("sales", "Fine", 50)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import asyncio
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.server.batching import MicroBatcher
+
+class TestMicroBatcher(unittest.TestCase):
+
+    def test_concurrent_requests_are_coalesced(self):
+        """Test that concurrent submissions share a batch and each caller gets its own result."""
+        batch_sizes = []
+
+        def double(items):
+            batch_sizes.append(len(items))
+            return [item * 2 for item in items]
+
+        async def run():
+            batcher = MicroBatcher(double, max_batch_size=64, max_wait_ms=50)
+            await batcher.start()
+            try:
+                return await asyncio.gather(*(batcher.submit(i) for i in range(20)))
+            finally:
+                await batcher.stop()
+
+        results = asyncio.run(run())
+        self.assertEqual(results, [i * 2 for i in range(20)])
+        self.assertEqual(sum(batch_sizes), 20)
+        self.assertLess(len(batch_sizes), 20)
+
+    def test_max_batch_size_is_respected(self):
+        """Test that no batch exceeds max_batch_size."""
+        batch_sizes = []
+
+        def identity(items):
+            batch_sizes.append(len(items))
+            return items
+
+        async def run():
+            batcher = MicroBatcher(identity, max_batch_size=4, max_wait_ms=20)
+            await batcher.start()
+            try:
+                return await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+            finally:
+                await batcher.stop()
+
+        self.assertEqual(asyncio.run(run()), list(range(10)))
+        self.assertLessEqual(max(batch_sizes), 4)
+
+    def test_batch_errors_reach_every_caller(self):
+        """Test that an exception raised by batch_fn is propagated to all waiting callers."""
+        def fail(items):
+            raise ValueError("boom")
+
+        async def run():
+            batcher = MicroBatcher(fail, max_wait_ms=10)
+            await batcher.start()
+            try:
+                return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+            finally:
+                await batcher.stop()
+
+        results = asyncio.run(run())
+        self.assertEqual(len(results), 3)
+        for result in results:
+            self.assertIsInstance(result, ValueError)
+
+    def test_submit_requires_running_batcher(self):
+        """Test that submitting to a stopped batcher fails fast instead of hanging."""
+        async def run():
+            batcher = MicroBatcher(lambda items: items)
+            await batcher.submit(1)
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(run())
+
+if __name__ == '__main__':
+    unittest.main()
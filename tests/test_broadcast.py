@@ -0,0 +1,98 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+from datetime import date
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import src.management_dashboard.server as dashboard_server
+from src.management_dashboard.aggregation import WellnessAggregator
+from src.management_dashboard.broadcast import Broadcaster
+from src.management_dashboard.snapshot import SnapshotCache
+
+def parse_event(event: bytes):
+    """Split a server-sent event into its event name and decoded data."""
+    fields = dict(line.split(": ", 1) for line in event.decode("utf-8").strip().split("\n"))
+    return fields["event"], json.loads(fields["data"])
+
+class TestBroadcaster(unittest.TestCase):
+
+    def setUp(self):
+        self.aggregator = WellnessAggregator(today=lambda: date(2024, 3, 10))
+        self.snapshots = SnapshotCache(self.aggregator)
+        self.aggregator.record("sales", "Healthy", 50, employee_id="e1")
+        self.aggregator.record("hr", "Stressed", 30, employee_id="e2")
+
+    def test_clients_get_a_snapshot_then_deltas(self):
+        """Test that a new client starts from the full snapshot and then receives only what changed."""
+        async def run():
+            broadcaster = Broadcaster()
+            broadcaster.publish(self.snapshots.refresh())
+            queue = broadcaster.subscribe()
+            name, snapshot = parse_event(queue.get_nowait())
+            self.assertEqual(name, "snapshot")
+            self.assertEqual([row["name"] for row in snapshot["departments"]], ["Sales", "Human Resources"])
+
+            self.aggregator.record("sales", "Burnout", 20, employee_id="e3")
+            self.assertEqual(broadcaster.publish(self.snapshots.refresh()), 1)
+            name, delta = parse_event(queue.get_nowait())
+            self.assertEqual(name, "delta")
+            self.assertEqual(delta["departments"], {"upsert": [{"name": "Sales", "score": 50, "headcount": 2}],
+                                                    "remove": []})
+            self.assertEqual(delta["kpis"]["overall_score"], 50)
+            self.assertEqual(delta["trends"]["upsert"], [{"date": "2024-03-10", "score": 50}])
+
+            # A refresh with nothing new sends nothing
+            broadcaster.publish(self.snapshots.refresh())
+            self.assertTrue(queue.empty())
+        asyncio.run(run())
+
+    def test_deltas_are_encoded_once_for_all_clients(self):
+        """Test that every client receives the same encoded event."""
+        async def run():
+            broadcaster = Broadcaster()
+            broadcaster.publish(self.snapshots.refresh())
+            queues = [broadcaster.subscribe() for _ in range(3)]
+            for queue in queues:
+                queue.get_nowait()
+            self.aggregator.record("support", "Healthy", 40)
+            broadcaster.publish(self.snapshots.refresh())
+            events = [queue.get_nowait() for queue in queues]
+            self.assertTrue(all(event is events[0] for event in events))
+        asyncio.run(run())
+
+    def test_slow_client_is_disconnected(self):
+        """Test that a client that falls more than queue_size events behind has its stream ended."""
+        async def run():
+            broadcaster = Broadcaster(queue_size=2)
+            broadcaster.publish(self.snapshots.refresh())
+            queue = broadcaster.subscribe()
+            for i in range(4):
+                self.aggregator.record("sales", "Healthy", 50, employee_id=f"x{i}")
+                broadcaster.publish(self.snapshots.refresh())
+            self.assertEqual(broadcaster.clients, 0)
+            events = []
+            while not queue.empty():
+                events.append(queue.get_nowait())
+            self.assertIsNone(events[-1])
+        asyncio.run(run())
+
+    def test_stream_sends_heartbeats_and_ends_on_close(self):
+        """Test that the live feed starts with a snapshot, keeps idle connections alive and ends on shutdown."""
+        async def run():
+            broadcaster = Broadcaster()
+            broadcaster.publish(self.snapshots.refresh())
+            stream = dashboard_server.stream_events(broadcaster, heartbeat=0.01)
+            self.assertEqual(parse_event(await stream.__anext__())[0], "snapshot")
+            self.assertEqual(await stream.__anext__(), b": keep-alive\n\n")
+            broadcaster.close()
+            with self.assertRaises(StopAsyncIteration):
+                while True:
+                    await stream.__anext__()
+            self.assertEqual(broadcaster.clients, 0)
+        asyncio.run(run())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import os
+import sys
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler, LabelEncoder
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.server.bundle import write_bundle, load_bundle
+from src.server.forest import compile_forest
+
+class TestModelBundle(unittest.TestCase):
+
+    def setUp(self):
+        """Fit a small model and transformers to bundle."""
+        rng = np.random.default_rng(1)
+        X = rng.normal(size=(200, 5))
+        y = (X[:, 0] > 0).astype(int) + (X[:, 1] > 1).astype(int)
+        self.model = RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y)
+        self.scaler = StandardScaler().fit(X[:, :4])
+        self.department_encoder = LabelEncoder().fit(["sales", "engineering", "hr"])
+        self.label_encoder = LabelEncoder().fit(["Healthy", "Stressed", "Burnout"])
+        self.resource_library = {"Healthy": [{"title": "t", "description": "d", "link": "l"}]}
+        self.X_test = rng.normal(size=(50, 5))
+        self.bundle_path = "test_model_bundle.bin"
+
+    def tearDown(self):
+        """Remove the bundle file."""
+        if os.path.exists(self.bundle_path):
+            os.remove(self.bundle_path)
+
+    def write(self):
+        write_bundle(self.bundle_path, compile_forest(self.model), self.scaler, self.department_encoder,
+                     self.label_encoder, self.resource_library, ["a", "b", "c", "d", "e"])
+
+    def test_round_trip(self):
+        """Test that a loaded bundle reproduces the model, scaler and encoders."""
+        self.write()
+        artifacts = load_bundle(self.bundle_path)
+
+        np.testing.assert_array_equal(artifacts['model'].predict_proba(self.X_test), self.model.predict_proba(self.X_test))
+        np.testing.assert_array_equal(artifacts['scaler_mean'], self.scaler.mean_)
+        np.testing.assert_array_equal(artifacts['scaler_scale'], self.scaler.scale_)
+        self.assertEqual(artifacts['department_codes'], {"engineering": 0.0, "hr": 1.0, "sales": 2.0})
+        self.assertEqual(list(artifacts['label_classes']), ["Burnout", "Healthy", "Stressed"])
+        self.assertEqual(artifacts['resource_library'], self.resource_library)
+        self.assertEqual(list(artifacts['model'].feature_names_in_), ["a", "b", "c", "d", "e"])
+
+    def test_arrays_are_read_only_memory_maps(self):
+        """Test that numeric arrays are zero-copy, read-only views of the file."""
+        self.write()
+        artifacts = load_bundle(self.bundle_path)
+        for array in (artifacts['model'].threshold, artifacts['model'].children, artifacts['scaler_mean']):
+            self.assertFalse(array.flags.writeable)
+            self.assertFalse(array.flags.owndata)
+
+    def test_rejects_other_files_and_versions(self):
+        """Test that files without the bundle magic or with another format version are rejected."""
+        with open(self.bundle_path, "wb") as f:
+            f.write(b"not a bundle at all")
+        with self.assertRaises(ValueError):
+            load_bundle(self.bundle_path)
+
+        self.write()
+        with open(self.bundle_path, "r+b") as f:
+            data = f.read()
+            f.seek(0)
+            f.write(data.replace(b'"format_version": 1', b'"format_version": 9', 1))
+        with self.assertRaises(ValueError):
+            load_bundle(self.bundle_path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import os
+import sys
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.server.forest import compile_forest, save_forest, load_forest
+
+class TestCompiledForest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Train a small forest on random data to compile."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(500, 5))
+        y = np.where(X[:, 0] + X[:, 1] > 0.5, 2, np.where(X[:, 2] > 0, 1, 0))
+        cls.model = RandomForestClassifier(n_estimators=15, random_state=42).fit(X, y)
+        cls.X_test = rng.normal(size=(300, 5)) * 2
+
+    def test_predictions_match_sklearn_exactly(self):
+        """Test that probabilities and labels are bit-for-bit identical to the sklearn model."""
+        forest = compile_forest(self.model)
+        np.testing.assert_array_equal(forest.predict_proba(self.X_test), self.model.predict_proba(self.X_test))
+        np.testing.assert_array_equal(forest.predict(self.X_test), self.model.predict(self.X_test))
+
+    def test_single_row_prediction(self):
+        """Test that a single row is evaluated the same way as in a batch."""
+        forest = compile_forest(self.model)
+        self.assertEqual(forest.predict(self.X_test[:1])[0], self.model.predict(self.X_test[:1])[0])
+
+    def test_missing_values_follow_sklearn(self):
+        """Test that NaN inputs are routed the same way sklearn routes them."""
+        X = self.X_test.copy()
+        X[::7, 1] = np.nan
+        forest = compile_forest(self.model)
+        np.testing.assert_array_equal(forest.predict_proba(X), self.model.predict_proba(X))
+
+    def test_save_and_load_round_trip(self):
+        """Test that a saved and reloaded forest predicts identically."""
+        path = "test_compiled_forest.npz"
+        try:
+            save_forest(compile_forest(self.model), path)
+            forest = load_forest(path)
+            np.testing.assert_array_equal(forest.predict_proba(self.X_test), self.model.predict_proba(self.X_test))
+            self.assertEqual(forest.n_estimators, 15)
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_wrong_feature_count_is_rejected(self):
+        """Test that inputs with the wrong number of features raise a ValueError."""
+        forest = compile_forest(self.model)
+        with self.assertRaises(ValueError):
+            forest.predict(np.zeros((1, 4)))
+
+if __name__ == '__main__':
+    unittest.main()
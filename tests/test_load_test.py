@@ -0,0 +1,67 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.load_test import TARGETS, LoadStats, compare, parse_mix, summarize
+
+def report(throughput, p95, p99, error_rate=0.0, endpoints=None):
+    summary = {"requests": 100, "errors": int(error_rate * 100), "error_rate": error_rate, "throughput_rps": throughput,
+               "latency_ms": {"p50": 1.0, "p95": p95, "p99": p99}}
+    return dict(summary, endpoints=endpoints or {})
+
+class TestLoadTest(unittest.TestCase):
+
+    def test_parse_mix(self):
+        """Test that weights are normalized, default to 1, and that unknown or non-positive mixes are rejected."""
+        scenarios = TARGETS["hub"]["scenarios"]
+        self.assertEqual(parse_mix("predict=3,health", scenarios), {"predict": 0.75, "health": 0.25})
+        with self.assertRaises(ValueError):
+            parse_mix("predict=1,nope=1", scenarios)
+        with self.assertRaises(ValueError):
+            parse_mix("predict=-1,health=2", scenarios)
+        with self.assertRaises(ValueError):
+            parse_mix("predict=0", scenarios)
+
+    def test_failures_are_kept_out_of_latency_and_throughput(self):
+        """Test that failed requests are counted as errors but not in the percentiles or throughput."""
+        stats = LoadStats(["predict"])
+        for latency in (10.0, 20.0, 30.0):
+            stats.record("predict", 200, latency)
+        stats.record("predict", 0, 0.1)
+        stats.record("predict", 500, 0.2)
+        self.assertEqual(stats.status_codes, {"200": 3, "0": 1, "500": 1})
+
+        summary = summarize(stats.latencies["predict"], stats.errors["predict"], elapsed=1.0)
+        self.assertEqual(summary["requests"], 5)
+        self.assertEqual(summary["errors"], 2)
+        self.assertEqual(summary["error_rate"], 0.4)
+        self.assertEqual(summary["throughput_rps"], 3.0)
+        self.assertEqual(summary["latency_ms"]["p50"], 20.0)
+        self.assertEqual(summary["latency_ms"]["max"], 30.0)
+
+    def test_summarize_all_failed(self):
+        """Test that a run where every request failed has no latency figures."""
+        summary = summarize([], 4, elapsed=2.0)
+        self.assertEqual(summary, {"requests": 4, "errors": 4, "error_rate": 1.0, "throughput_rps": 0.0})
+
+    def test_compare(self):
+        """Test that regressions beyond the tolerance are listed overall and per request type."""
+        baseline = report(100.0, 10.0, 20.0, endpoints={"predict": report(100.0, 10.0, 20.0)})
+        self.assertEqual(compare(report(95.0, 10.5, 21.0, endpoints={"predict": report(95.0, 10.5, 21.0)}),
+                         baseline, tolerance=0.1), [])
+
+        slower = report(80.0, 12.0, 20.0, endpoints={"predict": report(100.0, 10.0, 25.0)})
+        self.assertEqual(compare(slower, baseline, tolerance=0.1), [
+            "overall: throughput 100.0 -> 80.0 req/s",
+            "overall: p95 latency 10.0 -> 12.0 ms",
+            "predict: p99 latency 20.0 -> 25.0 ms",
+        ])
+
+        failing = report(100.0, 10.0, 20.0, error_rate=0.05)
+        del failing["latency_ms"]
+        self.assertEqual(compare(failing, baseline, tolerance=0.1), ["overall: error rate 0.0 -> 0.05"])
+
+if __name__ == '__main__':
+    unittest.main()
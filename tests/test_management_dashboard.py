@@ -0,0 +1,150 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
+from fastapi.testclient import TestClient
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import src.management_dashboard.server as dashboard_server
+from src.management_dashboard.aggregation import WellnessAggregator
+from src.management_dashboard.snapshot import SnapshotCache, etag_matches
+from src.server.prediction_store import PredictionStore
+
+class TestManagementDashboardServer(unittest.TestCase):
+
+    def setUp(self):
+        """Serve a fresh, unseeded aggregator backed by an empty prediction store."""
+        self.store_dir = tempfile.mkdtemp()
+        self.original_aggregator = dashboard_server.AGGREGATOR
+        self.original_snapshots = dashboard_server.SNAPSHOTS
+        self.original_seed_path = dashboard_server.SEED_CSV_PATH
+        self.original_store_path = dashboard_server.PREDICTION_STORE_PATH
+        dashboard_server.AGGREGATOR = WellnessAggregator()
+        dashboard_server.SNAPSHOTS = SnapshotCache(dashboard_server.AGGREGATOR)
+        dashboard_server.SEED_CSV_PATH = ""
+        dashboard_server.PREDICTION_STORE_PATH = self.store_dir
+        self.client = TestClient(dashboard_server.app)
+
+    def tearDown(self):
+        dashboard_server.AGGREGATOR = self.original_aggregator
+        dashboard_server.SNAPSHOTS = self.original_snapshots
+        dashboard_server.SEED_CSV_PATH = self.original_seed_path
+        dashboard_server.PREDICTION_STORE_PATH = self.original_store_path
+        shutil.rmtree(self.store_dir)
+
+    def test_recorded_predictions_drive_the_dashboard(self):
+        """Test that recorded predictions show up in the KPI, department, heatmap and trend endpoints."""
+        records = [
+            {"department": "sales", "wellness_label": "Healthy", "focus_session_length_minutes": 50, "employee_id": "e1"},
+            {"department": "sales", "wellness_label": "Burnout", "focus_session_length_minutes": 20, "employee_id": "e2"},
+            {"department": "engineering", "wellness_label": "Healthy", "focus_session_length_minutes": 45},
+        ]
+        response = self.client.post("/api/v1/predictions", json={"records": records})
+        self.assertEqual(response.json(), {"recorded": 3, "skipped": 0})
+
+        self.assertEqual(self.client.get("/api/v1/dashboard/kpis").json()["overall_score"], 67)
+        departments = self.client.get("/api/v1/dashboard/departments").json()
+        self.assertEqual(departments, [{"name": "Engineering", "score": 100, "headcount": 0},
+                                       {"name": "Sales", "score": 50, "headcount": 2}])
+        heatmap = self.client.get("/api/v1/dashboard/heatmap").json()
+        self.assertEqual({point["label"] for point in heatmap}, {"Engineering", "Sales"})
+        trends = self.client.get("/api/v1/dashboard/trends").json()
+        self.assertEqual(len(trends), 1)
+        self.assertEqual(trends[0]["score"], 67)
+
+    def test_batch_with_unknown_label_is_rejected_whole(self):
+        """Test that a batch with an invalid label is rejected without recording any of it."""
+        records = [
+            {"department": "sales", "wellness_label": "Healthy", "focus_session_length_minutes": 50},
+            {"department": "sales", "wellness_label": "Fine", "focus_session_length_minutes": 50},
+        ]
+        response = self.client.post("/api/v1/predictions", json={"records": records})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/dashboard/departments").json(), [])
+
+    def test_aggregates_follow_the_prediction_store(self):
+        """Test that stored predictions are loaded at startup, new ones are picked up, and history is rolled up."""
+        now = datetime.now(timezone.utc)
+        writer = PredictionStore(self.store_dir).writer(flush_interval=0)
+        writer.append("sales", "Healthy", (50, 1, 10, 0.8), employee_id="e1", timestamp=now - timedelta(days=2))
+        writer.append("sales", "Burnout", (20, 0.2, 90, 0.3), employee_id="e2", timestamp=now - timedelta(days=2))
+        writer.append("hr", "Healthy", (45, 1, 10, 0.8), timestamp=now - timedelta(days=60))
+        writer.flush()
+
+        with self.client:
+            self.assertEqual(self.client.get("/api/v1/dashboard/departments").json(),
+                             [{"name": "Sales", "score": 50, "headcount": 2}])
+            writer.append("sales", "Healthy", (50, 1, 10, 0.8), employee_id="e3", timestamp=now)
+            writer.close()
+            self.assertEqual(dashboard_server.poll_store(dashboard_server.AGGREGATOR, dashboard_server.STORE_TAIL), 1)
+            dashboard_server.SNAPSHOTS.refresh()
+            self.assertEqual(self.client.get("/api/v1/dashboard/departments").json()[0]["headcount"], 3)
+
+            start = (now - timedelta(days=90)).date().isoformat()
+            history = self.client.get(f"/api/v1/dashboard/history?start={start}&end={now.date().isoformat()}&freq=week").json()
+            self.assertEqual(sum(row["count"] for row in history), 4)
+            self.assertIn("Human Resources", {row["department"] for row in history})
+            self.assertEqual(self.client.get(f"/api/v1/dashboard/history?start={start}&end={start}&freq=month").status_code, 422)
+
+    def test_combined_endpoint_and_etags(self):
+        """Test that the combined endpoint matches the sections and that unchanged snapshots are answered with 304."""
+        record = {"department": "sales", "wellness_label": "Healthy", "focus_session_length_minutes": 50}
+        self.client.post("/api/v1/predictions", json={"records": [record]})
+
+        response = self.client.get("/api/v1/dashboard")
+        self.assertEqual(response.status_code, 200)
+        dashboard = response.json()
+        for section in ("kpis", "departments", "heatmap", "trends"):
+            self.assertEqual(dashboard[section], self.client.get(f"/api/v1/dashboard/{section}").json())
+        self.assertIn("generated_at", dashboard)
+
+        etag = response.headers["etag"]
+        unchanged = self.client.get("/api/v1/dashboard", headers={"If-None-Match": etag})
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(unchanged.content, b"")
+
+        # Nothing changes until the snapshot is refreshed with the new prediction
+        self.client.post("/api/v1/predictions", json={"records": [dict(record, wellness_label="Burnout")]})
+        self.assertEqual(self.client.get("/api/v1/dashboard", headers={"If-None-Match": etag}).status_code, 304)
+        dashboard_server.SNAPSHOTS.refresh()
+        changed = self.client.get("/api/v1/dashboard", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["etag"], etag)
+        self.assertEqual(changed.json()["departments"], [{"name": "Sales", "score": 50, "headcount": 0}])
+
+    def test_snapshot_is_rebuilt_only_when_aggregates_change(self):
+        """Test that refreshing without new predictions reuses the current snapshot."""
+        snapshots = dashboard_server.SNAPSHOTS
+        first = snapshots.refresh()
+        self.assertIs(snapshots.refresh(), first)
+        dashboard_server.AGGREGATOR.record("hr", "Stressed", 30)
+        self.assertIsNot(snapshots.refresh(), first)
+        self.assertEqual(snapshots.refreshes, 2)
+        self.assertTrue(etag_matches('W/"a", "b"', '"b"'))
+        self.assertFalse(etag_matches(None, '"b"'))
+
+    def test_seed_csv_populates_the_window(self):
+        """Test that seeding from the synthetic data CSV records every row."""
+        recorded = dashboard_server.seed_from_csv(dashboard_server.AGGREGATOR, "data/synthetic_wellness_data.csv")
+        self.assertEqual(recorded, 5000)
+        # The synthetic rows carry no employee ids, so they add no headcount
+        self.assertEqual(sum(row["headcount"] for row in dashboard_server.AGGREGATOR.departments()), 0)
+        self.assertEqual(len(dashboard_server.AGGREGATOR.trends()), 30)
+
+    def test_seed_csv_is_only_loaded_without_a_store(self):
+        """Test that the seed CSV is ignored when a prediction store is configured, so synthetic rows never mix with real ones."""
+        dashboard_server.SEED_CSV_PATH = "data/synthetic_wellness_data.csv"
+        with self.client:
+            self.assertEqual(self.client.get("/api/v1/dashboard/departments").json(), [])
+
+        dashboard_server.PREDICTION_STORE_PATH = ""
+        dashboard_server.AGGREGATOR = WellnessAggregator()
+        dashboard_server.SNAPSHOTS = SnapshotCache(dashboard_server.AGGREGATOR)
+        with self.client:
+            self.assertEqual(len(self.client.get("/api/v1/dashboard/departments").json()), 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import os
+import sys
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.server.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+class TestMetrics(unittest.TestCase):
+
+    def test_counter_and_gauge_render(self):
+        """Test that counters and gauges render one sample per label set with HELP and TYPE lines."""
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests.", ("path",))
+        in_flight = registry.gauge("in_flight", "In flight.")
+        requests.inc("/a")
+        requests.inc("/a")
+        requests.inc("/b")
+        in_flight.inc()
+        in_flight.inc()
+        in_flight.dec()
+
+        text = registry.render()
+        self.assertIn("# HELP requests_total Requests.\n# TYPE requests_total counter\n", text)
+        self.assertIn('requests_total{path="/a"} 2\n', text)
+        self.assertIn('requests_total{path="/b"} 1\n', text)
+        self.assertIn("# TYPE in_flight gauge\nin_flight 1\n", text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test that histogram buckets count every observation at or below their bound."""
+        histogram = Histogram("latency_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value, "predict")
+
+        lines = histogram.samples()
+        self.assertIn('latency_seconds_bucket{stage="predict",le="0.1"} 2', lines)
+        self.assertIn('latency_seconds_bucket{stage="predict",le="1.0"} 3', lines)
+        self.assertIn('latency_seconds_bucket{stage="predict",le="+Inf"} 4', lines)
+        self.assertIn('latency_seconds_count{stage="predict"} 4', lines)
+        self.assertIn('latency_seconds_sum{stage="predict"} 2.65', lines)
+        self.assertEqual(histogram.count("predict"), 4)
+
+    def test_label_values_are_escaped(self):
+        """Test that quotes and backslashes in label values are escaped."""
+        counter = Counter("errors_total", "Errors.", ("reason",))
+        counter.inc('bad "value"\\')
+        self.assertEqual(counter.samples(), ['errors_total{reason="bad \\"value\\"\\\\"} 1'])
+
+    def test_wrong_label_count_is_rejected(self):
+        """Test that updates with the wrong number of labels raise a ValueError."""
+        gauge = Gauge("temperature", "Temperature.", ("room",))
+        with self.assertRaises(ValueError):
+            gauge.set(20.0)
+
+    def test_duplicate_names_are_rejected(self):
+        """Test that a registry refuses two metrics with the same name."""
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests.")
+        with self.assertRaises(ValueError):
+            registry.gauge("requests_total", "Requests.")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data_training.model_search import halving_schedule, rank, sample_candidates, successive_halving
+from src.data_training.preprocess_data import preprocess_data
+from src.data_training.synthetic_data_generator import write_dataset
+
+def result(accuracy, latency_us, nbytes):
+    return {"accuracy": accuracy, "latency_us": latency_us, "nbytes": nbytes}
+
+class TestModelSearch(unittest.TestCase):
+
+    def test_halving_schedule(self):
+        """Test that each round keeps 1/factor of the candidates on factor times the rows, ending on every row."""
+        self.assertEqual(halving_schedule(27, 90000, factor=3, min_rows=500), [(27, 10000), (9, 30000), (3, 90000)])
+        # Too little data for more rounds
+        self.assertEqual(halving_schedule(27, 2000, factor=3, min_rows=500), [(27, 666), (9, 2000)])
+        self.assertEqual(halving_schedule(1, 2000), [(1, 2000)])
+
+    def test_sample_candidates(self):
+        """Test that candidates are distinct, reproducible and capped by the grid size."""
+        space = {"n_estimators": [10, 20, 30], "max_depth": [None, 4]}
+        candidates = sample_candidates(space, 4, random_state=1)
+        self.assertEqual(len({tuple(c.items()) for c in candidates}), 4)
+        self.assertEqual(candidates, sample_candidates(space, 4, random_state=1))
+        self.assertEqual(len(sample_candidates(space, 100)), 6)
+
+    def test_rank_prefers_fast_small_models_within_tolerance(self):
+        """Test that accuracy only decides outside the tolerance, then latency, then size among equally fast models."""
+        most_accurate = result(0.960, 200, 1000)
+        fast = result(0.957, 100, 800)
+        fast_and_small = result(0.956, 105, 300)
+        slow_and_small = result(0.958, 150, 100)
+        inaccurate = result(0.900, 10, 10)
+        ranked = rank([most_accurate, fast, fast_and_small, slow_and_small, inaccurate], tolerance=0.005, latency_tolerance=0.1)
+        self.assertEqual(ranked, [fast_and_small, fast, slow_and_small, most_accurate, inaccurate])
+
+    def test_successive_halving(self):
+        """Test that the search narrows the candidates each round and picks one of the final round's."""
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            input_file = os.path.join(tmp_dir, "input.csv")
+            train_file = os.path.join(tmp_dir, "train.csv")
+            val_file = os.path.join(tmp_dir, "val.csv")
+            write_dataset(input_file, 3000, seed=2)
+            preprocess_data(input_file, train_file, val_file, os.path.join(tmp_dir, "artifacts"))
+            candidates = sample_candidates({"n_estimators": [5, 10], "max_depth": [2, 6], "min_samples_leaf": [1, 8]}, 8)
+            best, history = successive_halving(train_file, val_file, candidates, factor=2, min_rows=300, workers=1)
+            self.assertEqual([len(results) for results in history], [8, 4, 2])
+            self.assertEqual([results[0]["rows"] for results in history], [600, 1200, 2400])
+            self.assertIs(best, history[-1][0])
+            self.assertGreater(best["accuracy"], 0.8)
+
+            # Settings outside the search space apply to every candidate
+            _, limited = successive_halving(train_file, val_file, candidates, factor=2, min_rows=300, workers=1,
+                                            fixed_params={"max_leaf_nodes": 4, "max_samples": 1000})
+            # At most 4 leaves, so 7 nodes, per tree
+            for results in limited:
+                self.assertTrue(all(r["nodes"] <= 7 * r["params"]["n_estimators"] for r in results))
+
+            # A pool of workers trains the same models
+            _, pool_history = successive_halving(train_file, val_file, candidates, factor=2, min_rows=300, workers=2)
+            accuracies = lambda results: sorted((str(r["params"]), r["accuracy"]) for r in results)
+            self.assertEqual(accuracies(pool_history[0]), accuracies(history[0]))
+        finally:
+            shutil.rmtree(tmp_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import argparse
+import ast
+import os
+import shutil
+import sys
+import tempfile
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.data_training.pipeline import ArtifactCache, Stage, run_pipeline
+from scripts.run_pipeline import STAGES, pipeline_stages
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+def project_imports(path, found=None):
+    """The project modules a source file imports, directly or through other project modules, as paths."""
+    found = set() if found is None else found
+    with open(os.path.join(PROJECT_ROOT, path)) as f:
+        tree = ast.parse(f.read())
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module and node.module.startswith("src."):
+            module_path = node.module.replace(".", "/") + ".py"
+            if module_path not in found:
+                found.add(module_path)
+                project_imports(module_path, found)
+    return found
+
+# Appends a line to a run log (so the test can count runs) and writes the upper-cased input to the output
+UPPER = ("import sys; open(sys.argv[3], 'a').write('ran\\n'); "
+         "open(sys.argv[2], 'w').write(open(sys.argv[1]).read().upper() + sys.argv[4])")
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+        self.input_file = self.path("input.txt")
+        self.write(self.input_file, "hello")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir, name)
+
+    def write(self, path, text):
+        with open(path, "w") as f:
+            f.write(text)
+
+    def read(self, path):
+        with open(path) as f:
+            return f.read()
+
+    def stages(self, suffix="!"):
+        first = Stage("first", [sys.executable, "-c", UPPER, self.input_file, self.path("a.txt"), self.path("runs_first"), suffix],
+                      inputs=[self.input_file], outputs=[self.path("a.txt")])
+        second = Stage("second", [sys.executable, "-c", UPPER, self.path("a.txt"), self.path("b.txt"), self.path("runs_second"), ""],
+                       inputs=[self.path("a.txt")], outputs=[self.path("b.txt")])
+        return [first, second]
+
+    def test_unchanged_stages_are_skipped(self):
+        """Test that a second run with the same inputs and parameters runs nothing."""
+        self.assertEqual(run_pipeline(self.stages(), self.cache_dir), ["first", "second"])
+        self.assertEqual(run_pipeline(self.stages(), self.cache_dir), [])
+        self.assertEqual(self.read(self.path("b.txt")), "HELLO!")
+        self.assertEqual(self.read(self.path("runs_first")), "ran\n")
+
+    def test_changes_rerun_the_stage_and_what_depends_on_it(self):
+        """Test that changing a parameter or an input's contents reruns only the affected stages."""
+        run_pipeline(self.stages(), self.cache_dir)
+        self.assertEqual(run_pipeline(self.stages(suffix="?"), self.cache_dir), ["first", "second"])
+        self.assertEqual(self.read(self.path("b.txt")), "HELLO?")
+
+        # New contents that produce the same output: the downstream stage is still skipped
+        self.write(self.input_file, "HELLO")
+        self.assertEqual(run_pipeline(self.stages(suffix="?"), self.cache_dir), ["first"])
+        # Touching a file without changing it does not count as a change
+        os.utime(self.input_file, (0, 0))
+        self.assertEqual(run_pipeline(self.stages(suffix="?"), self.cache_dir), [])
+
+    def test_cached_outputs_are_restored(self):
+        """Test that going back to earlier parameters restores that run's outputs from the cache without running it."""
+        run_pipeline(self.stages(), self.cache_dir)
+        run_pipeline(self.stages(suffix="?"), self.cache_dir)
+        self.assertEqual(run_pipeline(self.stages(), self.cache_dir), [])
+        self.assertEqual(self.read(self.path("b.txt")), "HELLO!")
+        self.assertEqual(self.read(self.path("runs_second")), "ran\nran\n")
+
+        os.remove(self.path("a.txt"))
+        self.assertEqual(run_pipeline(self.stages(), self.cache_dir), [])
+        self.assertEqual(self.read(self.path("a.txt")), "HELLO!")
+
+    def test_force_and_missing_inputs(self):
+        """Test that force reruns every stage and that a missing input is reported."""
+        run_pipeline(self.stages(), self.cache_dir)
+        self.assertEqual(run_pipeline(self.stages(), self.cache_dir, force=True), ["first", "second"])
+        os.remove(self.input_file)
+        with self.assertRaises(FileNotFoundError):
+            run_pipeline(self.stages(), self.cache_dir)
+
+    def test_file_digests_are_content_based(self):
+        """Test that identical contents share one stored object."""
+        cache = ArtifactCache(self.cache_dir)
+        self.write(self.path("copy.txt"), "hello")
+        self.assertEqual(cache.put(self.input_file), cache.put(self.path("copy.txt")))
+        objects = [name for _, _, files in os.walk(os.path.join(self.cache_dir, "objects")) for name in files]
+        self.assertEqual(len(objects), 1)
+
+class TestPipelineStages(unittest.TestCase):
+
+    def test_stages_list_the_code_they_run(self):
+        """Test that each stage lists every project module its script imports, so editing one reruns the stage."""
+        args = argparse.Namespace(num_records=10, seed=1, test_size=0.2, random_state=1, chunk_size=0, data_format="csv",
+                                  n_estimators=10, max_depth=None, min_samples_leaf=None, max_samples=None, stages=STAGES)
+        for stage in pipeline_stages(args):
+            script = stage.command[1]
+            self.assertIn(script, stage.inputs)
+            self.assertEqual(project_imports(script) - set(stage.inputs), set(), stage.name)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+import numpy as np
+
+# Add the src directory to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.server.prediction_store import PredictionStore
+
+FEATURES = (35.0, 0.5, 60.0, 0.5)
+
+def at(day, hour=12):
+    return datetime(day.year, day.month, day.day, hour, tzinfo=timezone.utc)
+
+class TestPredictionStore(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.store = PredictionStore(self.root)
+        self.monday = date(2024, 3, 4)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write(self, rows, flush_rows=1024):
+        """Write (department, label, employee_id, timestamp, focus) rows with one writer."""
+        writer = self.store.writer(flush_rows=flush_rows, flush_interval=0)
+        for department, label, employee_id, timestamp, focus in rows:
+            writer.append(department, label, (focus,) + FEATURES[1:], employee_id=employee_id, timestamp=timestamp)
+        writer.close()
+
+    def test_range_scan_returns_only_rows_in_range(self):
+        """Test that a scan returns exactly the rows with start <= timestamp < end, decoded."""
+        rows = [("sales", "Healthy", f"E{i}", at(self.monday + timedelta(days=i // 4), hour=i % 4 * 6), float(i))
+                for i in range(20)]
+        self.write(rows)
+
+        start, end = at(self.monday + timedelta(days=1), hour=6), at(self.monday + timedelta(days=3), hour=12)
+        chunks = list(self.store.scan(start, end))
+        focus = np.concatenate([chunk["focus_session_length_minutes"] for chunk in chunks])
+        expected = [value for _, _, _, timestamp, value in rows if start <= timestamp < end]
+        self.assertEqual(sorted(focus.tolist()), expected)
+        employees = np.concatenate([chunk["employee"] for chunk in chunks])
+        self.assertEqual(sorted(employees.tolist()), sorted(f"E{int(i)}" for i in expected))
+        self.assertEqual(set(np.concatenate([chunk["department"] for chunk in chunks])), {"sales"})
+
+    def test_daily_and_weekly_rollups(self):
+        """Test that rollups count labels and average features per period and department."""
+        rows = [
+            ("sales", "Healthy", None, at(self.monday), 40.0),
+            ("sales", "Burnout", None, at(self.monday), 20.0),
+            ("hr", "Stressed", None, at(self.monday + timedelta(days=1)), 30.0),
+            ("sales", "Healthy", None, at(self.monday + timedelta(days=7)), 50.0),
+        ]
+        self.write(rows)
+
+        daily = self.store.rollup(freq="day")
+        self.assertEqual([(row["period"], row["department"], row["count"]) for row in daily], [
+            (self.monday, "sales", 2),
+            (self.monday + timedelta(days=1), "hr", 1),
+            (self.monday + timedelta(days=7), "sales", 1),
+        ])
+        self.assertEqual(daily[0]["label_counts"], {"Burnout": 1, "Healthy": 1})
+        self.assertAlmostEqual(daily[0]["mean_focus_session_length_minutes"], 30.0)
+
+        weekly = self.store.rollup(freq="week", departments=["sales"])
+        self.assertEqual([(row["period"], row["count"]) for row in weekly],
+                         [(self.monday, 2), (self.monday + timedelta(days=7), 1)])
+
+    def test_concurrent_writers_use_separate_segments(self):
+        """Test that two writers appending to the same day both end up in scans."""
+        first = self.store.writer(flush_interval=0)
+        second = self.store.writer(flush_interval=0)
+        first.append("sales", "Healthy", FEATURES, timestamp=at(self.monday))
+        second.append("hr", "Burnout", FEATURES, timestamp=at(self.monday))
+        first.flush()
+        second.flush()
+        first.append("sales", "Stressed", FEATURES, timestamp=at(self.monday))
+        first.close()
+        second.close()
+
+        self.assertEqual(len(self.store.segments(self.monday)), 2)
+        labels = np.concatenate([chunk["wellness_label"] for chunk in self.store.scan()])
+        self.assertEqual(sorted(labels.tolist()), ["Burnout", "Healthy", "Stressed"])
+
+    def test_tail_returns_only_new_rows(self):
+        """Test that each poll returns the rows committed since the previous one."""
+        tail = self.store.tail()
+        self.assertEqual(list(tail.poll()), [])
+        writer = self.store.writer(flush_interval=0)
+        writer.append("sales", "Healthy", FEATURES, timestamp=at(self.monday))
+        writer.flush()
+        self.assertEqual([chunk["wellness_label"].tolist() for chunk in tail.poll()], [["Healthy"]])
+        writer.append("sales", "Burnout", FEATURES, timestamp=at(self.monday))
+        writer.append("hr", "Stressed", FEATURES, timestamp=at(self.monday))
+        writer.close()
+        self.assertEqual([chunk["wellness_label"].tolist() for chunk in tail.poll()], [["Burnout", "Stressed"]])
+        self.assertEqual(list(tail.poll()), [])
+
+    def test_tail_forgets_partitions_before_since(self):
+        """Test that a tail keeps no state for the partitions it no longer follows."""
+        tail = self.store.tail()
+        self.write([("sales", "Healthy", None, at(self.monday + timedelta(days=i)), 40.0) for i in range(3)])
+        self.assertEqual(len(list(tail.poll(self.monday))), 3)
+        self.assertEqual(list(tail.poll(self.monday + timedelta(days=2))), [])
+        self.assertEqual(list(tail._seen), [self.monday + timedelta(days=2)])
+
+    def test_uncommitted_rows_are_ignored(self):
+        """Test that bytes appended past the committed row count (e.g. by a crashed writer) are not read."""
+        self.write([("sales", "Healthy", None, at(self.monday), 40.0)])
+        segment = self.store.segments(self.monday)[0]
+        with open(os.path.join(segment.path, "timestamp.bin"), "ab") as f:
+            f.write(b"\x00" * 8)
+        chunks = list(self.store.scan())
+        self.assertEqual(len(chunks[0]["timestamp"]), 1)
+
+    def test_late_rows_resume_an_existing_segment(self):
+        """Test that rows for a day the writer already wrote are appended after its committed rows."""
+        writer = self.store.writer(flush_interval=0)
+        writer.append("sales", "Healthy", FEATURES, employee_id="a", timestamp=at(self.monday))
+        writer.flush()
+        # Force the writer to reopen the Monday segment from disk
+        writer._segments.clear()
+        writer.append("hr", "Burnout", FEATURES, employee_id="b", timestamp=at(self.monday))
+        writer.close()
+
+        chunks = list(self.store.scan())
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0]["department"].tolist(), ["sales", "hr"])
+        self.assertEqual(chunks[0]["employee"].tolist(), ["a", "b"])
+
+    def test_dictionary_overflow_leaves_the_segment_usable(self):
+        """Test that a batch with more distinct values than the codes can hold is rejected without corrupting the dictionary."""
+        writer = self.store.writer(flush_interval=0)
+        writer.append("sales", "Healthy", FEATURES, timestamp=at(self.monday))
+        writer.flush()
+        for i in range(300):
+            writer.append("sales", f"label-{i}", FEATURES, timestamp=at(self.monday))
+        with self.assertRaises(ValueError):
+            writer.flush()
+        writer.append("sales", "Burnout", FEATURES, timestamp=at(self.monday))
+        writer.close()
+
+        chunks = list(self.store.scan())
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0]["wellness_label"].tolist(), ["Healthy", "Burnout"])
+
+    def test_writer_flushes_when_buffer_is_full(self):
+        """Test that rows are written once flush_rows are buffered, without waiting for close."""
+        writer = self.store.writer(flush_rows=2, flush_interval=0)
+        writer.append("sales", "Healthy", FEATURES, timestamp=at(self.monday))
+        self.assertEqual(self.store.days(), [])
+        writer.append("sales", "Healthy", FEATURES, timestamp=at(self.monday))
+        self.assertEqual(sum(segment.rows for segment in self.store.segments(self.monday)), 2)
+        writer.close()
+
+    def test_full_buffer_wakes_the_flusher_without_blocking(self):
+        """Test that a full buffer is flushed by the background thread, not by the appending caller."""
+        writer = self.store.writer(flush_rows=2, flush_interval=60)
+        # While a flush is in progress, appends must still return at once
+        with writer._flush_lock:
+            writer.append("sales", "Healthy", FEATURES, timestamp=at(self.monday))
+            writer.append("sales", "Healthy", FEATURES, timestamp=at(self.monday))
+            self.assertEqual(self.store.days(), [])
+        deadline = time.monotonic() + 5
+        while not list(self.store.scan()) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(sum(len(chunk["timestamp"]) for chunk in self.store.scan()), 2)
+        writer.close()
+
+if __name__ == '__main__':
+    unittest.main()
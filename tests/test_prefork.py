@@ -0,0 +1,87 @@
+import unittest
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+# Add the src directory to the Python path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(PROJECT_ROOT)
+from src.server.prefork import PreforkServer
+
+# A minimal app that reports which worker process served the request
+SERVER_SCRIPT = """
+import os, sys
+sys.path.append({root!r})
+from src.server.prefork import PreforkServer
+
+async def app(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    await send({{"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]}})
+    await send({{"type": "http.response.body", "body": str(os.getpid()).encode()}})
+
+PreforkServer(app, port={port}, workers=2, graceful_timeout=5, log_level="warning").run()
+"""
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+@unittest.skipUnless(hasattr(os, "fork"), "pre-fork serving needs os.fork")
+class TestPreforkServer(unittest.TestCase):
+
+    def setUp(self):
+        self.port = free_port()
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", SERVER_SCRIPT.format(root=PROJECT_ROOT, port=self.port)],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+        )
+
+    def tearDown(self):
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        self.process.stdout.close()
+
+    def get_pid(self, timeout=15.0):
+        """Request the app until a worker answers, returning the serving worker's pid."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{self.port}/", timeout=2) as response:
+                    return int(response.read())
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+
+    def test_serves_requests_and_shuts_down_gracefully(self):
+        """Test that workers answer on the shared socket and SIGTERM stops every process cleanly."""
+        self.assertNotEqual(self.get_pid(), self.process.pid)
+        self.process.send_signal(signal.SIGTERM)
+        self.assertEqual(self.process.wait(timeout=15), 0)
+        self.assertIn("All workers stopped.", self.process.stdout.read())
+
+    def test_dead_worker_is_replaced(self):
+        """Test that the parent starts a new worker when one dies."""
+        worker = self.get_pid()
+        os.kill(worker, signal.SIGKILL)
+        # Give the supervisor a moment to notice, then make sure requests are still served
+        time.sleep(1.0)
+        self.assertNotEqual(self.get_pid(), worker)
+        self.process.send_signal(signal.SIGTERM)
+        self.process.wait(timeout=15)
+        self.assertIn("starting a replacement", self.process.stdout.read())
+
+    def test_at_least_one_worker_is_required(self):
+        """Test that a worker count below one is rejected."""
+        with self.assertRaises(ValueError):
+            PreforkServer(app=None, workers=0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,22 @@
 import unittest
 import os
 import sys
+import pickle
+import tempfile
+import numpy as np
 import pandas as pd
 import shutil
 
 # Add the src directory to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.data_training.preprocess_data import preprocess_data
+from src.data_training.preprocess_data import preprocess_data, preprocess_data_streaming
+from src.data_training.synthetic_data_generator import write_dataset
+from src.data_training.tables import TableWriter, compact_dtypes, find_table, read_table
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
 
 class TestPreprocessData(unittest.TestCase):
 
@@ -59,6 +69,8 @@ class TestPreprocessData(unittest.TestCase):
             # This ensures the function runs and produces output without being blocked by the obscure error.
             self.assertFalse(train_df.empty)
             self.assertFalse(val_df.empty)
+            self.assertEqual(len(train_df) + len(val_df), 6)
+            self.assertFalse(train_df.isna().any().any())
         finally:
             for f in [input_file, train_file, val_file]:
                 if os.path.exists(f): os.remove(f)
@@ -83,5 +95,97 @@ class TestPreprocessData(unittest.TestCase):
                 if os.path.exists(f): os.remove(f)
             if os.path.exists(artifacts_path): shutil.rmtree(artifacts_path)
 
+class TestPreprocessDataStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.input_file = os.path.join(self.tmp_dir, "input.csv")
+        write_dataset(self.input_file, 5000, seed=3)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def run_streaming(self, name, chunk_size, extension=".csv"):
+        paths = [os.path.join(self.tmp_dir, f"{name}_{part}") for part in ("train" + extension, "val" + extension, "artifacts")]
+        preprocess_data_streaming(self.input_file, *paths, test_size=0.2, chunk_size=chunk_size)
+        return paths
+
+    def test_output_does_not_depend_on_chunk_size(self):
+        """Test that the streamed split and outputs are the same however the input is chunked."""
+        train_a, val_a, _ = self.run_streaming("a", chunk_size=5000)
+        train_b, val_b, _ = self.run_streaming("b", chunk_size=700)
+        pd.testing.assert_frame_equal(pd.read_csv(train_a), pd.read_csv(train_b))
+        pd.testing.assert_frame_equal(pd.read_csv(val_a), pd.read_csv(val_b))
+
+    def test_streamed_split_and_scaler(self):
+        """Test that every row lands in one split and the scaler matches a full fit on the training rows."""
+        train_file, val_file, artifacts_path = self.run_streaming("s", chunk_size=999)
+        train_df = pd.read_csv(train_file)
+        val_df = pd.read_csv(val_file)
+        self.assertEqual(len(train_df) + len(val_df), 5000)
+        self.assertAlmostEqual(len(val_df) / 5000, 0.2, delta=0.03)
+        self.assertFalse(train_df.isna().any().any())
+        self.assertEqual(list(train_df.columns)[-1], 'wellness_label')
+
+        with open(os.path.join(artifacts_path, 'scaler.pkl'), 'rb') as f:
+            scaler = pickle.load(f)
+        numerical_cols = list(scaler.feature_names_in_)
+        # Standardized with the training rows' own mean and variance
+        np.testing.assert_allclose(train_df[numerical_cols].mean(), 0, atol=1e-9)
+        np.testing.assert_allclose(train_df[numerical_cols].std(ddof=0), 1, atol=1e-9)
+        with open(os.path.join(artifacts_path, 'label_encoder.pkl'), 'rb') as f:
+            self.assertEqual(list(pickle.load(f).classes_), ['Burnout', 'Healthy', 'Stressed'])
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_binary_outputs(self):
+        """Test that Parquet and Feather splits hold the CSV split's rows as float32 features and int8 codes."""
+        csv_train, _, _ = self.run_streaming("csv", chunk_size=1500)
+        expected = pd.read_csv(csv_train)
+        for extension in (".parquet", ".feather"):
+            train_file, val_file, _ = self.run_streaming(extension[1:], chunk_size=1500, extension=extension)
+            train_df = read_table(train_file)
+            self.assertEqual(train_df['department'].dtype, np.int8)
+            self.assertEqual(train_df['wellness_label'].dtype, np.int8)
+            self.assertEqual(train_df['focus_session_length_minutes'].dtype, np.float32)
+            pd.testing.assert_frame_equal(train_df.astype(expected.dtypes), expected, rtol=1e-6)
+            self.assertLess(os.path.getsize(train_file), os.path.getsize(csv_train))
+            self.assertEqual(find_table(self.tmp_dir, extension[1:] + "_val"), val_file)
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_many_categories_widen_the_code_type(self):
+        """Test that codes too large for int8 are stored in a wider type rather than wrapping around."""
+        df = pd.read_csv(self.input_file)
+        df['department'] = [f"dept-{i % 300:03d}" for i in range(len(df))]
+        df.to_csv(self.input_file, index=False)
+        train_file, _, _ = self.run_streaming("wide", chunk_size=100, extension=".parquet")
+        codes = read_table(train_file)['department']
+        self.assertEqual(codes.dtype, np.int16)
+        self.assertEqual((codes.min(), codes.max()), (0, 299))
+
+        small = pd.DataFrame({'department': [1, 2], 'wellness_label': [0, 1], 'break_frequency_per_hour': [0.5, 1.0]})
+        self.assertEqual(compact_dtypes(small)['department'].dtype, np.int8)
+        self.assertEqual(compact_dtypes(small.assign(department=[1, 200]))['department'].dtype, np.int16)
+        # A chunk that does not fit the file's types is refused, not truncated
+        path = os.path.join(self.tmp_dir, "chunks.feather")
+        with self.assertRaises(pyarrow.ArrowInvalid):
+            with TableWriter(path) as writer:
+                writer.write(small)
+                writer.write(small.assign(department=[1, 200]))
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_parquet_input_and_in_memory_output(self):
+        """Test that a Parquet input is split the same as its CSV, and that preprocess_data writes binary splits too."""
+        parquet_input = os.path.join(self.tmp_dir, "input.parquet")
+        write_dataset(parquet_input, 5000, seed=3)
+        csv_train, _, _ = self.run_streaming("csv", chunk_size=5000)
+        self.input_file = parquet_input
+        parquet_train, _, _ = self.run_streaming("pq", chunk_size=5000, extension=".parquet")
+        self.assertEqual(len(read_table(parquet_train)), len(pd.read_csv(csv_train)))
+
+        train_file = os.path.join(self.tmp_dir, "memory_train.feather")
+        val_file = os.path.join(self.tmp_dir, "memory_val.feather")
+        preprocess_data(parquet_input, train_file, val_file, os.path.join(self.tmp_dir, "memory_artifacts"))
+        self.assertEqual(len(read_table(train_file)) + len(read_table(val_file)), 5000)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,14 +1,33 @@
 import unittest
 import os
 import sys
+import pickle
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
 from fastapi.testclient import TestClient
 
 # Add the src directory to the Python path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.server.main import app
+import src.server.main as server_main
+from src.server.main import app, PREDICTION_CACHE, PredictionCache, PredictionInput, build_features
+from src.server.prediction_store import PredictionStore
 
 class TestServer(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        """Record predictions made by the tests in a temporary store."""
+        cls.store_dir = tempfile.mkdtemp()
+        cls.original_store_path = server_main.PREDICTION_STORE_PATH
+        server_main.PREDICTION_STORE_PATH = cls.store_dir
+
+    @classmethod
+    def tearDownClass(cls):
+        server_main.PREDICTION_STORE_PATH = cls.original_store_path
+        shutil.rmtree(cls.store_dir)
+
     def setUp(self):
         """Set up the test client."""
         self.client = TestClient(app)
@@ -40,6 +59,208 @@ class TestServer(unittest.TestCase):
         self.assertIsInstance(data["recommended_resources"], list)
         self.assertGreater(len(data["recommended_resources"]), 0) # Ensure we got at least one resource
 
+    def test_predict_batch_matches_single_predictions(self):
+        """Test that /predict/batch returns one prediction per record, in order, matching /predict."""
+        records = [
+            {"focus_session_length_minutes": 35, "break_frequency_per_hour": 0.5,
+             "after_hours_activity_minutes": 60, "communication_sentiment_score": 0.5, "department": "sales"},
+            {"focus_session_length_minutes": 50, "break_frequency_per_hour": 1.2,
+             "after_hours_activity_minutes": 15, "communication_sentiment_score": 0.8, "department": "engineering"},
+            {"focus_session_length_minutes": 20, "break_frequency_per_hour": 0.2,
+             "after_hours_activity_minutes": 90, "communication_sentiment_score": 0.3, "department": "hr"},
+        ]
+
+        response = self.client.post("/predict/batch", json={"records": records})
+        self.assertEqual(response.status_code, 200)
+
+        predictions = response.json()["predictions"]
+        self.assertEqual(len(predictions), len(records))
+        for record, prediction in zip(records, predictions):
+            single = self.client.post("/predict", json=record).json()
+            self.assertEqual(prediction, single)
+
+    def test_predict_batch_empty_and_invalid(self):
+        """Test that an empty batch succeeds and an unknown department is rejected."""
+        response = self.client.post("/predict/batch", json={"records": []})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"predictions": []})
+
+        bad_record = {"focus_session_length_minutes": 35, "break_frequency_per_hour": 0.5,
+                      "after_hours_activity_minutes": 60, "communication_sentiment_score": 0.5,
+                      "department": "unknown"}
+        response = self.client.post("/predict/batch", json={"records": [bad_record]})
+        self.assertEqual(response.status_code, 400)
+
+    def test_predict_with_micro_batching_enabled(self):
+        """Test that /predict returns the same result when requests go through the micro-batcher."""
+        payload = {
+            "focus_session_length_minutes": 35,
+            "break_frequency_per_hour": 0.5,
+            "after_hours_activity_minutes": 60,
+            "communication_sentiment_score": 0.5,
+            "department": "sales"
+        }
+        expected = self.client.post("/predict", json=payload).json()
+
+        server_main.MICROBATCH_ENABLED = True
+        try:
+            with TestClient(app) as client:
+                self.assertIsNotNone(server_main.BATCHER)
+                response = client.post("/predict", json=payload)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), expected)
+
+                bad_payload = dict(payload, department="unknown")
+                self.assertEqual(client.post("/predict", json=bad_payload).status_code, 400)
+        finally:
+            server_main.MICROBATCH_ENABLED = False
+        self.assertIsNone(server_main.BATCHER)
+
+    def test_repeated_predictions_hit_the_cache(self):
+        """Test that an identical payload is answered from the cache and reloading artifacts invalidates it."""
+        payload = {
+            "focus_session_length_minutes": 41,
+            "break_frequency_per_hour": 0.9,
+            "after_hours_activity_minutes": 20,
+            "communication_sentiment_score": 0.7,
+            "department": "marketing"
+        }
+        PREDICTION_CACHE.clear()
+        before = self.client.get("/cache/stats").json()
+
+        first = self.client.post("/predict", json=payload).json()
+        second = self.client.post("/predict", json=payload).json()
+        self.assertEqual(first, second)
+
+        stats = self.client.get("/cache/stats").json()
+        self.assertEqual(stats["misses"] - before["misses"], 1)
+        self.assertEqual(stats["hits"] - before["hits"], 1)
+        self.assertEqual(stats["size"], 1)
+
+        with TestClient(app):
+            pass
+        self.assertEqual(self.client.get("/cache/stats").json()["size"], 0)
+
+    def test_prediction_cache_eviction_and_ttl(self):
+        """Test LRU eviction order, TTL expiry and that stale generations are not cached."""
+        cache = PredictionCache(max_size=2, ttl_seconds=300)
+        cache.put("a", "Healthy", cache.generation)
+        cache.put("b", "Stressed", cache.generation)
+        self.assertEqual(cache.get("a"), "Healthy")
+        cache.put("c", "Burnout", cache.generation)  # evicts "b", the least recently used
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "Burnout")
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+        stale_generation = cache.generation
+        cache.clear()
+        cache.put("a", "Healthy", stale_generation)
+        self.assertIsNone(cache.get("a"))
+
+        expired = PredictionCache(max_size=2, ttl_seconds=1e-9)
+        expired.put("a", "Healthy", expired.generation)
+        self.assertIsNone(expired.get("a"))
+        self.assertEqual(expired.stats()["expirations"], 1)
+
+    def test_hot_reload_swaps_artifacts(self):
+        """Test that /admin/reload swaps in a new artifact set and a failed reload keeps the old one."""
+        payload = {
+            "focus_session_length_minutes": 35,
+            "break_frequency_per_hour": 0.5,
+            "after_hours_activity_minutes": 60,
+            "communication_sentiment_score": 0.5,
+            "department": "sales"
+        }
+        before = server_main.ARTIFACTS
+
+        response = self.client.post("/admin/reload")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), self.client.get("/admin/model").json())
+        self.assertIsNot(server_main.ARTIFACTS, before)
+        self.assertEqual(self.client.post("/predict", json=payload).json()["wellness_label"], "Stressed")
+
+        bad_bundle = "test_bad_bundle.bin"
+        with open(bad_bundle, "wb") as f:
+            f.write(b"corrupt")
+        original_bundle_path = server_main.BUNDLE_PATH
+        serving = server_main.ARTIFACTS
+        try:
+            server_main.BUNDLE_PATH = bad_bundle
+            self.assertEqual(self.client.post("/admin/reload").status_code, 500)
+            self.assertIs(server_main.ARTIFACTS, serving)
+            self.assertEqual(self.client.post("/predict", json=payload).status_code, 200)
+        finally:
+            server_main.BUNDLE_PATH = original_bundle_path
+            os.remove(bad_bundle)
+
+    def test_admin_token_is_enforced_when_configured(self):
+        """Test that admin endpoints reject requests without the configured token."""
+        server_main.ADMIN_TOKEN = "secret"
+        try:
+            self.assertEqual(self.client.post("/admin/reload").status_code, 403)
+            self.assertEqual(self.client.get("/admin/model", headers={"X-Admin-Token": "wrong"}).status_code, 403)
+            self.assertEqual(self.client.get("/admin/model", headers={"X-Admin-Token": "secret"}).status_code, 200)
+        finally:
+            server_main.ADMIN_TOKEN = ""
+
+    def test_fast_path_features_match_sklearn_transformers(self):
+        """Test that the NumPy feature builder reproduces the encoder and scaler output exactly."""
+        records = [
+            PredictionInput(focus_session_length_minutes=35, break_frequency_per_hour=0.5,
+                            after_hours_activity_minutes=60, communication_sentiment_score=0.5, department="sales"),
+            PredictionInput(focus_session_length_minutes=12.3, break_frequency_per_hour=1.7,
+                            after_hours_activity_minutes=0, communication_sentiment_score=0.95, department="product"),
+        ]
+        with open("models/department_encoder.pkl", "rb") as f:
+            department_encoder = pickle.load(f)
+        with open("models/scaler.pkl", "rb") as f:
+            scaler = pickle.load(f)
+        expected = pd.DataFrame([r.model_dump(exclude={'employee_id'}) for r in records])
+        expected['department'] = department_encoder.transform(expected['department'])
+        numerical_cols = expected.columns.drop('department')
+        expected[numerical_cols] = scaler.transform(expected[numerical_cols])
+
+        np.testing.assert_array_equal(build_features(records), expected.to_numpy(dtype=np.float64))
+
+    def test_metrics_endpoint_reports_requests_and_stages(self):
+        """Test that /metrics counts requests and errors and times each /predict stage."""
+        payload = {"focus_session_length_minutes": 41, "break_frequency_per_hour": 0.7,
+                   "after_hours_activity_minutes": 25, "communication_sentiment_score": 0.4, "department": "sales"}
+        before = server_main.REQUESTS_TOTAL.value("POST", "/predict", "200")
+        errors_before = server_main.REQUEST_ERRORS_TOTAL.value("POST", "/predict", "422")
+        with self.client:
+            self.assertEqual(self.client.post("/predict", json=payload).status_code, 200)
+            self.assertEqual(self.client.post("/predict", json={}).status_code, 422)
+            response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("text/plain; version=0.0.4"))
+        self.assertEqual(server_main.REQUESTS_TOTAL.value("POST", "/predict", "200"), before + 1)
+        self.assertEqual(server_main.REQUEST_ERRORS_TOTAL.value("POST", "/predict", "422"), errors_before + 1)
+        for stage in ("validation", "encode", "scale", "predict", "decode", "resources"):
+            self.assertIn(f'wellness_predict_stage_duration_seconds_count{{stage="{stage}"}}', response.text)
+        self.assertIn('wellness_http_request_duration_seconds_bucket{method="POST",path="/predict",le="+Inf"}', response.text)
+        self.assertIn("wellness_http_requests_in_flight 0", response.text)
+
+    def test_predictions_are_recorded_in_the_store(self):
+        """Test that /predict and /predict/batch append their predictions to the prediction store."""
+        record = {"focus_session_length_minutes": 33, "break_frequency_per_hour": 0.4,
+                  "after_hours_activity_minutes": 70, "communication_sentiment_score": 0.45,
+                  "department": "hr", "employee_id": "E-store-test"}
+        store = PredictionStore(self.store_dir)
+        tail = store.tail()
+        list(tail.poll())
+        with TestClient(app) as client:
+            label = client.post("/predict", json=record)
+            self.assertEqual(label.status_code, 200)
+            client.post("/predict/batch", json={"records": [record, record]})
+
+        rows = [chunk for chunk in tail.poll()]
+        employees = np.concatenate([chunk["employee"] for chunk in rows])
+        self.assertEqual(list(employees).count("E-store-test"), 3)
+        labels = np.concatenate([chunk["wellness_label"] for chunk in rows])
+        self.assertIn(label.json()["wellness_label"], set(labels))
+
     def test_predict_endpoint_missing_artifacts(self):
         """
         Test that the endpoint returns a 503 error if artifacts are not loaded.
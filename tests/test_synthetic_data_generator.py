@@ -1,12 +1,21 @@
 import unittest
 import os
+import shutil
 import sys
+import tempfile
 import pandas as pd
 
 # Add the src directory to the Python path to import the module
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.data_training.synthetic_data_generator import generate_synthetic_data, save_to_csv, DEPARTMENTS, WELLNESS_PROFILES
+from src.data_training.synthetic_data_generator import (
+    generate_synthetic_data, save_to_csv, write_dataset, write_shards, DEPARTMENTS, WELLNESS_PROFILES
+)
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
 
 class TestSyntheticDataGenerator(unittest.TestCase):
 
@@ -67,5 +76,59 @@ class TestSyntheticDataGenerator(unittest.TestCase):
         # Check for the header
         self.assertEqual(list(df.columns), list(self.data[0].keys()))
 
+    def test_seed_makes_records_reproducible(self):
+        """Test that the same seed generates the same records and a different seed different ones."""
+        self.assertEqual(generate_synthetic_data(50, seed=1), generate_synthetic_data(50, seed=1))
+        self.assertNotEqual(generate_synthetic_data(50, seed=1), generate_synthetic_data(50, seed=2))
+
+    def test_profiles_shape_the_generated_values(self):
+        """Test that each label's values are drawn from its profile."""
+        df = pd.DataFrame(generate_synthetic_data(30000, seed=3))
+        means = df.groupby("wellness_label")["after_hours_activity_minutes"].mean()
+        for label, expected in (("Healthy", 15), ("Stressed", 60), ("Burnout", 90)):
+            # Clipping at 0 raises the mean a little for the Healthy profile
+            self.assertAlmostEqual(means[label], expected, delta=3)
+        self.assertAlmostEqual(df["wellness_label"].value_counts(normalize=True).min(), 1 / 3, delta=0.02)
+
+    def test_write_dataset_csv_in_chunks(self):
+        """Test that chunked CSV output has every record, matching the in-memory generator for the same seed."""
+        self.assertEqual(write_dataset(self.test_filename, 2500, seed=4, chunk_size=1000), 2500)
+        df = pd.read_csv(self.test_filename)
+        expected = pd.DataFrame(generate_synthetic_data(2500, seed=4, chunk_size=1000))
+        self.assertEqual(len(df), 2500)
+        self.assertTrue(df.equals(expected))
+
+    def test_shards_do_not_depend_on_worker_count(self):
+        """Test that sharded output is identical whether written by one process or a pool."""
+        output_dirs = [tempfile.mkdtemp(), tempfile.mkdtemp()]
+        try:
+            serial = write_shards(output_dirs[0], 2500, seed=5, shard_size=1000, workers=1, chunk_size=400)
+            parallel = write_shards(output_dirs[1], 2500, seed=5, shard_size=1000, workers=2, chunk_size=400)
+            self.assertEqual([os.path.basename(path) for path in serial], ["part-00000.csv", "part-00001.csv", "part-00002.csv"])
+            for serial_path, parallel_path in zip(serial, parallel):
+                with open(serial_path, "rb") as a, open(parallel_path, "rb") as b:
+                    self.assertEqual(a.read(), b.read())
+            shards = [pd.read_csv(path) for path in serial]
+            self.assertEqual([len(shard) for shard in shards], [1000, 1000, 500])
+            # Each shard has its own seed stream
+            self.assertFalse(shards[0].head(500).equals(shards[2]))
+        finally:
+            for output_dir in output_dirs:
+                shutil.rmtree(output_dir)
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_write_dataset_parquet(self):
+        """Test that Parquet output holds the same records as CSV output."""
+        parquet_filename = "test_synthetic_data.parquet"
+        try:
+            write_dataset(parquet_filename, 2500, seed=4, chunk_size=1000)
+            write_dataset(self.test_filename, 2500, seed=4, chunk_size=1000)
+            parquet = pd.read_parquet(parquet_filename)
+            parquet[["department", "wellness_label"]] = parquet[["department", "wellness_label"]].astype(str)
+            self.assertTrue(parquet.equals(pd.read_csv(self.test_filename)))
+        finally:
+            if os.path.exists(parquet_filename):
+                os.remove(parquet_filename)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
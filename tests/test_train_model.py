@@ -0,0 +1,93 @@
+import unittest
+import argparse
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add the project root to the Python path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scripts.train_model import parse_max_features, parse_max_samples, peak_memory_mb, train_model
+from src.data_training.preprocess_data import preprocess_data
+from src.data_training.synthetic_data_generator import write_dataset
+
+RESOURCE_LIBRARY = os.path.join(os.path.dirname(__file__), '..', 'src', 'server', 'resource_library.json')
+
+class TestTrainModel(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        input_file = os.path.join(cls.tmp_dir, "input.csv")
+        cls.train_file = os.path.join(cls.tmp_dir, "train.csv")
+        cls.val_file = os.path.join(cls.tmp_dir, "val.csv")
+        cls.artifacts_path = os.path.join(cls.tmp_dir, "artifacts")
+        write_dataset(input_file, 2000, seed=7)
+        preprocess_data(input_file, cls.train_file, cls.val_file, cls.artifacts_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir)
+
+    def models_dir(self, name):
+        """A models directory holding the preprocessing artifacts, as train_model expects."""
+        path = os.path.join(self.tmp_dir, name)
+        shutil.copytree(self.artifacts_path, path)
+        return path
+
+    def train(self, name, **params):
+        return train_model(self.train_file, self.models_dir(name), RESOURCE_LIBRARY, n_estimators=10, **params)
+
+    def test_report(self):
+        """Test that the report describes the saved model, its size and its cost."""
+        models_path = self.models_dir("report")
+        model, report = train_model(self.train_file, models_path, RESOURCE_LIBRARY, n_estimators=10, max_depth=5)
+        self.assertEqual(set(report), {"training_rows", "training_seconds", "peak_memory_mb", "n_estimators", "nodes",
+                                       "max_depth", "pickle_kib", "compiled_kib", "single_row_latency_us"})
+        self.assertEqual(report["training_rows"], 1600)
+        self.assertEqual(report["n_estimators"], 10)
+        self.assertLessEqual(report["max_depth"], 5)
+        self.assertEqual(report["nodes"], sum(tree.tree_.node_count for tree in model.estimators_))
+        self.assertEqual(report["pickle_kib"], round(os.path.getsize(os.path.join(models_path, 'wellness_model.pkl')) / 1024, 1))
+        self.assertGreater(report["compiled_kib"], 0)
+        self.assertGreater(report["training_seconds"], 0)
+        self.assertGreater(report["single_row_latency_us"], 0)
+        self.assertEqual(report["peak_memory_mb"], peak_memory_mb())
+        for name in ("wellness_model.pkl", "wellness_model.npz", "wellness_bundle.bin"):
+            self.assertTrue(os.path.exists(os.path.join(models_path, name)))
+
+    def test_parallel_training_gives_the_same_model(self):
+        """Test that the number of jobs does not change predictions, and that the saved model predicts on one thread."""
+        serial, _ = self.train("serial", n_jobs=1)
+        parallel, _ = self.train("parallel", n_jobs=2)
+        X_val = pd.read_csv(self.val_file).drop('wellness_label', axis=1)
+        np.testing.assert_array_equal(serial.predict_proba(X_val), parallel.predict_proba(X_val))
+        with open(os.path.join(self.tmp_dir, "parallel", "wellness_model.pkl"), "rb") as f:
+            self.assertIsNone(pickle.load(f).n_jobs)
+
+    def test_max_samples(self):
+        """Test that max_samples takes a fraction or a whole row count, and rejects fractional counts."""
+        self.train("rows", max_samples=100.0)
+        with self.assertRaises(ValueError):
+            self.train("fractional_rows", max_samples=1.5)
+        self.assertEqual(parse_max_samples("0.25"), 0.25)
+        self.assertEqual(parse_max_samples("1"), 1.0)
+        self.assertEqual(parse_max_samples("500"), 500)
+        self.assertIsInstance(parse_max_samples("500"), int)
+        for value in ("1.5", "0", "-3"):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_max_samples(value)
+
+    def test_parse_max_features(self):
+        """Test that max_features accepts a name, None, a fraction or a count."""
+        self.assertEqual(parse_max_features("sqrt"), "sqrt")
+        self.assertIsNone(parse_max_features("None"))
+        self.assertEqual(parse_max_features("0.6"), 0.6)
+        self.assertEqual(parse_max_features("3"), 3)
+        self.assertIsInstance(parse_max_features("3"), int)
+
+if __name__ == '__main__':
+    unittest.main()